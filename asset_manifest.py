@@ -0,0 +1,90 @@
+"""Process-wide manifest of app assets and attached documents.
+
+Looking assets up with ``os.path.exists`` on every rerun costs several stat
+calls per document and per asset role, which adds up on network storage.
+The manifest lists every candidate document directory once, records which
+candidate file fills each asset role, and memoizes document resolutions,
+so lookups during a rerun are dictionary hits. It is rebuilt when its TTL
+expires or when ``invalidate_manifest`` is called.
+"""
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+MANIFEST_TTL_SECONDS = 60.0
+
+def file_first_existing(candidates: List[str]) -> Optional[str]:
+    """Return the first existing file from candidates list."""
+    for path in candidates:
+        if path and os.path.exists(path):
+            return path
+    return None
+
+class AssetManifest:
+    """Snapshot of asset role and document locations."""
+
+    def __init__(self, roles: Dict[str, List[str]], doc_dirs: List[str], base_dir: str):
+        self.base_dir = base_dir
+        self.built_at = time.monotonic()
+        self.assets: Dict[str, Optional[str]] = {
+            role: file_first_existing(candidates) for role, candidates in roles.items()
+        }
+
+        # Earlier directories take precedence, as in the candidate order
+        self.documents: Dict[str, str] = {}
+        for directory in doc_dirs:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            self.documents.setdefault(entry.name, entry.path)
+            except OSError:
+                continue
+
+        self._resolved: Dict[str, Optional[str]] = {}
+
+    def asset(self, role: str) -> Optional[str]:
+        """Return the file filling an asset role, or None."""
+        return self.assets.get(role)
+
+    def resolve_document(self, doc_path: str) -> Optional[str]:
+        """Resolve a document path to an absolute path, memoizing the result."""
+        if not doc_path:
+            return None
+        if doc_path in self._resolved:
+            return self._resolved[doc_path]
+
+        resolved = None
+        if os.path.isabs(doc_path) and os.path.exists(doc_path):
+            resolved = doc_path
+        elif os.path.exists(os.path.join(self.base_dir, doc_path)):
+            resolved = os.path.join(self.base_dir, doc_path)
+        else:
+            resolved = self.documents.get(os.path.basename(doc_path))
+
+        self._resolved[doc_path] = resolved
+        return resolved
+
+_MANIFESTS: Dict[Tuple, AssetManifest] = {}
+_MANIFEST_LOCK = threading.Lock()
+
+def load_manifest(roles: Dict[str, List[str]], doc_dirs: List[str], base_dir: str,
+                  ttl: float = MANIFEST_TTL_SECONDS) -> AssetManifest:
+    """Return the shared manifest for this configuration, rebuilding it after ``ttl``."""
+    key = (tuple((role, tuple(paths)) for role, paths in sorted(roles.items())), tuple(doc_dirs), base_dir)
+    manifest = _MANIFESTS.get(key)
+    if manifest and time.monotonic() - manifest.built_at < ttl:
+        return manifest
+
+    with _MANIFEST_LOCK:
+        manifest = _MANIFESTS.get(key)
+        if not manifest or time.monotonic() - manifest.built_at >= ttl:
+            manifest = AssetManifest(roles, doc_dirs, base_dir)
+            _MANIFESTS[key] = manifest
+        return manifest
+
+def invalidate_manifest() -> None:
+    """Force every manifest to be rebuilt on its next use."""
+    with _MANIFEST_LOCK:
+        _MANIFESTS.clear()
@@ -0,0 +1,74 @@
+"""Compare the fuzzy name index with a pairwise edit-distance scan.
+
+The synthetic directory only draws from a few dozen names, so family names
+are replaced by generated ones to give the index a realistic vocabulary.
+
+Usage: python benchmarks/bench_fuzzy.py [--sizes 1000 10000 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import synthetic_experts  # noqa: E402
+from expert_directory import normalize_expert  # noqa: E402
+from search_index import NameIndex, bounded_edit_distance  # noqa: E402
+
+SYLLABLES = ["ab", "bar", "dul", "far", "ghan", "ham", "jab", "kar", "khud", "mar", "nab", "qas", "rab",
+             "sal", "sham", "tam", "ubai", "zub", "daw", "hus", "kadh", "mus", "naj", "wal", "yas"]
+QUERIES = ["Ghanami", "Alghannami", "Khudair", "الغنامي", "Mohamad", "Hussain Tamimy", "Zubaydi"]
+SCAN_LIMIT = 10000
+
+def generated_family_name(rng: random.Random) -> str:
+    name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+    return f"Al-{name.capitalize()}" if rng.random() < 0.6 else name.capitalize()
+
+def pairwise_scan(experts: List[Dict[str, Any]], query: str) -> List[int]:
+    """Match every query word against every name word with an edit distance of at most 2."""
+    words = query.casefold().split()
+    matches = []
+    for position, expert in enumerate(experts):
+        names = f"{expert['full_name']} {expert['display_name']}".casefold().replace("-", " ").split()
+        if all(any(bounded_edit_distance(word, name, 2) <= 2 for name in names) for word in words):
+            matches.append(position)
+    return matches
+
+def time_per_query(func, repeat: int) -> float:
+    """Return the mean milliseconds per call of ``func`` over all QUERIES."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for query in QUERIES:
+            func(query)
+    return (time.perf_counter() - started) * 1000 / (repeat * len(QUERIES))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'experts':>8} {'name keys':>10} {'build ms':>10} {'scan ms/q':>10} {'index ms/q':>11} {'speedup':>8}")
+    rng = random.Random(1)
+    for size in args.sizes:
+        experts = []
+        for raw in synthetic_experts(size):
+            raw["full_name"] = f"{raw['full_name'].rsplit(' ', 1)[0]} {generated_family_name(rng)}"
+            experts.append(normalize_expert(raw))
+
+        started = time.perf_counter()
+        index = NameIndex(experts)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        index_ms = time_per_query(index.search, args.repeat)
+        # The scan is linear in the directory size; time it on a slice and scale up
+        sample = experts[:SCAN_LIMIT]
+        scan_ms = time_per_query(lambda q: pairwise_scan(sample, q), 1) * len(experts) / len(sample)
+        print(f"{size:>8} {len(index.postings):>10} {build_ms:>10.1f} {scan_ms:>10.1f} {index_ms:>11.3f} "
+              f"{scan_ms / index_ms:>7.0f}x")
+
+if __name__ == "__main__":
+    main()
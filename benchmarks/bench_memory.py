@@ -0,0 +1,58 @@
+"""Compare the memory held by the list-of-dicts directory and CompactExperts.
+
+Usage: python benchmarks/bench_memory.py [--sizes 1000 10000 100000]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import synthetic_experts  # noqa: E402
+from compact_directory import CompactExperts  # noqa: E402
+from expert_directory import normalize_expert  # noqa: E402
+
+def traced_bytes() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'experts':>8} {'dicts MB':>9} {'compact MB':>11} {'ratio':>6} {'build ms':>9} {'page µs':>8}")
+    for size in args.sizes:
+        raw = json.dumps({"experts": synthetic_experts(size)})
+
+        tracemalloc.start()
+        base = traced_bytes()
+        experts = [normalize_expert(e) for e in json.loads(raw)["experts"]]
+        dict_bytes = traced_bytes() - base
+
+        compact = CompactExperts(experts)
+        del experts
+        compact_bytes = traced_bytes() - base
+        tracemalloc.stop()
+
+        # Build time is measured without tracemalloc, which slows allocation down
+        experts = [normalize_expert(e) for e in json.loads(raw)["experts"]]
+        started = time.perf_counter()
+        CompactExperts(experts)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        # Cost of materializing one page of 25 list entries
+        started = time.perf_counter()
+        for i in range(25):
+            compact[i * (size // 25)].get("display_name")
+        page_us = (time.perf_counter() - started) * 1e6
+
+        print(f"{size:>8} {dict_bytes / 2**20:>9.1f} {compact_bytes / 2**20:>11.1f} "
+              f"{dict_bytes / compact_bytes:>5.1f}x {build_ms:>9.0f} {page_us:>8.0f}")
+
+if __name__ == "__main__":
+    main()
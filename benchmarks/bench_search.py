@@ -0,0 +1,66 @@
+"""Compare the inverted search index with the original linear scan, and time ranking.
+
+Ranking is timed for the top page (a heap over the matches) and for a full
+sort of every match.
+
+Usage: python benchmarks/bench_search.py [--sizes 1000 10000 100000]
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import synthetic_experts  # noqa: E402
+from expert_directory import normalize_expert  # noqa: E402
+from search_index import SearchIndex  # noqa: E402
+
+TOP_K = 25
+QUERIES = ["civil", "al-ghannami", "international law", "arbitration", "kar", "أحمد", "zzz"]
+
+def linear_scan(experts: List[Dict[str, Any]], search_query: str) -> List[Dict[str, Any]]:
+    """The search step of filter_experts before the index was introduced."""
+    search_lower = search_query.lower()
+    return [
+        e for e in experts
+        if (search_lower in e.get("full_name", "").lower() or
+            search_lower in e.get("display_name", "").lower() or
+            search_lower in e.get("bio_en", "").lower() or
+            any(search_lower in tag.lower() for tag in e.get("tags", [])) or
+            any(search_lower in exp.lower() for exp in e.get("expertise", [])))
+    ]
+
+def time_per_query(func, repeat: int) -> float:
+    """Return the mean milliseconds per call of ``func`` over all QUERIES."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for query in QUERIES:
+            func(query)
+    return (time.perf_counter() - started) * 1000 / (repeat * len(QUERIES))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'experts':>8} {'build ms':>10} {'linear ms/q':>12} {'index ms/q':>11} {'speedup':>8} "
+          f"{'top-25 ms/q':>12} {'sorted ms/q':>12}")
+    for size in args.sizes:
+        experts = [normalize_expert(e) for e in synthetic_experts(size)]
+
+        started = time.perf_counter()
+        index = SearchIndex(experts)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        linear_ms = time_per_query(lambda q: linear_scan(experts, q), args.repeat)
+        index_ms = time_per_query(lambda q: [experts[i] for i in index.search(q)], args.repeat)
+        top_ms = time_per_query(lambda q: index.rank(q, index.search(q), TOP_K), args.repeat)
+        sorted_ms = time_per_query(lambda q: index.rank(q, index.search(q)), args.repeat)
+        print(f"{size:>8} {build_ms:>10.1f} {linear_ms:>12.3f} {index_ms:>11.3f} {linear_ms / index_ms:>7.1f}x "
+              f"{top_ms:>12.3f} {sorted_ms:>12.3f}")
+
+if __name__ == "__main__":
+    main()
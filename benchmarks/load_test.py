@@ -0,0 +1,470 @@
+"""Load test the app with concurrent sessions, through a live server or AppTest.
+
+Every simulated session replays what a visitor does: open the app, narrow
+the list with the tag and expertise filters, reset them, type a search
+(one rerun per debounced prefix), select an expert from the results and
+open the Documents section. For each number of concurrent sessions the
+harness reports rerun latency percentiles, throughput and the resident
+memory of the process serving them.
+
+Drivers:
+
+* ``server`` (default) starts ``streamlit run streamlit_app.py`` on a free
+  port, a fresh server per session count, or targets ``--url``. Sessions
+  talk Streamlit's websocket protocol like a browser: a widget change is a
+  rerun request carrying the widget states, scoped to the widget's fragment,
+  timed until the script-finished message.
+* ``apptest`` runs the sessions in threads of this process through
+  Streamlit's AppTest. It needs no server, but AppTest runs cannot overlap:
+  reruns of concurrent sessions are queued one at a time.
+
+RSS is read from /proc: with ``--url``, pass the server's ``--pid``.
+
+Usage:
+    python benchmarks/load_test.py --sessions 1 10 50 --size 10000
+    python benchmarks/load_test.py --driver apptest --sessions 1 5 10
+    python benchmarks/load_test.py --url http://localhost:8501 --pid 4242 -o load.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import streamlit.logger  # noqa: E402
+from streamlit.proto.BackMsg_pb2 import BackMsg  # noqa: E402
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg  # noqa: E402
+from streamlit.proto.WidgetStates_pb2 import WidgetState  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from benchmarks.run_benchmarks import environment  # noqa: E402
+from benchmarks.synthetic import write_experts_file  # noqa: E402
+from expert_directory import load_directory  # noqa: E402
+
+try:
+    import websockets
+except ImportError:  # only the server driver needs it
+    websockets = None
+
+# Running the app outside a server logs a warning for every Streamlit call
+streamlit.logger.set_log_level("error")
+
+APP_PATH = os.path.join(REPO_DIR, "streamlit_app.py")
+DEFAULT_DATA = os.path.join(REPO_DIR, "experts.json")
+QUERIES = ["civil law", "international", "al-ghannami", "arbitration", "human rights", "karbala", "أحمد"]
+# Characters typed between two debounced reruns of the search box
+TYPING_STEP = 4
+SERVER_START_TIMEOUT = 60
+RERUN_TIMEOUT = 120
+APP_TIMEOUT = 300
+
+def rss_bytes(pid: int) -> Optional[int]:
+    """Return the resident set size of process ``pid``, or None where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted samples."""
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))]
+
+# =========================
+# SCENARIO
+# =========================
+def scenario(rng: random.Random) -> List[Tuple[str, Any]]:
+    """Return the (action, argument) steps of one visit."""
+    query = rng.choice(QUERIES)
+    steps: List[Tuple[str, Any]] = [
+        ("tag", rng.random),
+        ("expertise", rng.random),
+        ("tag", None),
+        ("expertise", None),
+    ]
+    prefixes = list(range(TYPING_STEP, len(query), TYPING_STEP)) + [len(query)]
+    steps += [("search", query[:n]) for n in prefixes]
+    steps += [("expert", rng.random), ("section", "Documents"), ("section", "Overview"), ("search", "")]
+    return steps
+
+def pick(options: List[str], choice: Optional[Callable[[], float]]) -> int:
+    """Index of the option a step picks: "All" (the first) for None, else a random one."""
+    if choice is None or len(options) < 2:
+        return 0
+    return 1 + int(choice() * (len(options) - 1))
+
+class Recorder:
+    """Rerun latencies of a load level, by action."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = {}
+        self.bytes = 0
+        self.errors = 0
+
+    def add(self, action: str, seconds: float, received: int = 0) -> None:
+        with self.lock:
+            self.samples.setdefault(action, []).append(seconds * 1000)
+            self.bytes += received
+
+    def error(self) -> None:
+        with self.lock:
+            self.errors += 1
+
+# =========================
+# SERVER DRIVER
+# =========================
+class ServerSession:
+    """A browser-like websocket session of a running app server."""
+
+    # Widget kinds the scenario drives, by element type
+    WIDGETS = ("text_input", "selectbox", "radio", "button_group")
+
+    def __init__(self, url: str, recorder: Recorder):
+        self.url = url.replace("http", "ws", 1).rstrip("/") + "/_stcore/stream"
+        self.recorder = recorder
+        self.connection = None
+        # Widget id → (element type, option labels, fragment id) as last rendered
+        self.widgets: Dict[str, Tuple[str, List[str], str]] = {}
+        self.states: Dict[str, WidgetState] = {}
+
+    async def open(self) -> None:
+        self.connection = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+        await self.rerun("open")
+
+    async def close(self) -> None:
+        if self.connection is not None:
+            await self.connection.close()
+
+    def find(self, kind: str, key: str = "") -> Optional[str]:
+        for widget_id, (widget_kind, _, _) in self.widgets.items():
+            if widget_kind == kind and widget_id.endswith(key):
+                return widget_id
+        return None
+
+    def _track(self, msg: ForwardMsg) -> None:
+        element = msg.delta.new_element
+        kind = element.WhichOneof("type")
+        if kind not in self.WIDGETS:
+            return
+        proto = getattr(element, kind)
+        if kind == "button_group":
+            options = [option.content for option in proto.options]
+        else:
+            options = list(getattr(proto, "options", []))
+        # A widget's id changes with its options: the new one replaces the old
+        key = proto.id.rsplit("-", 1)[-1]
+        for widget_id, (widget_kind, _, fragment_id) in list(self.widgets.items()):
+            if widget_id != proto.id and widget_kind == kind and fragment_id == msg.delta.fragment_id \
+                    and widget_id.rsplit("-", 1)[-1] == key:
+                del self.widgets[widget_id]
+                self.states.pop(widget_id, None)
+        self.widgets[proto.id] = (kind, options, msg.delta.fragment_id)
+
+    async def rerun(self, action: str, widget_id: str = "") -> None:
+        """Send the widget states, as after a change of ``widget_id``, and wait for the rerun to finish."""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        if widget_id:
+            msg.rerun_script.fragment_id = self.widgets[widget_id][2]
+        started = time.perf_counter()
+        received = 0
+        await self.connection.send(msg.SerializeToString())
+        while True:
+            data = await asyncio.wait_for(self.connection.recv(), RERUN_TIMEOUT)
+            received += len(data)
+            reply = ForwardMsg()
+            reply.ParseFromString(data)
+            kind = reply.WhichOneof("type")
+            if kind == "delta" and reply.delta.WhichOneof("type") == "new_element":
+                self._track(reply)
+            elif kind == "script_finished" and reply.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                break
+        self.recorder.add(action, time.perf_counter() - started, received)
+
+    async def step(self, action: str, argument: Any) -> None:
+        state = WidgetState()
+        if action == "search":
+            state.id = self.find("text_input")
+            state.string_value = argument
+        elif action in ("tag", "expertise"):
+            state.id = self.find("selectbox", f"{action}_filter")
+            options = self.widgets[state.id][1]
+            state.string_value = options[pick(options, argument)]
+        elif action == "expert":
+            state.id = self.find("radio")
+            if state.id is None:  # no expert matches
+                return
+            options = self.widgets[state.id][1]
+            state.string_value = options[pick(options, argument)]
+        else:
+            state.id = self.find("button_group", "profile_section")
+            if state.id is None:
+                return
+            state.string_array_value.data.append(argument)
+        self.states[state.id] = state
+        await self.rerun(action, state.id)
+
+async def run_server_sessions(url: str, count: int, visits: int, think: float, seed: int,
+                              recorder: Recorder, measure_rss: Callable[[], Optional[int]]) -> Optional[int]:
+    """Run ``count`` concurrent sessions; return the server RSS once all of them finished their visits."""
+    sessions = [ServerSession(url, recorder) for _ in range(count)]
+
+    async def visit(session: ServerSession, rng: random.Random) -> None:
+        try:
+            await session.open()
+            for _ in range(visits):
+                for action, argument in scenario(rng):
+                    if think:
+                        await asyncio.sleep(rng.expovariate(1 / think))
+                    await session.step(action, argument)
+        except Exception:
+            recorder.error()
+
+    await asyncio.gather(*(visit(session, random.Random(seed + i)) for i, session in enumerate(sessions)))
+    # Measured while the sessions are still connected and their state is held
+    rss = measure_rss()
+    await asyncio.gather(*(session.close() for session in sessions))
+    return rss
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+@contextmanager
+def launched_server(data_path: str) -> Iterator[Tuple[str, int]]:
+    """Run the app in a headless Streamlit server; yield its URL and pid."""
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP_PATH, "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        env=dict(os.environ, EXPERTS_DATA=data_path), cwd=REPO_DIR,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + SERVER_START_TIMEOUT
+        while True:
+            try:
+                with urllib.request.urlopen(f"{url}/_stcore/health", timeout=1):
+                    break
+            except OSError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"the app server did not start on port {port}")
+                time.sleep(0.2)
+        yield url, process.pid
+    finally:
+        process.terminate()
+        process.wait(10)
+
+def server_level(args: argparse.Namespace, data_path: str, count: int) -> Dict[str, Any]:
+    """Measure one session count against a launched or an external server."""
+    if websockets is None:
+        raise SystemExit("The server driver needs the websockets package (pip install websockets)")
+
+    def run(url: str, pid: Optional[int]) -> Dict[str, Any]:
+        measure_rss = (lambda: rss_bytes(pid)) if pid else (lambda: None)
+        # One visit warms the process up (data load, indexes, caches) before the idle RSS
+        asyncio.run(run_server_sessions(url, 1, 1, 0.0, args.seed, Recorder(), measure_rss))
+        idle = measure_rss()
+        recorder = Recorder()
+        started = time.perf_counter()
+        loaded = asyncio.run(run_server_sessions(
+            url, count, args.visits, args.think, args.seed, recorder, measure_rss,
+        ))
+        return report(count, recorder, time.perf_counter() - started, idle, loaded)
+
+    if args.url:
+        return run(args.url, args.pid)
+    with launched_server(data_path) as (url, pid):
+        return run(url, pid)
+
+# =========================
+# APPTEST DRIVER
+# =========================
+# AppTest installs a global runtime and compiles the script on every run, neither of
+# which is thread-safe: runs take turns, and their latency includes the wait
+_APPTEST_LOCK = threading.Lock()
+
+class AppTestSession:
+    """A session of the app run in this process by AppTest."""
+
+    def __init__(self, recorder: Recorder, expert_ids: Dict[str, str]):
+        self.at = AppTest.from_file(APP_PATH, default_timeout=APP_TIMEOUT)
+        self.recorder = recorder
+        self.expert_ids = expert_ids
+
+    def timed(self, action: str, run: Callable[[], Any]) -> None:
+        started = time.perf_counter()
+        with _APPTEST_LOCK:
+            run()
+        self.recorder.add(action, time.perf_counter() - started)
+        if self.at.exception:
+            raise RuntimeError(f"app raised: {[e.value for e in self.at.exception]}")
+
+    def open(self) -> None:
+        self.timed("open", self.at.run)
+
+    def step(self, action: str, argument: Any) -> None:
+        if action == "search":
+            self.timed(action, self.at.text_input[0].input(argument).run)
+        elif action in ("tag", "expertise"):
+            selectbox = self.at.selectbox(key=f"{action}_filter")
+            # Options are labelled "<value> (<count>)"; AppTest selects by value
+            label = selectbox.options[pick(selectbox.options, argument)]
+            value = label if label == "All" else label.rsplit(" (", 1)[0]
+            self.timed(action, selectbox.select(value).run)
+        elif action == "expert":
+            if not self.at.radio:
+                return
+            # AppTest selects by value: map the chosen label back to an expert id
+            radio = self.at.radio[0]
+            label = radio.options[pick(radio.options, argument)]
+            self.timed(action, radio.set_value(self.expert_ids[label]).run)
+        else:
+            self.at.session_state["profile_section"] = argument
+            self.timed(action, self.at.run)
+
+def apptest_level(args: argparse.Namespace, data_path: str, count: int) -> Dict[str, Any]:
+    """Measure one session count with AppTest sessions in threads of this process."""
+    os.environ["EXPERTS_DATA"] = data_path
+    directory = load_directory(data_path)
+    expert_ids = {e.get("display_name", e.get("full_name", "Unnamed Expert")): e["id"] for e in directory.experts}
+
+    warmup = AppTestSession(Recorder(), expert_ids)
+    warmup.open()
+    del warmup
+    idle = rss_bytes(os.getpid())
+
+    recorder = Recorder()
+    sessions = [AppTestSession(recorder, expert_ids) for _ in range(count)]
+
+    def visit(session: AppTestSession, rng: random.Random) -> None:
+        try:
+            session.open()
+            for _ in range(args.visits):
+                for action, argument in scenario(rng):
+                    if args.think:
+                        time.sleep(rng.expovariate(1 / args.think))
+                    session.step(action, argument)
+        except Exception:
+            recorder.error()
+
+    threads = [
+        threading.Thread(target=visit, args=(session, random.Random(args.seed + i)), daemon=True)
+        for i, session in enumerate(sessions)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started
+    # Measured while the sessions, and their session state, are still alive
+    loaded = rss_bytes(os.getpid())
+    return report(count, recorder, seconds, idle, loaded)
+
+# =========================
+# RESULTS
+# =========================
+def report(count: int, recorder: Recorder, seconds: float, idle: Optional[int],
+           loaded: Optional[int]) -> Dict[str, Any]:
+    samples = sorted(ms for action, values in recorder.samples.items() if action != "open" for ms in values)
+    result: Dict[str, Any] = {
+        "sessions": count,
+        "reruns": len(samples),
+        "errors": recorder.errors,
+        "seconds": round(seconds, 3),
+        "throughput_per_s": round(len(samples) / seconds, 2) if seconds else 0.0,
+        "received_bytes": recorder.bytes,
+    }
+    if samples:
+        result.update({
+            "p50_ms": round(percentile(samples, 0.50), 3),
+            "p95_ms": round(percentile(samples, 0.95), 3),
+            "p99_ms": round(percentile(samples, 0.99), 3),
+            "max_ms": round(samples[-1], 3),
+        })
+    result["rss_idle_mb"] = round(idle / 2**20, 1) if idle else None
+    result["rss_loaded_mb"] = round(loaded / 2**20, 1) if loaded else None
+    result["rss_per_session_kb"] = round((loaded - idle) / count / 1024, 1) if idle and loaded else None
+    result["actions"] = {
+        action: {
+            "reruns": len(values),
+            "p50_ms": round(percentile(sorted(values), 0.50), 3),
+            "p95_ms": round(percentile(sorted(values), 0.95), 3),
+        }
+        for action, values in sorted(recorder.samples.items())
+    }
+    return result
+
+def print_result(result: Dict[str, Any]) -> None:
+    def number(key: str, width: int, digits: int = 1) -> str:
+        value = result.get(key)
+        return f"{value:>{width}.{digits}f}" if value is not None else f"{'-':>{width}}"
+
+    print(f"{result['sessions']:>8} {result['reruns']:>7} {result['errors']:>6} {number('throughput_per_s', 9)} "
+          f"{number('p50_ms', 9)} {number('p95_ms', 9)} {number('p99_ms', 9)} "
+          f"{number('rss_loaded_mb', 9)} {number('rss_per_session_kb', 12)}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--driver", choices=("server", "apptest"), default="server")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 25])
+    parser.add_argument("--visits", type=int, default=2, help="scenario replays per session")
+    parser.add_argument("--think", type=float, default=0.0, help="mean seconds between two actions of a session")
+    parser.add_argument("--data", default=DEFAULT_DATA, help="experts file the app serves")
+    parser.add_argument("--size", type=int, help="serve a synthetic directory of this many experts instead")
+    parser.add_argument("--url", help="load an already running server instead of launching one")
+    parser.add_argument("--pid", type=int, help="pid of the --url server, for its RSS")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("-o", "--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        data_path = args.data
+        if args.size:
+            data_path = os.path.join(workdir, f"experts_{args.size}.json")
+            write_experts_file(data_path, args.size)
+        level = server_level if args.driver == "server" else apptest_level
+
+        print(f"{'sessions':>8} {'reruns':>7} {'errors':>6} {'reruns/s':>9} {'p50 ms':>9} {'p95 ms':>9} "
+              f"{'p99 ms':>9} {'RSS MB':>9} {'KB/session':>12}")
+        for count in args.sessions:
+            result = level(args, data_path, count)
+            results.append(result)
+            print_result(result)
+
+    if args.output:
+        report_data = {
+            "environment": environment(),
+            "driver": args.driver,
+            "dataset": {"path": None if args.size else data_path, "size": args.size},
+            "visits": args.visits,
+            "think_s": args.think,
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report_data, f, indent=2, ensure_ascii=False)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""Benchmark suite for the directory's hot paths, with machine-readable results.
+
+For each dataset size a synthetic experts.json is written and the suite
+times loading it, normalizing records, building the search and facet
+indexes, filter_experts and facet counts, and end-to-end app reruns through
+Streamlit's AppTest (first run, search, selecting an expert and rendering
+every profile section).
+
+Usage:
+    python benchmarks/run_benchmarks.py --sizes 1000 10000 -o results.json
+    python benchmarks/run_benchmarks.py --sizes 1000 10000 --compare results.json
+
+With --compare, medians are compared with a previous results file and the
+exit status is 1 when a benchmark got slower than --threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import streamlit  # noqa: E402
+import streamlit.logger  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from benchmarks.synthetic import synthetic_experts, write_experts_file  # noqa: E402
+from expert_directory import clear_directory_cache, load_directory, normalize_expert  # noqa: E402
+from expert_store import JsonExpertStore, open_json_store  # noqa: E402
+from search_index import FacetIndex, NameIndex, SearchIndex  # noqa: E402
+
+# Running the app outside a server logs a warning for every Streamlit call
+streamlit.logger.set_log_level("error")
+
+APP_PATH = os.path.join(REPO_DIR, "streamlit_app.py")
+QUERIES = ["", "civil", "al-ghannami", "international law", "arbitration", "kar", "أحمد", "zzz"]
+FILTERS = [("All", "All"), ("Academic", "All"), ("All", "Civil Law"), ("Arbitration", "Commercial Arbitration")]
+PROFILE_SECTIONS = ["Overview", "Contributions", "Publications", "Documents"]
+APP_TIMEOUT = 300
+
+def summarize(samples: List[float]) -> Dict[str, Any]:
+    """Return summary statistics of millisecond samples."""
+    ordered = sorted(samples)
+    return {
+        "samples": len(ordered),
+        "min_ms": round(ordered[0], 3),
+        "median_ms": round(statistics.median(ordered), 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+def measure(func: Callable[[], Any], repeat: int) -> List[float]:
+    """Return the milliseconds taken by ``repeat`` calls of ``func``."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+# =========================
+# BENCHMARKS
+# =========================
+def bench_library(path: str, size: int, repeat: int) -> Dict[str, List[float]]:
+    """Time the data layer: load, normalize, index construction, filtering and facets."""
+    results: Dict[str, List[float]] = {}
+
+    def cold_load():
+        clear_directory_cache()
+        load_directory(path, compact=True)
+
+    results["load_directory"] = measure(cold_load, repeat)
+    raw = synthetic_experts(size)
+    results["normalize_expert"] = measure(lambda: [normalize_expert(e) for e in raw], repeat)
+
+    directory = load_directory(path, compact=True)
+    experts = directory.experts
+    results["search_index_build"] = measure(lambda: SearchIndex(experts), max(1, repeat // 2))
+    results["name_index_build"] = measure(lambda: NameIndex(experts), max(1, repeat // 2))
+    results["facet_index_build"] = measure(lambda: FacetIndex(experts), repeat)
+
+    import streamlit_app as app
+    shared = open_json_store(path, compact=True)
+    shared.search_index, shared.name_index, shared.facets  # build the derived indexes once
+
+    filter_samples: List[float] = []
+    facet_samples: List[float] = []
+    for _ in range(repeat):
+        # A fresh store over the same snapshot: indexes are reused, query caches start empty
+        store = JsonExpertStore(directory)
+        for query in QUERIES:
+            for tag, expertise in FILTERS:
+                filter_samples.extend(measure(
+                    lambda: app.filter_experts(store, query, tag, expertise, page=0, page_size=app.EXPERTS_PAGE_SIZE), 1
+                ))
+                facet_samples.extend(measure(lambda: (
+                    store.facet_counts("tags", query, {"expertise": expertise}),
+                    store.facet_counts("expertise", query, {"tags": tag}),
+                ), 1))
+    results["filter_experts"] = filter_samples
+    results["facet_counts"] = facet_samples
+    return results
+
+def bench_app(path: str, repeat: int) -> Dict[str, List[float]]:
+    """Time end-to-end reruns of the app through AppTest."""
+    os.environ["EXPERTS_DATA"] = path
+    results: Dict[str, List[float]] = {name: [] for name in (
+        "app_first_run", "app_rerun", "app_search", "app_select_expert", "app_profile_section",
+    )}
+    for i in range(repeat):
+        clear_directory_cache()
+        at = AppTest.from_file(APP_PATH, default_timeout=APP_TIMEOUT)
+        results["app_first_run"].extend(measure(at.run, 1))
+        results["app_rerun"].extend(measure(at.run, 1))
+        results["app_search"].extend(measure(lambda: at.text_input[0].input(f"civil {i}").run(), 1))
+        at.text_input[0].input("").run()
+        results["app_select_expert"].extend(measure(lambda: at.radio[0].set_value("expert_1").run(), 1))
+        for section in PROFILE_SECTIONS:
+            at.session_state["profile_section"] = section
+            results["app_profile_section"].extend(measure(at.run, 1))
+        if at.exception:
+            raise RuntimeError(f"app raised: {[e.value for e in at.exception]}")
+    return results
+
+# =========================
+# RESULTS
+# =========================
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float) -> bool:
+    """Print median changes against a baseline results file; return whether any regressed."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["name"], r["size"]): r for r in json.load(f)["results"]}
+
+    regressed = False
+    print(f"\n{'benchmark':<22} {'size':>7} {'baseline ms':>12} {'current ms':>11} {'change':>8}")
+    for result in results:
+        before = baseline.get((result["name"], result["size"]))
+        if not before:
+            continue
+        change = result["median_ms"] / before["median_ms"] - 1 if before["median_ms"] else 0.0
+        flag = ""
+        if change > threshold:
+            regressed = True
+            flag = "  REGRESSION"
+        print(f"{result['name']:<22} {result['size']:>7} {before['median_ms']:>12.3f} "
+              f"{result['median_ms']:>11.3f} {change:>+7.0%}{flag}")
+    return regressed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--app-repeat", type=int, default=3, help="AppTest sessions per size")
+    parser.add_argument("--skip-app", action="store_true", help="skip the AppTest benchmarks")
+    parser.add_argument("-o", "--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="a previous results file to compare medians with")
+    parser.add_argument("--threshold", type=float, default=0.10, help="slowdown reported as a regression")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            path = os.path.join(workdir, f"experts_{size}.json")
+            write_experts_file(path, size)
+            timings = bench_library(path, size, args.repeat)
+            if not args.skip_app:
+                timings.update(bench_app(path, args.app_repeat))
+            for name, samples in timings.items():
+                result = {"name": name, "size": size, **summarize(samples)}
+                results.append(result)
+                print(f"{name:<22} {size:>7} median {result['median_ms']:>10.3f} ms  p95 {result['p95_ms']:>10.3f} ms")
+
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Synthetic experts.json-shaped data for benchmarks.
+
+Usage: python benchmarks/synthetic.py 10000 -o experts_10k.json [--seed 0]
+"""
+import argparse
+import json
+import random
+from typing import Any, Dict, List
+
+FIRST_NAMES = [
+    "Abdullah", "Ahmed", "Ali", "Hassan", "Hussein", "Khudhair", "Mohammed",
+    "Mustafa", "Nagham", "Noor", "Omar", "Saad", "Sara", "Zainab", "Layla",
+    "Yaseen", "Kadhem", "Haider", "Fatima", "Maryam", "Abbas", "Karim",
+]
+FAMILY_NAMES = [
+    "Al-Ghannami", "Al-Karimi", "Al-Rubaie", "Al-Jubouri", "Al-Obaidi",
+    "Al-Tamimi", "Al-Saadi", "Al-Hashimi", "Al-Musawi", "Abbou", "Hamza",
+    "Al-Dulaimi", "Al-Shammari", "Al-Zubaidi", "Al-Khafaji",
+]
+ARABIC_NAMES = ["أحمد", "علي", "حسين", "فاطمة", "مصطفى", "خضير", "نغم", "إبراهيم"]
+TITLES = ["Professor Dr.", "Assistant Professor Dr.", "Dr.", "Judge", "Lawyer", ""]
+CITIES = ["Baghdad", "Basra", "Karbala", "Najaf", "Erbil", "Mosul", "Hilla", "Kufa"]
+LANGUAGES = ["Arabic", "English", "Kurdish", "French", "Turkish"]
+TAGS = [
+    "Legal Studies", "Islamic Jurisprudence", "Academic", "International Law",
+    "Human Rights", "Counter-Terrorism", "Lawyer", "Judge", "Arbitration",
+    "Constitutional Law", "Commercial Law", "Criminal Law", "Labor Law",
+    "Environmental Law", "Investment", "Oil and Gas", "Family Law",
+]
+EXPERTISE = [
+    "Civil Law", "Islamic Jurisprudence", "Legal Studies", "Public International Law",
+    "International Dispute Settlement", "Counter-Terrorism", "Constitutional Law",
+    "Administrative Law", "Criminal Procedure", "Commercial Arbitration",
+    "Contract Law", "Property Law", "Tax Law", "Maritime Law", "Energy Law",
+    "Human Rights Law", "Comparative Law", "Private International Law",
+]
+UNIVERSITIES = [
+    "University of Baghdad", "University of Karbala", "Al-Mustansiriya University",
+    "University of Basra", "University of Kufa", "Al-Nahrain University",
+]
+VENUES = [
+    "Journal of Law College - University of Baghdad", "Al-Hurriya Publishing House",
+    "Journal of Legal Sciences", "Karbala Law Review", "Iraqi Bar Association Press",
+    "PhD Dissertation - Islamic University of Lebanon",
+]
+BIO_WORDS = (
+    "research focuses on comparative legal systems legislation courts reform "
+    "constitutional review dispute settlement contracts obligations arbitration "
+    "jurisprudence evidence procedure governance treaties investment regulation"
+).split()
+CV_FILES = ["nagham_cv.pdf", "khudhair_yaseen_alghannami_cv.pdf", "missing_cv.pdf"]
+
+def synthetic_expert(rng: random.Random, index: int) -> Dict[str, Any]:
+    """Build one raw expert record in the experts.json schema."""
+    first = rng.choice(FIRST_NAMES)
+    family = rng.choice(FAMILY_NAMES)
+    if rng.random() < 0.1:
+        full_name = f"{rng.choice(ARABIC_NAMES)} {rng.choice(ARABIC_NAMES)}"
+    else:
+        full_name = f"{first} {rng.choice(FIRST_NAMES)} {family}"
+    expertise = rng.sample(EXPERTISE, rng.randint(1, 4))
+    bio = (
+        f"{rng.choice(['Professor', 'Lecturer', 'Researcher'])} of {expertise[0]} at "
+        f"{rng.choice(UNIVERSITIES)}. " + " ".join(rng.choices(BIO_WORDS, k=rng.randint(15, 40)))
+    )
+    expert = {
+        "id": f"expert_{index}",
+        "full_name": full_name,
+        "title_en": rng.choice(TITLES),
+        "nationality": "Iraqi",
+        "location": f"{rng.choice(CITIES)}, Iraq",
+        "languages": ["Arabic"] + rng.sample(LANGUAGES[1:], rng.randint(0, 2)),
+        "tags": rng.sample(TAGS, rng.randint(1, 5)),
+        "expertise": expertise,
+        "bio_en": bio,
+        "contributions": [
+            f"Member of the {rng.choice(['Faculty Council', 'Bar Association', 'Review Committee'])}"
+            for _ in range(rng.randint(0, 4))
+        ],
+        "publications": [
+            {
+                "title": f"{rng.choice(expertise)} in Contemporary Iraqi Legislation {i + 1}",
+                "year": rng.randint(1990, 2024),
+                "venue": rng.choice(VENUES),
+            }
+            for i in range(rng.randint(0, 8))
+        ],
+        "documents": [],
+    }
+    if rng.random() < 0.2:
+        expert["documents"].append({
+            "title": f"Curriculum Vitae - {full_name}",
+            "type": "pdf",
+            "file": rng.choice(CV_FILES),
+        })
+    return expert
+
+def synthetic_experts(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Build ``count`` raw expert records, reproducibly for a given seed."""
+    rng = random.Random(seed)
+    return [synthetic_expert(rng, i) for i in range(count)]
+
+def write_experts_file(path: str, count: int, seed: int = 0) -> None:
+    """Write ``count`` synthetic experts to ``path`` in the experts.json layout."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"experts": synthetic_experts(count, seed)}, f, ensure_ascii=False)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write a synthetic experts.json file.")
+    parser.add_argument("count", type=int)
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_experts_file(args.output, args.count, args.seed)
+
+if __name__ == "__main__":
+    main()
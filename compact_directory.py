@@ -0,0 +1,192 @@
+"""Compact, column-oriented in-memory representation of the experts directory.
+
+A list of normalized dicts costs a dict, a handful of lists and a string per
+field for every expert, and repeats values such as "Iraqi", "Arabic" or
+common tags in every record. ``CompactExperts`` stores the directory as
+columns instead:
+
+* categorical fields (title, nationality, location) as integer codes into a
+  shared vocabulary;
+* list fields (languages, tags, expertise) as codes in one flat array with
+  per-expert offsets;
+* the bio as UTF-8 bytes and the remaining fields (publications, documents,
+  contributions, contact, ...) as one compact JSON blob per expert, decoded
+  only when a record actually reads them.
+
+``CompactExperts`` is a sequence of read-only mappings, so code written for
+the list of dicts (``experts[i]``, ``expert.get(...)``) works unchanged.
+"""
+import json
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List, Optional
+
+CATEGORICAL_FIELDS = ("title", "title_en", "nationality", "location")
+LIST_FIELDS = ("languages", "tags", "expertise")
+# Every field that can live in a column, with its presence bit
+COLUMN_FIELDS = ("id", "full_name") + CATEGORICAL_FIELDS + LIST_FIELDS + ("display_name", "bio_en", "bio")
+FIELD_BITS = {field: 1 << bit for bit, field in enumerate(COLUMN_FIELDS)}
+
+class Vocabulary:
+    """Interned string values addressed by integer codes."""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+def derived_display_name(title_en: str, full_name: str) -> str:
+    """The display name normalize_expert derives when none is given."""
+    if title_en and title_en not in full_name:
+        return f"{title_en} {full_name}".strip()
+    return full_name
+
+def _is_string_list(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(v, str) for v in value)
+
+class CompactExperts(Sequence):
+    """Column store of normalized experts."""
+
+    def __init__(self, experts: List[Dict[str, Any]]):
+        self.vocabulary = Vocabulary()
+        self.ids: List[str] = []
+        self.full_names: List[str] = []
+        self.categorical = {field: array("I") for field in CATEGORICAL_FIELDS}
+        self.list_codes = {field: array("I") for field in LIST_FIELDS}
+        self.list_offsets = {field: array("I", [0]) for field in LIST_FIELDS}
+        # None when the display name is the one derived from title_en and full_name
+        self.display_names: List[Optional[str]] = []
+        self.bios: List[bytes] = []
+        self.present = array("H")
+        self.extras: List[Optional[bytes]] = []
+
+        for expert in experts:
+            self._append(expert)
+
+    def _append(self, expert: Dict[str, Any]) -> None:
+        extra = dict(expert)
+        code = self.vocabulary.code
+        present = 0
+
+        for field, column in (("id", self.ids), ("full_name", self.full_names)):
+            value = extra.get(field)
+            if isinstance(value, str):
+                present |= FIELD_BITS[field]
+                del extra[field]
+            column.append(str(value) if value is not None else "")
+
+        for field in CATEGORICAL_FIELDS:
+            value = extra.get(field)
+            if isinstance(value, str):
+                present |= FIELD_BITS[field]
+                del extra[field]
+            self.categorical[field].append(code(value) if isinstance(value, str) else 0)
+
+        for field in LIST_FIELDS:
+            value = extra.get(field)
+            if _is_string_list(value):
+                present |= FIELD_BITS[field]
+                del extra[field]
+                self.list_codes[field].extend(code(v) for v in value)
+            self.list_offsets[field].append(len(self.list_codes[field]))
+
+        display_name = extra.get("display_name")
+        stored_display_name = None
+        if isinstance(display_name, str):
+            present |= FIELD_BITS["display_name"]
+            del extra["display_name"]
+            title_en = expert.get("title_en")
+            if not isinstance(title_en, str) or display_name != derived_display_name(title_en, self.full_names[-1]):
+                stored_display_name = display_name
+        self.display_names.append(stored_display_name)
+
+        bio_en = extra.get("bio_en")
+        if isinstance(bio_en, str):
+            present |= FIELD_BITS["bio_en"]
+            del extra["bio_en"]
+            if extra.get("bio") == bio_en:
+                present |= FIELD_BITS["bio"]
+                del extra["bio"]
+        self.bios.append(bio_en.encode("utf-8") if isinstance(bio_en, str) else b"")
+
+        self.present.append(present)
+        self.extras.append(
+            json.dumps(extra, ensure_ascii=False, separators=(",", ":")).encode("utf-8") if extra else None
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [CompactExpert(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return CompactExpert(self, index)
+
+    def list_values(self, field: str, index: int) -> List[str]:
+        offsets = self.list_offsets[field]
+        values = self.vocabulary.values
+        return [values[c] for c in self.list_codes[field][offsets[index]:offsets[index + 1]]]
+
+class CompactExpert(Mapping):
+    """Read-only mapping view of one expert in a ``CompactExperts`` store."""
+
+    __slots__ = ("_store", "_index", "_extra")
+
+    def __init__(self, store: CompactExperts, index: int):
+        self._store = store
+        self._index = index
+        self._extra: Optional[Dict[str, Any]] = None
+
+    @property
+    def extra(self) -> Dict[str, Any]:
+        """Fields kept in the JSON blob, decoded on first use."""
+        if self._extra is None:
+            blob = self._store.extras[self._index]
+            self._extra = json.loads(blob) if blob else {}
+        return self._extra
+
+    def _has_column(self, field: str) -> bool:
+        return bool(self._store.present[self._index] & FIELD_BITS[field])
+
+    def __getitem__(self, key: str) -> Any:
+        store, i = self._store, self._index
+        if key not in FIELD_BITS or not self._has_column(key):
+            return self.extra[key]
+
+        if key == "id":
+            return store.ids[i]
+        if key == "full_name":
+            return store.full_names[i]
+        if key in CATEGORICAL_FIELDS:
+            return store.vocabulary.values[store.categorical[key][i]]
+        if key in LIST_FIELDS:
+            return store.list_values(key, i)
+        if key == "display_name":
+            if store.display_names[i] is not None:
+                return store.display_names[i]
+            return derived_display_name(self["title_en"], store.full_names[i])
+        # bio_en, and bio when it equals bio_en
+        return store.bios[i].decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for field in COLUMN_FIELDS:
+            if self._has_column(field):
+                yield field
+        if self._store.extras[self._index] is not None:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self)
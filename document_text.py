@@ -0,0 +1,301 @@
+"""Extraction and on-disk caching of the text of attached documents (CVs).
+
+Search reads document text from a cache directory, never from the PDFs:
+
+* ``<cache dir>/index.json`` maps each document path to the mtime, size and
+  SHA-256 of the file version last seen there;
+* ``<cache dir>/<sha256>.txt`` holds the text extracted from that content.
+
+A document is only extracted again when its content changes. A file that is
+merely touched is re-hashed and matched to its existing text, and copies of
+the same file share one entry. Extraction runs across a process pool,
+offline with ``python document_text.py experts.json`` or in the app's
+background ``DocumentExtractor`` thread.
+
+PDF text needs ``pypdf`` (in requirements.txt); without it only plain-text
+documents are indexed and a warning is logged.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from asset_manifest import AssetManifest
+from expert_directory import load_directory
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pypdf is optional; PDFs then contribute no text
+    PdfReader = None
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get("EXPERTS_DOCUMENT_CACHE", os.path.join(APP_DIR, ".cache", "document_text"))
+# Seconds between two background scans for new or changed documents
+SCAN_INTERVAL = 30.0
+HASH_CHUNK_SIZE = 1 << 20
+
+LOGGER = logging.getLogger(__name__)
+
+def document_dirs(base_dir: str) -> List[str]:
+    """Directories searched, in order, for documents referenced by file name."""
+    return [
+        os.path.join(base_dir, "assets", "docs"),
+        os.path.join(base_dir, "assets", "pdf"),
+        os.path.join(base_dir, "docs"),
+        base_dir,
+    ]
+
+def document_files(expert: Mapping[str, Any]) -> List[str]:
+    """Return the file references of an expert's documents."""
+    files = []
+    for doc in expert.get("documents") or []:
+        file = doc.get("file", "") if isinstance(doc, dict) else str(doc)
+        if file:
+            files.append(file)
+    return files
+
+# =========================
+# EXTRACTION
+# =========================
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def can_extract(path: str) -> bool:
+    """Whether text can be extracted from ``path`` here (PDFs need pypdf)."""
+    extension = os.path.splitext(path)[1].lower()
+    return extension in (".txt", ".md") or (extension == ".pdf" and PdfReader is not None)
+
+def extract_text(path: str) -> str:
+    """Return the text of a PDF or plain-text document ("" if it cannot be parsed)."""
+    try:
+        if os.path.splitext(path)[1].lower() == ".pdf":
+            reader = PdfReader(path)
+            return "\n".join(page.extract_text() or "" for page in reader.pages)
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read()
+    except Exception as e:
+        LOGGER.warning("Could not extract text from %s: %s", path, e)
+        return ""
+
+def _extract(job: Tuple[str, str]) -> Tuple[str, str]:
+    digest, path = job
+    return digest, extract_text(path)
+
+# =========================
+# CACHE
+# =========================
+class DocumentTextCache:
+    """Extracted document text on disk, keyed by content hash."""
+
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self._lock = threading.Lock()
+        self._index: Dict[str, List[Any]] = {}
+        self._index_mtime_ns: Optional[int] = None
+        self._warned_pypdf = False
+
+    def _text_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, f"{digest}.txt")
+
+    def _load_index(self) -> Dict[str, List[Any]]:
+        """Return the path → [mtime_ns, size, digest] index, rereading it when another process updated it."""
+        try:
+            mtime_ns = os.stat(self.index_path).st_mtime_ns
+        except OSError:
+            return self._index
+        if mtime_ns != self._index_mtime_ns:
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+            self._index_mtime_ns = mtime_ns
+        return self._index
+
+    def _write(self, path: str, text: str) -> None:
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temporary, path)
+
+    def lookup(self, path: str) -> Optional[str]:
+        """Return the cached text of ``path``, or None if this version of it was not extracted yet."""
+        return self.lookup_many([path]).get(path)
+
+    def lookup_many(self, paths: Iterable[str]) -> Dict[str, str]:
+        """Return the cached text of every path whose current version was extracted.
+
+        The index is checked once for the whole batch, and copies of one
+        file are read once.
+        """
+        with self._lock:
+            index = self._load_index()
+        texts: Dict[str, str] = {}
+        by_digest: Dict[str, Optional[str]] = {}
+        for path in dict.fromkeys(paths):
+            entry = index.get(path)
+            if not entry:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+                continue
+            digest = entry[2]
+            if digest not in by_digest:
+                try:
+                    with open(self._text_path(digest), "r", encoding="utf-8") as f:
+                        by_digest[digest] = f.read()
+                except OSError:
+                    by_digest[digest] = None
+            if by_digest[digest] is not None:
+                texts[path] = by_digest[digest]
+        return texts
+
+    def update(self, paths: Iterable[str], workers: Optional[int] = None) -> int:
+        """Extract every document not cached in its current version; return how many documents' text changed.
+
+        A touched file re-hashed to its previous content updates the index
+        but is not counted, so callers only rebuild when the text set changed.
+        """
+        with self._lock:
+            index = dict(self._load_index())
+
+        changed: Dict[str, List[Any]] = {}
+        pending: Dict[str, str] = {}
+        text_changed = 0
+        skipped_pdfs = 0
+        for path in dict.fromkeys(paths):
+            # Skipped, not cached empty, so they are extracted once pypdf is installed
+            if not can_extract(path):
+                skipped_pdfs += os.path.splitext(path)[1].lower() == ".pdf"
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entry = index.get(path)
+            if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size \
+                    and os.path.exists(self._text_path(entry[2])):
+                continue
+            digest = file_digest(path)
+            changed[path] = [stat.st_mtime_ns, stat.st_size, digest]
+            # Unchanged only if the same content was cached and readable before
+            if not entry or entry[2] != digest or not os.path.exists(self._text_path(digest)):
+                text_changed += 1
+            if not os.path.exists(self._text_path(digest)):
+                pending.setdefault(digest, path)
+
+        if skipped_pdfs and not self._warned_pypdf:
+            LOGGER.warning("pypdf is not installed: the text of %d PDF documents is not searchable", skipped_pdfs)
+            self._warned_pypdf = True
+        if not changed:
+            return 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if pending:
+            # Spawned, not forked: the app calls this from a thread of a multi-threaded server
+            workers = min(workers or os.cpu_count() or 1, len(pending))
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                for digest, text in pool.map(_extract, pending.items()):
+                    self._write(self._text_path(digest), text)
+
+        with self._lock:
+            index = dict(self._load_index())
+            index.update(changed)
+            self._write(self.index_path, json.dumps(index, ensure_ascii=False))
+            self._index = index
+            self._index_mtime_ns = os.stat(self.index_path).st_mtime_ns
+        LOGGER.info("Extracted %d documents, %d cache entries updated", len(pending), len(changed))
+        return text_changed
+
+class DocumentTexts:
+    """The cached document text of experts, with their document references resolved by ``resolve``."""
+
+    def __init__(self, resolve: Callable[[str], Optional[str]], cache: Optional[DocumentTextCache] = None):
+        self.resolve = resolve
+        self.cache = cache or DocumentTextCache()
+
+    def paths(self, expert: Mapping[str, Any]) -> List[str]:
+        return [path for path in map(self.resolve, document_files(expert)) if path]
+
+    def text(self, expert: Mapping[str, Any]) -> str:
+        """Return the cached text of an expert's documents; documents not extracted yet count as empty."""
+        return self.texts([expert])[0]
+
+    def texts(self, experts: Iterable[Mapping[str, Any]]) -> List[str]:
+        """Return the cached document text of every expert, looked up in one batch."""
+        paths = [self.paths(expert) for expert in experts]
+        cached = self.cache.lookup_many(path for expert_paths in paths for path in expert_paths)
+        return ["\n".join(cached[path] for path in expert_paths if cached.get(path)) for expert_paths in paths]
+
+    def extract(self, experts: Iterable[Mapping[str, Any]], workers: Optional[int] = None) -> int:
+        """Extract the documents of ``experts`` missing from the cache; return how many documents' text changed."""
+        return self.cache.update((path for expert in experts for path in self.paths(expert)), workers)
+
+class DocumentExtractor(threading.Thread):
+    """Daemon thread extracting new and changed documents in the background.
+
+    Every ``interval`` seconds the documents of ``experts()`` are checked
+    against the cache; when the text of any changed, ``on_change`` is called
+    so the search index can be rebuilt with it.
+    """
+
+    def __init__(self, texts: DocumentTexts, experts: Callable[[], Sequence[Mapping[str, Any]]],
+                 on_change: Callable[[], Any], interval: float = SCAN_INTERVAL, workers: Optional[int] = None):
+        super().__init__(name="document-extractor", daemon=True)
+        self.texts = texts
+        self.experts = experts
+        self.on_change = on_change
+        self.interval = interval
+        self.workers = workers
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while True:
+            try:
+                if self.texts.extract(self.experts(), self.workers):
+                    self.on_change()
+            except Exception:
+                LOGGER.exception("Document extraction failed")
+            if self._stop_event.wait(self.interval):
+                return
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+def manifest_document_texts(base_dir: str, cache: Optional[DocumentTextCache] = None) -> DocumentTexts:
+    """Document texts resolving references the way the app does, against ``base_dir``."""
+    manifest = AssetManifest({}, document_dirs(base_dir), base_dir)
+    return DocumentTexts(manifest.resolve_document, cache)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Extract the text of the experts' documents into the search cache.")
+    parser.add_argument("json_path", help="experts file whose documents are extracted")
+    parser.add_argument("--base-dir", help="directory documents are resolved against (default: the file's)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    directory = load_directory(args.json_path)
+    if directory.error:
+        raise SystemExit(f"Error reading JSON file: {directory.error}")
+    base_dir = args.base_dir or os.path.dirname(os.path.abspath(args.json_path))
+    texts = manifest_document_texts(base_dir, DocumentTextCache(args.cache_dir))
+    changed = texts.extract(directory.experts, args.workers)
+    if PdfReader is None:
+        print("pypdf is not installed: PDF documents were skipped")
+    print(f"{changed} documents updated in {args.cache_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Lazy, shared serving of expert documents (CVs and other PDFs).
+
+Download buttons are handed a loader instead of file contents, so nothing is
+read until a user actually clicks. Loaded files are kept in one process-wide
+LRU cache bounded by total bytes and shared by every session.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Tuple
+
+DOC_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+def read_file_bytes(path: str) -> bytes:
+    """Read a whole file in one call."""
+    with open(path, "rb") as f:
+        return f.read()
+
+class DocumentCache:
+    """Least-recently-used document bytes, bounded by their total size."""
+
+    def __init__(self, max_bytes: int = DOC_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: "OrderedDict[Tuple[str, int, int], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> bytes:
+        """Return the contents of ``path``, from cache while the file is unchanged."""
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                return data
+
+        data = read_file_bytes(path)
+        if len(data) > self.max_bytes:
+            return data
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = data
+                self.total_bytes += len(data)
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= len(evicted)
+        return data
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+DOCUMENT_CACHE = DocumentCache()
+
+def document_loader(path: str) -> Callable[[], bytes]:
+    """Return a callable that loads ``path`` only when a download is requested."""
+    return lambda: DOCUMENT_CACHE.get(path)
@@ -0,0 +1,284 @@
+"""Loading, normalization and process-wide caching of the experts directory.
+
+Streamlit re-executes ``streamlit_app.py`` on every widget interaction, but
+imported modules stay in ``sys.modules``. Keeping the parsed directory here
+means every session in the worker shares one normalized copy, and the JSON
+file is only parsed again when it actually changes on disk. With
+``watch_directory``, a background thread does that reparse and swaps the new
+snapshot in, so no session waits for it.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+from compact_directory import CompactExperts
+
+# Seconds between two checks of a watched directory file
+WATCH_INTERVAL = 1.0
+
+LOGGER = logging.getLogger(__name__)
+
+# =========================
+# NORMALIZATION
+# =========================
+def normalize_expert(expert: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize expert data to ensure all fields exist."""
+    result = expert.copy()
+
+    # Ensure required fields
+    result.setdefault("id", result.get("full_name", "").replace(" ", "_").lower())
+    result.setdefault("full_name", "")
+    result.setdefault("display_name", result.get("full_name"))
+    result.setdefault("title", "")
+    result.setdefault("title_en", result.get("title", ""))
+    result.setdefault("nationality", "Iraqi")
+    result.setdefault("location", "Iraq")
+    result.setdefault("languages", ["Arabic"])
+    result.setdefault("tags", [])
+    result.setdefault("expertise", result.get("areas_of_expertise", []))
+    result.setdefault("bio", result.get("bio_en", ""))
+    result.setdefault("bio_en", result.get("bio", ""))
+    result.setdefault("publications", [])
+    result.setdefault("documents", [])
+    result.setdefault("contributions", [])
+
+    # Create display name with title if not already included
+    display_name = result.get("display_name", "")
+    title_en = result.get("title_en", "")
+    if title_en and title_en not in display_name:
+        result["display_name"] = f"{title_en} {display_name}".strip()
+
+    return result
+
+# =========================
+# DIRECTORY SNAPSHOTS
+# =========================
+@dataclass(frozen=True)
+class ExpertDirectory:
+    """A normalized, read-only snapshot of one version of the experts file."""
+    path: str
+    experts: Sequence[Mapping[str, Any]]
+    version: str
+    mtime_ns: int
+    size: int
+    load_seconds: float
+    loaded_at: float
+    error: Optional[str] = None
+    # Bumped when the snapshot's indexes are rebuilt for an unchanged file
+    revision: int = 0
+    _derived: Dict[str, Any] = field(default_factory=dict, compare=False, repr=False)
+
+    @property
+    def count(self) -> int:
+        return len(self.experts)
+
+    def derived(self, key: str, build: Callable[[Sequence[Mapping[str, Any]]], Any]) -> Any:
+        """Return a structure derived from this snapshot, building it only once.
+
+        Indexes are keyed by snapshot, so they are rebuilt exactly when the
+        directory version changes and shared by every session otherwise.
+        """
+        value = self._derived.get(key)
+        if value is None:
+            with _DERIVED_LOCK:
+                value = self._derived.get(key)
+                if value is None:
+                    value = build(self.experts)
+                    self._derived[key] = value
+        return value
+
+_CACHE: Dict[Tuple[str, bool], ExpertDirectory] = {}
+_CACHE_LOCK = threading.Lock()
+_DERIVED_LOCK = threading.RLock()
+
+def _parse_directory(path: str, raw: bytes, version: str, stat: os.stat_result,
+                     started: float, compact: bool) -> ExpertDirectory:
+    """Parse and normalize raw file contents into a new snapshot."""
+    error = None
+    try:
+        data = json.loads(raw.decode("utf-8"))
+        experts = data.get("experts", [])
+        # Files written by ingest_experts.py are already normalized
+        if not data.get("normalized"):
+            experts = [normalize_expert(e) for e in experts]
+        if compact:
+            experts = CompactExperts(experts)
+    except Exception as e:
+        error = str(e)
+        experts = []
+    return ExpertDirectory(
+        path=path,
+        experts=experts,
+        version=version,
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        load_seconds=time.perf_counter() - started,
+        loaded_at=time.time(),
+        error=error,
+    )
+
+def _load_if_changed(path: str, compact: bool, cached: Optional[ExpertDirectory],
+                     stat: os.stat_result) -> ExpertDirectory:
+    """Return ``cached`` if ``path`` is unchanged, otherwise the snapshot of its new contents."""
+    if cached and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+        return cached
+
+    started = time.perf_counter()
+    with open(path, "rb") as f:
+        raw = f.read()
+    version = hashlib.sha256(raw).hexdigest()[:16]
+
+    if cached and cached.version == version:
+        return replace(cached, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+    return _parse_directory(path, raw, version, stat, started, compact)
+
+def load_directory(path: str, compact: bool = False) -> ExpertDirectory:
+    """Return the cached snapshot for ``path``, reloading only if the file changed.
+
+    With ``compact``, experts are held in a ``CompactExperts`` column store
+    instead of a list of dicts.
+
+    A cheap ``stat`` decides whether the file may have changed. When the
+    mtime or size moved, the content hash decides whether it really did, so
+    touching the file without editing it does not trigger a reparse. While a
+    ``DirectoryWatcher`` reloads the file in the background, the cached
+    snapshot is returned as is.
+    """
+    key = (path, compact)
+    cached = _CACHE.get(key)
+    if cached and key in _WATCHERS:
+        return cached
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ExpertDirectory(path, [], "missing", 0, 0, 0.0, time.time())
+
+    with _CACHE_LOCK:
+        directory = _load_if_changed(path, compact, _CACHE.get(key), stat)
+        _CACHE[key] = directory
+        return directory
+
+def clear_directory_cache() -> None:
+    """Drop every cached snapshot, forcing the next load to reparse."""
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+# =========================
+# BACKGROUND RELOAD
+# =========================
+class DirectoryWatcher(threading.Thread):
+    """Daemon thread reloading a directory file in the background when it changes.
+
+    The new snapshot is parsed, and prepared by ``prepare`` (typically by
+    building its indexes), before it replaces the cached one in a single
+    assignment. Until then every session keeps being served the previous
+    snapshot; a file that fails to parse, such as one caught halfway through
+    being written, is not swapped in.
+    """
+
+    def __init__(self, path: str, compact: bool, interval: float,
+                 prepare: Optional[Callable[[ExpertDirectory], Any]] = None):
+        super().__init__(name=f"directory-watcher:{os.path.basename(path)}", daemon=True)
+        self.path = path
+        self.compact = compact
+        self.interval = interval
+        self.prepare = prepare
+        self.reloads = 0
+        self._stop_event = threading.Event()
+        # (mtime_ns, size) of a file version that failed to parse, not retried until it changes
+        self._failed: Optional[Tuple[int, int]] = None
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                LOGGER.exception("Reloading %s failed", self.path)
+
+    def check(self) -> bool:
+        """Reload the file if it changed; return whether a new snapshot was swapped in."""
+        key = (self.path, self.compact)
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        if self._failed == (stat.st_mtime_ns, stat.st_size):
+            return False
+
+        cached = _CACHE.get(key)
+        directory = _load_if_changed(self.path, self.compact, cached, stat)
+        if directory is cached:
+            return False
+        if directory.error and cached is not None and not cached.error:
+            LOGGER.warning("Keeping the loaded directory, %s does not parse: %s", self.path, directory.error)
+            self._failed = (stat.st_mtime_ns, stat.st_size)
+            return False
+        self._failed = None
+        if self.prepare is not None and (cached is None or directory.version != cached.version):
+            self.prepare(directory)
+
+        with _CACHE_LOCK:
+            if _CACHE.get(key) is not cached:
+                # Reloaded meanwhile by load_directory; the next check compares with that
+                return False
+            _CACHE[key] = directory
+        if cached is None or directory.version != cached.version:
+            self.reloads += 1
+            LOGGER.info("Reloaded %s (version %s, %d experts)", self.path, directory.version, directory.count)
+        return True
+
+    def refresh(self, keys: Optional[Iterable[str]] = None) -> bool:
+        """Rebuild the current snapshot's indexes, e.g. after document text changed, and swap it in.
+
+        With ``keys``, only those derived structures are rebuilt and the
+        others are carried over. The version is kept; the revision is bumped.
+        """
+        key = (self.path, self.compact)
+        cached = _CACHE.get(key)
+        if cached is None:
+            return False
+        stale = None if keys is None else set(keys)
+        derived = {} if stale is None else {name: value for name, value in cached._derived.items() if name not in stale}
+        directory = replace(cached, revision=cached.revision + 1, _derived=derived)
+        if self.prepare is not None:
+            self.prepare(directory)
+        with _CACHE_LOCK:
+            if _CACHE.get(key) is not cached:
+                return False
+            _CACHE[key] = directory
+        LOGGER.info("Rebuilt the indexes of %s (revision %d)", self.path, directory.revision)
+        return True
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+_WATCHERS: Dict[Tuple[str, bool], DirectoryWatcher] = {}
+
+def watch_directory(path: str, compact: bool = False, interval: float = WATCH_INTERVAL,
+                    prepare: Optional[Callable[[ExpertDirectory], Any]] = None) -> DirectoryWatcher:
+    """Start reloading ``path`` in the background, once per process, and return its watcher."""
+    key = (path, compact)
+    watcher = _WATCHERS.get(key)
+    if watcher is not None:
+        return watcher
+    with _CACHE_LOCK:
+        watcher = _WATCHERS.get(key)
+        if watcher is None:
+            watcher = DirectoryWatcher(path, compact, interval, prepare)
+            watcher.start()
+            _WATCHERS[key] = watcher
+    return watcher
+
+def stop_watching() -> None:
+    """Stop every background watcher; snapshots are then reloaded on access again."""
+    with _CACHE_LOCK:
+        watchers = list(_WATCHERS.values())
+        _WATCHERS.clear()
+    for watcher in watchers:
+        watcher.stop()
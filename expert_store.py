@@ -0,0 +1,739 @@
+"""Storage backends for the experts directory.
+
+``JsonExpertStore`` serves the cached ``experts.json`` snapshot through the
+in-memory search and facet indexes. ``SqliteExpertStore`` serves a database
+built by ``import_json_to_sqlite``, running search (FTS5), facet filtering,
+counting and paging inside SQLite, so the directory never has to be held in
+memory as a whole.
+
+Build the database with:
+    python expert_store.py experts.json experts.db
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from compact_directory import CompactExperts
+from document_text import DocumentExtractor, DocumentTexts, manifest_document_texts
+from expert_directory import WATCH_INTERVAL, DirectoryWatcher, ExpertDirectory, load_directory, watch_directory
+from search_index import (
+    FIELD_WEIGHTS, SHORT_NAME_KEY, FacetIndex, FuzzyNameMatcher, NameIndex, PublicationIndex, SearchIndex,
+    expert_name_words, mask_to_positions, matching_venues, normalize_text, normalize_value, positions_to_mask,
+    publication_year, query_refines, search_documents, spellings_match, tokenize,
+)
+
+FACET_FIELDS = ("tags", "expertise")
+# An inclusive (first, last) year range; None leaves that end open
+YearRange = Tuple[Optional[int], Optional[int]]
+ALL_YEARS: YearRange = (None, None)
+
+# =========================
+# STORE INTERFACE
+# =========================
+@dataclass(frozen=True)
+class QueryMatches:
+    """The matches of a session's last query, kept to refine its next query from."""
+
+    version: str
+    query: str
+    # Bitset of the full-text matches (JSON backend)
+    mask: int = 0
+    # Whether the matches were narrowed down from the previous query's
+    refined: bool = False
+    # Revision of the search index the matches come from
+    revision: int = 0
+
+class ExpertStore:
+    """Read access to one version of the experts directory."""
+
+    version: str = ""
+    # Bumped when the search index is rebuilt for an unchanged directory version
+    revision: int = 0
+    count: int = 0
+    load_seconds: float = 0.0
+    error: Optional[str] = None
+
+    def match(self, query: str, previous: Optional[QueryMatches] = None) -> QueryMatches:
+        """Prepare the matches of ``query`` for the following search and facet calls.
+
+        ``previous`` is the result of this call for the session's last query;
+        when ``query`` refines it, only its matches are narrowed down.
+        """
+        return QueryMatches(self.version, query, revision=self.revision)
+
+    def get(self, expert_id: str) -> Optional[Dict[str, Any]]:
+        """Return the expert with ``expert_id``, or None."""
+        raise NotImplementedError
+
+    def search(self, query: str, filters: Dict[str, str], offset: int = 0,
+               limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """Return one page of matching experts and the total match count.
+
+        A query matches the indexed text by token prefix, and names fuzzily
+        across transliterations. Experts are ranked best match first when
+        there is a query, and kept in directory order otherwise.
+
+        ``filters`` maps a facet field to a required value; "All" or an empty
+        value means no filter on that field.
+        """
+        raise NotImplementedError
+
+    def locate(self, query: str, filters: Dict[str, str], expert_id: str) -> Optional[int]:
+        """Return the position of an expert in the results of ``search``, or None if it does not match."""
+        raise NotImplementedError
+
+    def facet_values(self, field: str) -> List[str]:
+        """Return every value of a facet field, sorted."""
+        raise NotImplementedError
+
+    def facet_counts(self, field: str, query: str, filters: Dict[str, str]) -> Dict[str, int]:
+        """Return how many experts matching ``query`` and ``filters`` carry each value of ``field``."""
+        raise NotImplementedError
+
+    def publications(self, years: YearRange = ALL_YEARS, venue: str = "", offset: int = 0,
+                     limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """Return one page of the publications in a year range and venue, newest first, and their total.
+
+        ``venue`` selects a venue by name or part of it (see ``matching_venues``).
+        Publications without a year are listed last, and only without a year
+        range. Each carries the id and name of its expert.
+        """
+        raise NotImplementedError
+
+    def publication_experts(self, years: YearRange = ALL_YEARS, venue: str = "") -> int:
+        """Return how many experts have publications in a year range and venue."""
+        raise NotImplementedError
+
+    def publication_venue_counts(self, years: YearRange = ALL_YEARS) -> Dict[str, int]:
+        """Return the number of publications of every venue in a year range."""
+        raise NotImplementedError
+
+    def publication_summary(self) -> Dict[str, Any]:
+        """Return the directory-wide publication counts: totals, year span, per year and per venue."""
+        raise NotImplementedError
+
+def publication_row(expert: Dict[str, Any], item: int) -> Dict[str, Any]:
+    """Flatten one of an expert's publications for a directory-wide listing."""
+    pub = expert["publications"][item]
+    if not isinstance(pub, dict):
+        pub = {"title": str(pub)}
+    return {
+        "expert_id": expert["id"],
+        "expert": expert.get("display_name", expert.get("full_name", "Unnamed Expert")),
+        "title": pub.get("title", "Untitled"),
+        "year": publication_year(pub.get("year")),
+        "venue": pub.get("venue") or "",
+    }
+
+def positions_by_id(experts) -> Dict[str, int]:
+    """Map each expert id to the position of its first record."""
+    ids = experts.ids if isinstance(experts, CompactExperts) else (e.get("id") for e in experts)
+    positions: Dict[str, int] = {}
+    for position, expert_id in enumerate(ids):
+        positions.setdefault(expert_id, position)
+    return positions
+
+def active_filters(filters: Dict[str, str]) -> Dict[str, str]:
+    """Drop unset and "All" filters."""
+    return {field: value for field, value in filters.items() if value and value != "All"}
+
+# =========================
+# JSON BACKEND
+# =========================
+class JsonExpertStore(ExpertStore):
+    """Store over an in-memory ``ExpertDirectory`` snapshot."""
+
+    QUERY_CACHE_SIZE = 64
+
+    def __init__(self, directory: ExpertDirectory, documents: Optional[DocumentTexts] = None):
+        self.directory = directory
+        self.documents = documents
+        self.version = directory.version
+        self.revision = directory.revision
+        self.count = directory.count
+        self.load_seconds = directory.load_seconds
+        self.error = directory.error
+        # query -> (full-text matches, full-text and fuzzy name matches)
+        self._query_masks: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def facets(self) -> FacetIndex:
+        return self.directory.derived("facet_index", FacetIndex)
+
+    @property
+    def search_documents(self) -> List[Dict[str, str]]:
+        return self.directory.derived("search_documents", search_documents)
+
+    @property
+    def search_index(self) -> SearchIndex:
+        documents = self.documents
+        return self.directory.derived("search_index", lambda experts: SearchIndex(
+            experts, documents.texts(experts) if documents else None, self.search_documents
+        ))
+
+    @property
+    def name_index(self) -> NameIndex:
+        return self.directory.derived("name_index", lambda experts: NameIndex(experts, self.search_documents))
+
+    @property
+    def positions_by_id(self) -> Dict[str, int]:
+        return self.directory.derived("positions_by_id", positions_by_id)
+
+    @property
+    def publication_index(self) -> PublicationIndex:
+        return self.directory.derived("publication_index", PublicationIndex)
+
+    def get(self, expert_id: str) -> Optional[Dict[str, Any]]:
+        position = self.positions_by_id.get(expert_id)
+        return None if position is None else self.directory.experts[position]
+
+    def _masks(self, query: str, previous: Optional[QueryMatches] = None) -> Tuple[int, int, bool]:
+        """Return the full-text and the full-text plus fuzzy name matches of ``query``,
+        and whether they were refined from ``previous``.
+        """
+        with self._lock:
+            masks = self._query_masks.get(query)
+            if masks is not None:
+                self._query_masks.move_to_end(query)
+                return masks + (False,)
+
+        facets = self.facets
+        refined = bool(
+            previous and previous.version == self.version and previous.revision == self.revision
+            and tokenize(previous.query)
+            and query_refines(query, previous.query)
+        )
+        if refined:
+            mask = self.search_index.refine(query, previous.query, previous.mask)
+        else:
+            mask = positions_to_mask(self.search_index.search(query), facets.size)
+        masks = (mask, mask | positions_to_mask(self.name_index.search(query), facets.size))
+        with self._lock:
+            self._query_masks[query] = masks
+            if len(self._query_masks) > self.QUERY_CACHE_SIZE:
+                self._query_masks.popitem(last=False)
+        return masks + (refined,)
+
+    def match(self, query: str, previous: Optional[QueryMatches] = None) -> QueryMatches:
+        if not query.strip():
+            return QueryMatches(self.version, query, self.facets.all_mask, revision=self.revision)
+        mask, _, refined = self._masks(query, previous)
+        return QueryMatches(self.version, query, mask, refined, self.revision)
+
+    def query_mask(self, query: str) -> int:
+        """Return the bitset of experts matching ``query``, memoizing recent queries."""
+        if not query.strip():
+            return self.facets.all_mask
+        return self._masks(query)[1]
+
+    def filtered_mask(self, query: str, filters: Dict[str, str]) -> int:
+        mask = self.query_mask(query)
+        for field, value in active_filters(filters).items():
+            mask &= self.facets.mask(field, value)
+        return mask
+
+    def search(self, query: str, filters: Dict[str, str], offset: int = 0,
+               limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        positions = mask_to_positions(self.filtered_mask(query, filters))
+        end = None if limit is None else offset + limit
+        if tokenize(query):
+            page = self.search_index.rank(query, positions, end)[offset:]
+        else:
+            page = positions[offset:end]
+        return [self.directory.experts[i] for i in page], len(positions)
+
+    def locate(self, query: str, filters: Dict[str, str], expert_id: str) -> Optional[int]:
+        position = self.positions_by_id.get(expert_id)
+        mask = self.filtered_mask(query, filters)
+        if position is None or not mask >> position & 1:
+            return None
+        if tokenize(query):
+            return self.search_index.rank(query, mask_to_positions(mask)).index(position)
+        return bin(mask & ((1 << position) - 1)).count("1")
+
+    def facet_values(self, field: str) -> List[str]:
+        return self.facets.values[field]
+
+    def facet_counts(self, field: str, query: str, filters: Dict[str, str]) -> Dict[str, int]:
+        return self.facets.counts(field, self.filtered_mask(query, filters))
+
+    def publications(self, years: YearRange = ALL_YEARS, venue: str = "", offset: int = 0,
+                     limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        index = self.publication_index
+        experts = self.directory.experts
+        rows = [
+            publication_row(experts[index.expert_positions[n]], index.items[n])
+            for n in index.page(years, venue, offset, limit)
+        ]
+        return rows, index.count_range(years, venue)
+
+    def publication_experts(self, years: YearRange = ALL_YEARS, venue: str = "") -> int:
+        index = self.publication_index
+        if years == ALL_YEARS and not venue:
+            return index.summary()["experts"]
+        return index.expert_mask(index.query(years, venue), self.count).bit_count()
+
+    def publication_venue_counts(self, years: YearRange = ALL_YEARS) -> Dict[str, int]:
+        return self.publication_index.venue_counts_in(years)
+
+    def publication_summary(self) -> Dict[str, Any]:
+        return self.publication_index.summary()
+
+# Index properties of JsonExpertStore, each built once per snapshot
+STORE_INDEXES = ("facets", "search_index", "name_index", "positions_by_id", "publication_index")
+
+def json_store(directory: ExpertDirectory, documents: Optional[DocumentTexts] = None) -> JsonExpertStore:
+    """Return the store of a directory snapshot, shared by every session.
+
+    With ``documents``, the cached text of attached documents is searched too.
+    """
+    return directory.derived("json_store", lambda experts: JsonExpertStore(directory, documents))
+
+def open_json_store(path: str, compact: bool = False, documents: Optional[DocumentTexts] = None) -> JsonExpertStore:
+    """Return the store for the current version of a JSON experts file."""
+    return json_store(load_directory(path, compact), documents)
+
+def prepare_json_store(directory: ExpertDirectory, documents: Optional[DocumentTexts] = None) -> None:
+    """Build a snapshot's store and indexes ahead of its first query."""
+    store = json_store(directory, documents)
+    # Reading each index property builds it, so the watcher swaps the snapshot in with every index ready
+    for index in STORE_INDEXES:
+        getattr(store, index)
+
+# Derived structures holding document text, rebuilt when only that text changed
+DOCUMENT_TEXT_INDEXES = ("json_store", "search_index")
+
+_EXTRACTORS: Dict[Tuple[str, bool], DocumentExtractor] = {}
+_EXTRACTORS_LOCK = threading.Lock()
+
+def watch_json_store(path: str, compact: bool = False, interval: float = WATCH_INTERVAL,
+                     documents: Optional[DocumentTexts] = None) -> DirectoryWatcher:
+    """Reload a JSON experts file in the background, swapping in new versions with their indexes built.
+
+    With ``documents``, new and changed documents are also extracted in the
+    background, and the search index rebuilt with their text. That keeps the
+    directory version, so sessions are not told the directory was updated.
+    """
+    watcher = watch_directory(path, compact, interval, lambda directory: prepare_json_store(directory, documents))
+    if documents is not None and (path, compact) not in _EXTRACTORS:
+        with _EXTRACTORS_LOCK:
+            if (path, compact) not in _EXTRACTORS:
+                extractor = DocumentExtractor(
+                    documents, lambda: load_directory(path, compact).experts,
+                    lambda: watcher.refresh(DOCUMENT_TEXT_INDEXES),
+                )
+                extractor.start()
+                _EXTRACTORS[(path, compact)] = extractor
+    return watcher
+
+# =========================
+# SQLITE BACKEND
+# =========================
+# Bumped whenever SCHEMA changes; databases built with another version must be re-imported
+SCHEMA_VERSION = "4"
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE experts (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    full_name TEXT NOT NULL,
+    display_name TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE expert_facets (
+    expert_rowid INTEGER NOT NULL REFERENCES experts(rowid),
+    field TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX expert_facets_value ON expert_facets (field, value, expert_rowid);
+CREATE TABLE publications (
+    expert_rowid INTEGER NOT NULL REFERENCES experts(rowid),
+    position INTEGER NOT NULL,
+    title TEXT,
+    year INTEGER,
+    venue TEXT,
+    venue_key TEXT
+);
+CREATE INDEX publications_expert ON publications (expert_rowid);
+CREATE INDEX publications_year ON publications (year, expert_rowid, position);
+CREATE INDEX publications_venue ON publications (venue_key, year);
+CREATE TABLE publication_counts (
+    year INTEGER,
+    venue_key TEXT,
+    venue TEXT,
+    publications INTEGER NOT NULL
+);
+CREATE TABLE documents (
+    expert_rowid INTEGER NOT NULL REFERENCES experts(rowid),
+    position INTEGER NOT NULL,
+    title TEXT,
+    type TEXT,
+    file TEXT
+);
+CREATE INDEX documents_expert ON documents (expert_rowid);
+CREATE TABLE expert_names (
+    key TEXT NOT NULL,
+    spelling TEXT NOT NULL,
+    expert_rowid INTEGER NOT NULL REFERENCES experts(rowid)
+);
+CREATE INDEX expert_names_key ON expert_names (key, spelling, expert_rowid);
+CREATE VIRTUAL TABLE experts_fts USING fts5(
+    name, expertise, tags, bio, documents,
+    content='', tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+# bm25() weights of the experts_fts columns, one per search document field as in the in-memory ranking
+FTS_WEIGHTS = ", ".join(map(str, FIELD_WEIGHTS.values()))
+
+def fts_query(query: str) -> str:
+    """Translate a user query into an FTS5 prefix query over normalized tokens."""
+    return " ".join(f'"{token}"*' for token in tokenize(query))
+
+def _insert_expert(conn: sqlite3.Connection, rowid: int, expert: Dict[str, Any], document: Mapping[str, str],
+                   document_text: str = "") -> None:
+    conn.execute(
+        "INSERT INTO experts (rowid, id, full_name, display_name, data) VALUES (?, ?, ?, ?, ?)",
+        (rowid, expert["id"], expert.get("full_name", ""), expert.get("display_name", ""),
+         json.dumps(expert, ensure_ascii=False)),
+    )
+    conn.execute(
+        "INSERT INTO experts_fts (rowid, name, expertise, tags, bio, documents) VALUES (?, ?, ?, ?, ?, ?)",
+        (rowid, document["name"], document["expertise"], document["tags"], document["bio"],
+         normalize_text(document_text)),
+    )
+    conn.executemany(
+        "INSERT INTO expert_names (key, spelling, expert_rowid) VALUES (?, ?, ?)",
+        [(key, spelling, rowid) for key, spelling in sorted(expert_name_words(document))],
+    )
+    for field in FACET_FIELDS:
+        conn.executemany(
+            "INSERT INTO expert_facets (expert_rowid, field, value) VALUES (?, ?, ?)",
+            [(rowid, field, value) for value in sorted(set(expert.get(field) or []))],
+        )
+    for position, pub in enumerate(expert.get("publications") or []):
+        if isinstance(pub, dict):
+            venue = pub.get("venue") or None
+            conn.execute(
+                "INSERT INTO publications (expert_rowid, position, title, year, venue, venue_key) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (rowid, position, pub.get("title"), publication_year(pub.get("year")), venue,
+                 normalize_value(str(venue)) if venue else None),
+            )
+        else:
+            conn.execute(
+                "INSERT INTO publications (expert_rowid, position, title) VALUES (?, ?, ?)",
+                (rowid, position, str(pub)),
+            )
+    for position, doc in enumerate(expert.get("documents") or []):
+        if isinstance(doc, dict):
+            values = (doc.get("title"), doc.get("type", "pdf"), doc.get("file"))
+        else:
+            values = (None, "pdf", str(doc))
+        conn.execute(
+            "INSERT INTO documents (expert_rowid, position, title, type, file) VALUES (?, ?, ?, ?, ?)",
+            (rowid, position) + values,
+        )
+
+def import_json_to_sqlite(json_path: str, db_path: str, documents: Optional[DocumentTexts] = None) -> int:
+    """Import an experts.json file into a new SQLite database, replacing ``db_path`` atomically.
+
+    Records are normalized exactly as the JSON backend normalizes them, and
+    with ``documents`` the cached text of their documents is indexed too.
+    Returns the number of imported experts.
+    """
+    directory = load_directory(json_path)
+    if directory.error:
+        raise ValueError(f"Error reading JSON file: {directory.error}")
+
+    temp_path = f"{db_path}.{os.getpid()}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    conn = sqlite3.connect(temp_path)
+    try:
+        conn.executescript(SCHEMA)
+        seen = set()
+        document_texts = documents.texts(directory.experts) if documents else None
+        expert_documents = directory.derived("search_documents", search_documents)
+        for rowid, expert in enumerate(directory.experts, start=1):
+            if expert["id"] in seen:
+                continue
+            seen.add(expert["id"])
+            _insert_expert(conn, rowid, expert, expert_documents[rowid - 1],
+                           document_texts[rowid - 1] if document_texts else "")
+        # Publication counts per year and venue, shown as each venue was first spelled
+        conn.execute(
+            "INSERT INTO publication_counts (year, venue_key, venue, publications) "
+            "SELECT p.year, p.venue_key, (SELECT q.venue FROM publications q WHERE q.venue_key = p.venue_key "
+            "ORDER BY q.expert_rowid, q.position LIMIT 1), COUNT(*) FROM publications p GROUP BY p.year, p.venue_key"
+        )
+        publication_experts = conn.execute("SELECT COUNT(DISTINCT expert_rowid) FROM publications").fetchone()[0]
+        conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", [
+            ("schema_version", SCHEMA_VERSION),
+            ("version", directory.version),
+            ("publication_experts", str(publication_experts)),
+            ("source", os.path.basename(json_path)),
+            ("imported_at", str(time.time())),
+        ])
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(temp_path, db_path)
+    return len(seen)
+
+class SqliteExpertStore(ExpertStore):
+    """Store over a database built by ``import_json_to_sqlite``."""
+
+    def __init__(self, db_path: str):
+        started = time.perf_counter()
+        self.db_path = db_path
+        self._local = threading.local()
+        conn = self._conn()
+        schema = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if schema is None or schema[0] != SCHEMA_VERSION:
+            raise ValueError(
+                f"SQLite database {db_path} was built by another version of the app; "
+                f"re-import it with: python expert_store.py experts.json {db_path}"
+            )
+        self.version = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+        self.count = conn.execute("SELECT COUNT(*) FROM experts").fetchone()[0]
+        self.names = FuzzyNameMatcher(row[0] for row in conn.execute("SELECT DISTINCT key FROM expert_names"))
+        # Short key -> spellings of the name words with that key
+        self.name_spellings: Dict[str, List[str]] = {}
+        for key, spelling in conn.execute(
+            "SELECT DISTINCT key, spelling FROM expert_names WHERE length(key) <= ?", (SHORT_NAME_KEY,)
+        ):
+            self.name_spellings.setdefault(key, []).append(spelling)
+        self.venue_keys = [row[0] for row in conn.execute(
+            "SELECT DISTINCT venue_key FROM publication_counts WHERE venue_key IS NOT NULL"
+        )]
+        self._publication_summary: Optional[Dict[str, Any]] = None
+        self.load_seconds = time.perf_counter() - started
+
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's read-only connection (sessions run on separate threads)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            self._local.conn = conn
+        return conn
+
+    def _where(self, query: str, filters: Dict[str, str]) -> Tuple[str, List[Any]]:
+        """Build the WHERE clause selecting experts by query and facet filters."""
+        clauses = []
+        params: List[Any] = []
+        query_clauses = []
+        match = fts_query(query)
+        if match:
+            query_clauses.append("e.rowid IN (SELECT rowid FROM experts_fts WHERE experts_fts MATCH ?)")
+            params.append(match)
+        name_keys = self.names.query_keys(query)
+        if name_keys:
+            name_clauses = []
+            for spelling, keys in name_keys:
+                if spelling:
+                    # A short key matches exactly; its spellings are confirmed here
+                    spellings = [s for s in self.name_spellings.get(keys[0], ()) if spellings_match(spelling, s)]
+                    name_clauses.append(
+                        "e.rowid IN (SELECT expert_rowid FROM expert_names "
+                        f"WHERE key = ? AND spelling IN ({', '.join('?' * len(spellings))}))"
+                    )
+                    params.append(keys[0])
+                    params.extend(spellings)
+                else:
+                    name_clauses.append(
+                        f"e.rowid IN (SELECT expert_rowid FROM expert_names WHERE key IN ({', '.join('?' * len(keys))}))"
+                    )
+                    params.extend(keys)
+            query_clauses.append("(" + " AND ".join(name_clauses) + ")")
+        if query_clauses:
+            clauses.append("(" + " OR ".join(query_clauses) + ")")
+        for field, value in active_filters(filters).items():
+            clauses.append("e.rowid IN (SELECT expert_rowid FROM expert_facets WHERE field = ? AND value = ?)")
+            params.extend([field, value])
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def get(self, expert_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute("SELECT data FROM experts WHERE id = ?", (expert_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _ranking(self, query: str) -> Tuple[str, str, List[Any]]:
+        """Return the score join, ORDER BY expression and join parameters ordering results of ``query``."""
+        match = fts_query(query)
+        if not match:
+            return "", "e.rowid", []
+        # FTS5 scores are negative, best match first; fuzzy name matches without
+        # a full-text score follow, and ties keep directory order
+        join = (
+            f" LEFT JOIN (SELECT rowid, bm25(experts_fts, {FTS_WEIGHTS}) AS score"
+            f" FROM experts_fts WHERE experts_fts MATCH ?) r ON r.rowid = e.rowid"
+        )
+        return join, "r.score IS NULL, r.score, e.rowid", [match]
+
+    def search(self, query: str, filters: Dict[str, str], offset: int = 0,
+               limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        where, params = self._where(query, filters)
+        conn = self._conn()
+        total = conn.execute(f"SELECT COUNT(*) FROM experts e{where}", params).fetchone()[0]
+        join, order, join_params = self._ranking(query)
+        rows = conn.execute(
+            f"SELECT e.data FROM experts e{join}{where} ORDER BY {order} LIMIT ? OFFSET ?",
+            join_params + params + [-1 if limit is None else limit, offset],
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows], total
+
+    def locate(self, query: str, filters: Dict[str, str], expert_id: str) -> Optional[int]:
+        where, params = self._where(query, filters)
+        join, order, join_params = self._ranking(query)
+        row = self._conn().execute(
+            f"SELECT n FROM (SELECT e.id, ROW_NUMBER() OVER (ORDER BY {order}) - 1 AS n "
+            f"FROM experts e{join}{where}) WHERE id = ?",
+            join_params + params + [expert_id],
+        ).fetchone()
+        return row[0] if row else None
+
+    def facet_values(self, field: str) -> List[str]:
+        rows = self._conn().execute(
+            "SELECT DISTINCT value FROM expert_facets WHERE field = ? ORDER BY value", (field,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def facet_counts(self, field: str, query: str, filters: Dict[str, str]) -> Dict[str, int]:
+        where, params = self._where(query, filters)
+        rows = self._conn().execute(
+            f"SELECT f.value, COUNT(*) FROM expert_facets f "
+            f"WHERE f.field = ? AND f.expert_rowid IN (SELECT e.rowid FROM experts e{where}) "
+            f"GROUP BY f.value",
+            [field] + params,
+        ).fetchall()
+        # Every value is listed, as by the JSON store, including those no match carries
+        counts = dict.fromkeys(self.facet_values(field), 0)
+        counts.update(rows)
+        return counts
+
+    def _publication_where(self, years: YearRange, venue: str) -> Tuple[str, List[Any]]:
+        """Build the WHERE clause over ``year`` and ``venue_key`` selecting a year range and venue."""
+        clauses = []
+        params: List[Any] = []
+        if years[0] is not None:
+            clauses.append("year >= ?")
+            params.append(years[0])
+        if years[1] is not None:
+            clauses.append("year <= ?")
+            params.append(years[1])
+        if venue:
+            keys = matching_venues(venue, self.venue_keys)
+            clauses.append(f"venue_key IN ({', '.join('?' * len(keys))})" if keys else "0")
+            params.extend(keys)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def publications(self, years: YearRange = ALL_YEARS, venue: str = "", offset: int = 0,
+                     limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        where, params = self._publication_where(years, venue)
+        conn = self._conn()
+        total = conn.execute(
+            f"SELECT COALESCE(SUM(publications), 0) FROM publication_counts{where}", params
+        ).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT e.id, e.display_name, p.title, p.year, p.venue FROM "
+            f"(SELECT * FROM publications{where}) p JOIN experts e ON e.rowid = p.expert_rowid "
+            f"ORDER BY p.year IS NULL, p.year DESC, p.expert_rowid, p.position LIMIT ? OFFSET ?",
+            params + [-1 if limit is None else limit, offset],
+        ).fetchall()
+        return [
+            {"expert_id": expert_id, "expert": name, "title": title or "Untitled", "year": year, "venue": venue or ""}
+            for expert_id, name, title, year, venue in rows
+        ], total
+
+    def publication_experts(self, years: YearRange = ALL_YEARS, venue: str = "") -> int:
+        if years == ALL_YEARS and not venue:
+            return self.publication_summary()["experts"]
+        where, params = self._publication_where(years, venue)
+        return self._conn().execute(
+            f"SELECT COUNT(DISTINCT expert_rowid) FROM publications{where}", params
+        ).fetchone()[0]
+
+    def publication_venue_counts(self, years: YearRange = ALL_YEARS) -> Dict[str, int]:
+        where, params = self._publication_where(years, "")
+        where = f"{where} AND venue_key IS NOT NULL" if where else " WHERE venue_key IS NOT NULL"
+        return dict(self._conn().execute(
+            f"SELECT MIN(venue), SUM(publications) FROM publication_counts{where} GROUP BY venue_key", params
+        ).fetchall())
+
+    def publication_summary(self) -> Dict[str, Any]:
+        # Aggregated once per store from the import's precomputed counts
+        if self._publication_summary is None:
+            conn = self._conn()
+            by_year = dict(conn.execute(
+                "SELECT year, SUM(publications) FROM publication_counts "
+                "WHERE year IS NOT NULL GROUP BY year ORDER BY year"
+            ).fetchall())
+            by_venue = self.publication_venue_counts()
+            total = conn.execute("SELECT COALESCE(SUM(publications), 0) FROM publication_counts").fetchone()[0]
+            self._publication_summary = {
+                "publications": total,
+                "experts": int(conn.execute("SELECT value FROM meta WHERE key = 'publication_experts'").fetchone()[0]),
+                "venues": len(by_venue),
+                "first_year": min(by_year) if by_year else None,
+                "last_year": max(by_year) if by_year else None,
+                "by_year": by_year,
+                "by_venue": dict(sorted(by_venue.items(), key=lambda item: (-item[1], item[0]))),
+            }
+        return self._publication_summary
+
+_SQLITE_STORES: Dict[str, Tuple[int, SqliteExpertStore]] = {}
+_SQLITE_LOCK = threading.Lock()
+
+def unavailable_store(path: str, error: str) -> ExpertStore:
+    """Return an empty store reporting ``error``, shown when the configured data cannot be read."""
+    return JsonExpertStore(ExpertDirectory(path, [], "unavailable", 0, 0, 0.0, time.time(), error))
+
+def open_sqlite_store(db_path: str) -> ExpertStore:
+    """Return the shared store for ``db_path``, reopening it after a re-import.
+
+    A missing, unreadable or outdated database gives an empty store whose
+    ``error`` says how to fix it.
+    """
+    try:
+        mtime_ns = os.stat(db_path).st_mtime_ns
+    except OSError:
+        return unavailable_store(
+            db_path, f"SQLite database {db_path} not found; import it with: python expert_store.py experts.json {db_path}"
+        )
+    with _SQLITE_LOCK:
+        cached = _SQLITE_STORES.get(db_path)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        try:
+            store = SqliteExpertStore(db_path)
+        except ValueError as e:
+            store = unavailable_store(db_path, str(e))
+        except sqlite3.Error as e:
+            store = unavailable_store(db_path, f"Error reading SQLite database {db_path}: {e}")
+        _SQLITE_STORES[db_path] = (mtime_ns, store)
+        return store
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import experts.json into a SQLite expert store.")
+    parser.add_argument("json_path")
+    parser.add_argument("db_path")
+    parser.add_argument("--no-documents", action="store_true", help="do not index the text of attached documents")
+    args = parser.parse_args()
+    documents = None
+    if not args.no_documents:
+        # Documents resolve against the experts file's directory, as in the app
+        documents = manifest_document_texts(os.path.dirname(os.path.abspath(args.json_path)))
+        documents.extract(load_directory(args.json_path).experts)
+    count = import_json_to_sqlite(args.json_path, args.db_path, documents)
+    print(f"Imported {count} experts into {args.db_path}")
+
+if __name__ == "__main__":
+    main()
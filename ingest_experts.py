@@ -0,0 +1,320 @@
+"""Bulk import of expert records into a pre-normalized directory file.
+
+Sources are streamed record by record: JSON files in the experts.json
+layout (or a bare top-level array), JSON Lines files and CSV files. Each
+record is validated against the expert schema and normalized with the
+app's ``normalize_expert`` across a process pool. Records are deduplicated
+by ``id`` (earlier sources take precedence) and written out as a compact
+experts.json-compatible file marked ``"normalized": true``, which the app
+loads without normalizing again.
+
+Usage:
+    python ingest_experts.py experts.json new_faculty.csv -o experts.json
+
+CSV columns use the expert field names. List fields (languages, tags,
+expertise, contributions) are separated by ";", and the publications and
+documents columns, if present, hold JSON arrays.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from expert_directory import normalize_expert
+from search_index import publication_year
+
+CHUNK_SIZE = 1 << 16
+BATCH_SIZE = 500
+# Longest JSON token that can be cut off at a chunk boundary and still be valid (a \uXXXX escape)
+PARTIAL_TOKEN_SIZE = 6
+
+# =========================
+# SCHEMA VALIDATION
+# =========================
+STRING_FIELDS = (
+    "id", "full_name", "display_name", "title", "title_en", "nationality",
+    "location", "bio", "bio_en",
+)
+STRING_LIST_FIELDS = ("languages", "tags", "expertise", "areas_of_expertise", "contributions")
+CSV_LIST_SEPARATOR = ";"
+CSV_JSON_FIELDS = ("publications", "documents", "contact")
+
+class InvalidRecord:
+    """A source record that could not be decoded, reported like a schema violation."""
+
+    def __init__(self, error: str):
+        self.error = error
+
+def validate_expert(record: Any) -> List[str]:
+    """Return the schema violations of a raw expert record (empty if valid)."""
+    if isinstance(record, InvalidRecord):
+        return [record.error]
+    if not isinstance(record, dict):
+        return [f"record is a {type(record).__name__}, not an object"]
+
+    errors = []
+    if not record.get("id") and not record.get("full_name"):
+        errors.append("needs an id or a full_name")
+    for field in STRING_FIELDS:
+        if field in record and not isinstance(record[field], str):
+            errors.append(f"{field} must be a string")
+    for field in STRING_LIST_FIELDS:
+        value = record.get(field)
+        if value is not None and not (isinstance(value, list) and all(isinstance(v, str) for v in value)):
+            errors.append(f"{field} must be a list of strings")
+    for pub in record.get("publications") or []:
+        if isinstance(pub, dict):
+            year = pub.get("year")
+            if year not in (None, "") and publication_year(year) is None:
+                errors.append(f"publication year must be a whole number: {year!r}")
+        elif not isinstance(pub, str):
+            errors.append("publications must be objects or strings")
+    for doc in record.get("documents") or []:
+        if not isinstance(doc, (dict, str)):
+            errors.append("documents must be objects or strings")
+        elif isinstance(doc, dict) and not doc.get("file"):
+            errors.append("document is missing its file")
+    return errors
+
+# =========================
+# STREAMING READERS
+# =========================
+class _JsonStream:
+    """Incremental reader of JSON values from a file, a chunk at a time."""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} at offset {self.pos}")
+        self.pos += 1
+
+    def _cut_off(self, error: json.JSONDecodeError) -> bool:
+        """Whether a decode error may come from a value cut off at the end of the buffer."""
+        return error.msg.startswith("Unterminated string") or error.pos >= len(self.buf) - PARTIAL_TOKEN_SIZE
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more input as needed.
+
+        A syntax error before the end of the buffer is raised at once rather
+        than read past, so a malformed record does not pull the rest of the
+        file into memory.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                if not self._cut_off(e) or not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def array_items(self) -> Iterator[Any]:
+        """Yield the items of the JSON array starting at the current position."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+def _json_records(path: str) -> Iterator[Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        stream = _JsonStream(f)
+        if stream.peek() == "[":
+            yield from stream.array_items()
+            return
+
+        stream.expect("{")
+        while stream.peek() != "}":
+            key = stream.value()
+            stream.expect(":")
+            if key == "experts":
+                yield from stream.array_items()
+            else:
+                stream.value()
+            if stream.peek() == ",":
+                stream.pos += 1
+
+def iter_json_records(path: str) -> Iterator[Tuple[str, Any]]:
+    """Stream (location, record) from an experts.json-style object or a top-level array.
+
+    Reading cannot resume after malformed JSON, so it raises ``ValueError``
+    with the location of the record that failed to decode.
+    """
+    number = 0
+    try:
+        for number, record in enumerate(_json_records(path), start=1):
+            yield f"record {number}", record
+    except ValueError as e:
+        raise ValueError(f"{path}, record {number + 1}: invalid JSON: {e}") from e
+
+def iter_jsonl_records(path: str) -> Iterator[Tuple[str, Any]]:
+    """Stream (location, record) from a JSON Lines file; undecodable lines become ``InvalidRecord``."""
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield f"line {number}", json.loads(line)
+            except json.JSONDecodeError as e:
+                yield f"line {number}", InvalidRecord(f"invalid JSON: {e}")
+
+def iter_csv_records(path: str) -> Iterator[Tuple[str, Any]]:
+    """Stream (location, record) from a CSV file with one expert per row.
+
+    A row with invalid JSON in a publications, documents or contact cell
+    becomes an ``InvalidRecord``.
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            location = f"line {reader.line_num}"
+            record: Dict[str, Any] = {}
+            try:
+                for field, value in row.items():
+                    if field is None or value is None or value == "":
+                        continue
+                    field = field.strip()
+                    if field in STRING_LIST_FIELDS:
+                        record[field] = [v.strip() for v in value.split(CSV_LIST_SEPARATOR) if v.strip()]
+                    elif field in CSV_JSON_FIELDS:
+                        record[field] = json.loads(value)
+                    else:
+                        record[field] = value
+            except json.JSONDecodeError as e:
+                yield location, InvalidRecord(f"{field} is not valid JSON: {e}")
+                continue
+            yield location, record
+
+def iter_source_records(path: str) -> Iterator[Tuple[str, Any]]:
+    """Stream (location, raw record) from a source file, chosen by its extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return iter_csv_records(path)
+    if extension in (".jsonl", ".ndjson"):
+        return iter_jsonl_records(path)
+    return iter_json_records(path)
+
+# =========================
+# PIPELINE
+# =========================
+def normalize_batch(batch: List[Tuple[str, str, Any]]) -> List[Tuple[str, str, Optional[Dict[str, Any]], List[str]]]:
+    """Validate and normalize a batch of (source, location, record) in a worker process."""
+    results = []
+    for source, location, record in batch:
+        errors = validate_expert(record)
+        results.append((source, location, None if errors else normalize_expert(record), errors))
+    return results
+
+def iter_batches(sources: List[str]) -> Iterator[List[Tuple[str, str, Any]]]:
+    batch = []
+    for source in sources:
+        for location, record in iter_source_records(source):
+            batch.append((source, location, record))
+            if len(batch) >= BATCH_SIZE:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+def iter_normalized(sources: List[str], workers: int) -> Iterator[Tuple[str, str, Optional[Dict[str, Any]], List[str]]]:
+    """Normalize every source record in order, keeping only a few batches in flight."""
+    if workers <= 1:
+        for batch in iter_batches(sources):
+            yield from normalize_batch(batch)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for batch in iter_batches(sources):
+            pending.append(pool.submit(normalize_batch, batch))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def ingest(sources: List[str], output: str, workers: int, strict: bool = False) -> Dict[str, int]:
+    """Run the pipeline and atomically write the normalized directory to ``output``."""
+    stats = {"written": 0, "invalid": 0, "duplicates": 0}
+    seen = set()
+    temp_path = f"{output}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as out:
+            out.write('{"normalized":true,"experts":[')
+            for source, location, expert, errors in iter_normalized(sources, workers):
+                if errors:
+                    stats["invalid"] += 1
+                    print(f"{source}, {location}: {'; '.join(errors)}", file=sys.stderr)
+                    if strict:
+                        raise ValueError(f"invalid record in {source}, {location}")
+                    continue
+                if expert["id"] in seen:
+                    stats["duplicates"] += 1
+                    continue
+                seen.add(expert["id"])
+                out.write("," if stats["written"] else "\n")
+                out.write(json.dumps(expert, ensure_ascii=False, separators=(",", ":")))
+                out.write("\n")
+                stats["written"] += 1
+            out.write("]}\n")
+        os.replace(temp_path, output)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return stats
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stream, validate and normalize expert records.")
+    parser.add_argument("sources", nargs="+", help="JSON, JSON Lines or CSV files, in precedence order")
+    parser.add_argument("-o", "--output", required=True, help="normalized experts file to write")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--strict", action="store_true", help="stop at the first invalid record")
+    args = parser.parse_args()
+
+    stats = ingest(args.sources, args.output, args.workers, args.strict)
+    print(f"Wrote {stats['written']} experts to {args.output} "
+          f"({stats['duplicates']} duplicates, {stats['invalid']} invalid records skipped)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""Opt-in per-rerun profiling of the app.
+
+Enabled for every rerun with ``EXPERTS_PROFILE=1``. With
+``EXPERTS_PROFILE=query`` only sessions opened with the ``?profile=1`` query
+parameter are profiled; otherwise the parameter is ignored, so visitors
+cannot turn profiling on.
+Each rerun of ``main()`` (or of a fragment on its own) records the time and
+the bytes sent to the browser per stage. Bytes are the serialized size of the
+forward messages the rerun enqueues, counted by wrapping the script run
+context's enqueue callback for the duration of the rerun.
+
+Finished reruns are:
+
+* kept in the session for the debug panel;
+* logged as one JSON line each on the ``expert_directory.profile`` logger;
+* aggregated per process and written as Prometheus text to
+  ``<metrics dir>/<host>-<pid>.prom``, a textfile-collector style file per
+  worker that node_exporter, or anything reading the files, can sum across
+  workers. The directory defaults to ``.cache/metrics``, outside the
+  statically served ``static/`` tree.
+"""
+import functools
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+# "1" profiles every rerun, "query" only sessions opened with ?profile=1
+PROFILE_SETTING = os.environ.get("EXPERTS_PROFILE", "0").lower()
+PROFILE_ENV = PROFILE_SETTING in ("1", "true", "yes")
+PROFILE_QUERY_ALLOWED = PROFILE_ENV or PROFILE_SETTING == "query"
+METRICS_DIR = os.environ.get("EXPERTS_PROFILE_METRICS_DIR", os.path.join(APP_DIR, ".cache", "metrics"))
+# Minimum seconds between two writes of the worker's metrics file
+METRICS_WRITE_INTERVAL = 1.0
+# Upper bounds of the stage duration histogram, in seconds
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Finished reruns kept per session for the debug panel
+SESSION_HISTORY = 20
+
+LOGGER = logging.getLogger("expert_directory.profile")
+WORKER = f"{socket.gethostname()}-{os.getpid()}"
+
+def profiling_enabled() -> bool:
+    """Whether this rerun is profiled, by environment or, when allowed, query parameter."""
+    if PROFILE_ENV:
+        return True
+    return PROFILE_QUERY_ALLOWED and st.query_params.get("profile", "").lower() in ("1", "true", "yes")
+
+# =========================
+# PER-RERUN PROFILE
+# =========================
+class SentBytes:
+    """Enqueue callback wrapper counting the serialized bytes of forward messages."""
+
+    def __init__(self, enqueue: Callable[[Any], None]):
+        self.enqueue = enqueue
+        self.total = 0
+
+    def __call__(self, msg) -> None:
+        self.total += msg.ByteSize()
+        self.enqueue(msg)
+
+class RerunProfile:
+    """Stage timings and bytes sent of one rerun.
+
+    Stages are sequential within a scope: starting a stage ends the current
+    one. Nested scopes (a fragment called from ``main()``) record their
+    stages as ``<scope>/<stage>`` inside the enclosing stage.
+    """
+
+    def __init__(self, scope: str, sent: Optional[SentBytes]):
+        self.scope = scope
+        self.sent = sent
+        self.started = time.perf_counter()
+        self.stages: List[Dict[str, Any]] = []
+        # Open scopes: [prefix, current stage record, stage start time, bytes at stage start]
+        self._scopes: List[List[Any]] = [["", None, self.started, self.bytes_sent]]
+        self.seconds = 0.0
+        self.bytes = 0
+
+    @property
+    def bytes_sent(self) -> int:
+        return self.sent.total if self.sent else 0
+
+    def start_stage(self, name: Optional[str]) -> None:
+        """End the current stage of the innermost scope and start ``name``."""
+        scope = self._scopes[-1]
+        now, sent = time.perf_counter(), self.bytes_sent
+        if scope[1] is not None:
+            scope[1]["ms"] = round((now - scope[2]) * 1000, 3)
+            scope[1]["bytes"] = sent - scope[3]
+        stage = None
+        if name is not None:
+            # Appended on start, so stages are listed in the order they ran
+            stage = {"stage": scope[0] + name, "ms": 0.0, "bytes": 0}
+            self.stages.append(stage)
+        scope[1:] = [stage, now, sent]
+
+    def push_scope(self, name: str) -> None:
+        prefix = self._scopes[-1][0] + name + "/"
+        self._scopes.append([prefix, None, time.perf_counter(), self.bytes_sent])
+
+    def pop_scope(self) -> None:
+        self.start_stage(None)
+        self._scopes.pop()
+
+    def finish(self) -> None:
+        while len(self._scopes) > 1:
+            self.pop_scope()
+        self.start_stage(None)
+        self.seconds = time.perf_counter() - self.started
+        self.bytes = self.bytes_sent
+
+    def record(self) -> Dict[str, Any]:
+        return {
+            "scope": self.scope,
+            "ms": round(self.seconds * 1000, 3),
+            "bytes": self.bytes,
+            "stages": self.stages,
+        }
+
+# The profile of the rerun running on this script thread, if any
+_ACTIVE = threading.local()
+
+def active_profile() -> Optional[RerunProfile]:
+    return getattr(_ACTIVE, "profile", None)
+
+def start_stage(name: str) -> None:
+    """Start a new stage of the current rerun; a no-op when not profiling."""
+    profile = active_profile()
+    if profile is not None:
+        profile.start_stage(name)
+
+@contextmanager
+def profiled_run(scope: str) -> Iterator[Optional[RerunProfile]]:
+    """Profile a rerun of ``scope``, or nest it in the rerun already being profiled."""
+    profile = active_profile()
+    if profile is not None:
+        profile.push_scope(scope)
+        try:
+            yield profile
+        finally:
+            profile.pop_scope()
+        return
+
+    if not profiling_enabled():
+        yield None
+        return
+
+    ctx = get_script_run_ctx()
+    sent = None
+    if ctx is not None:
+        sent = SentBytes(ctx._enqueue)
+        ctx._enqueue = sent
+    profile = _ACTIVE.profile = RerunProfile(scope, sent)
+    try:
+        yield profile
+    finally:
+        _ACTIVE.profile = None
+        if sent is not None:
+            ctx._enqueue = sent.enqueue
+        profile.finish()
+        _publish(profile, ctx.session_id if ctx is not None else None)
+
+def profiled(scope: str) -> Callable:
+    """Decorator running a function under ``profiled_run(scope)``."""
+    def decorate(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profiled_run(scope):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def session_profiles() -> List[Dict[str, Any]]:
+    """The session's recently finished reruns, oldest first."""
+    return st.session_state.get("rerun_profiles", [])
+
+# =========================
+# EXPORT
+# =========================
+class MetricsRegistry:
+    """Process-wide aggregate of profiled reruns, rendered as Prometheus text."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # (scope, stage) → [count, seconds, bytes, bucket counts]; stage "" is the whole rerun
+        self.series: Dict[Tuple[str, str], List[Any]] = {}
+        self.written = 0.0
+
+    def observe(self, profile: RerunProfile) -> None:
+        with self.lock:
+            self._add(profile.scope, "", profile.seconds, profile.bytes)
+            for stage in profile.stages:
+                self._add(profile.scope, stage["stage"], stage["ms"] / 1000, stage["bytes"])
+
+    def _add(self, scope: str, stage: str, seconds: float, sent: int) -> None:
+        series = self.series.get((scope, stage))
+        if series is None:
+            series = self.series[(scope, stage)] = [0, 0.0, 0, [0] * len(DURATION_BUCKETS)]
+        series[0] += 1
+        series[1] += seconds
+        series[2] += sent
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if seconds <= bound:
+                series[3][i] += 1
+
+    def prometheus_text(self) -> str:
+        """Render the aggregates in the Prometheus text exposition format."""
+        lines = [
+            "# HELP expert_directory_rerun_seconds Duration of profiled reruns and of their stages.",
+            "# TYPE expert_directory_rerun_seconds histogram",
+        ]
+        with self.lock:
+            series = sorted(self.series.items())
+            for (scope, stage), (count, seconds, _, buckets) in series:
+                labels = f'worker="{WORKER}",scope="{scope}",stage="{stage}"'
+                for bound, bucket in zip(DURATION_BUCKETS, buckets):
+                    lines.append(f'expert_directory_rerun_seconds_bucket{{{labels},le="{bound}"}} {bucket}')
+                lines.append(f'expert_directory_rerun_seconds_bucket{{{labels},le="+Inf"}} {count}')
+                lines.append(f"expert_directory_rerun_seconds_sum{{{labels}}} {seconds:.6f}")
+                lines.append(f"expert_directory_rerun_seconds_count{{{labels}}} {count}")
+            lines += [
+                "# HELP expert_directory_rerun_sent_bytes_total Serialized bytes sent by profiled reruns and their stages.",
+                "# TYPE expert_directory_rerun_sent_bytes_total counter",
+            ]
+            for (scope, stage), (_, _, sent, _) in series:
+                labels = f'worker="{WORKER}",scope="{scope}",stage="{stage}"'
+                lines.append(f"expert_directory_rerun_sent_bytes_total{{{labels}}} {sent}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, force: bool = False) -> Optional[str]:
+        """Atomically rewrite this worker's metrics file, at most once per interval."""
+        now = time.monotonic()
+        if not force and now - self.written < METRICS_WRITE_INTERVAL:
+            return None
+        self.written = now
+        path = os.path.join(METRICS_DIR, f"{WORKER}.prom")
+        try:
+            os.makedirs(METRICS_DIR, exist_ok=True)
+            temporary = f"{path}.{threading.get_ident()}.tmp"
+            with open(temporary, "w", encoding="utf-8") as f:
+                f.write(self.prometheus_text())
+            os.replace(temporary, path)
+        except OSError as e:
+            LOGGER.warning("Could not write metrics to %s: %s", path, e)
+            return None
+        return path
+
+METRICS = MetricsRegistry()
+
+def _configure_logger() -> None:
+    # Streamlit only configures its own loggers; give the profile log a handler of its own
+    if not LOGGER.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        LOGGER.addHandler(handler)
+        LOGGER.setLevel(logging.INFO)
+        LOGGER.propagate = False
+
+def _publish(profile: RerunProfile, session_id: Optional[str]) -> None:
+    """Keep, log and aggregate a finished rerun."""
+    record = profile.record()
+    history = st.session_state.setdefault("rerun_profiles", [])
+    history.append(record)
+    del history[:-SESSION_HISTORY]
+
+    _configure_logger()
+    LOGGER.info(json.dumps({
+        "event": "rerun_profile", "time": round(time.time(), 3), "worker": WORKER, "session": session_id, **record,
+    }, ensure_ascii=False))
+
+    METRICS.observe(profile)
+    METRICS.write()
@@ -0,0 +1,724 @@
+"""Inverted full-text index over the experts directory.
+
+The index is built once per directory version and maps every normalized
+token in the searchable fields to the sorted positions of the experts that
+contain it. A query is split into the same tokens; each query token matches
+any indexed token it is a prefix of, and the per-token matches are
+intersected, so a query only touches the posting lists it needs.
+
+Matches are ranked with BM25F: names weigh more than expertise, expertise
+more than tags, tags more than the bio and the bio more than the text of
+attached documents, and the best ``k`` results are
+selected with a heap.
+"""
+import heapq
+import math
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from functools import lru_cache
+from itertools import chain, groupby, islice, repeat
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+# =========================
+# TEXT NORMALIZATION
+# =========================
+# Harakat, tanween, shadda, sukun, superscript alef and tatweel
+ARABIC_DIACRITICS_RE = re.compile("[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]")
+
+ARABIC_FOLDING = str.maketrans({
+    "أ": "ا",
+    "إ": "ا",
+    "آ": "ا",
+    "ٱ": "ا",
+    "ى": "ي",
+    "ئ": "ي",
+    "ؤ": "و",
+    "ة": "ه",
+})
+
+# The definite article, alone or after the conjunctions و/ف and the prepositions
+# ب/ك/ل (ل+ال is written لل), when at least two letters of the word are left
+ARABIC_ARTICLE_RE = re.compile(r"\b(?:[وفبك]?ال|لل)(?=\w\w)")
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Ranked fields and their BM25F weights
+FIELD_WEIGHTS = {"name": 3.0, "expertise": 2.5, "tags": 2.0, "bio": 1.0, "documents": 0.5}
+BM25_K1 = 1.2
+BM25_B = 0.75
+LENGTH_SAMPLE_SIZE = 1000
+# A forward-index check of one candidate costs about this many posting reads
+FORWARD_CHECK_COST = 8
+
+def normalize_text(text: str) -> str:
+    """Casefold text, fold Arabic letter variants and diacritics and drop the Arabic article.
+
+    "القانون", "والقانون" and "قانون" all become "قانون", in indexed text and
+    queries alike.
+    """
+    text = text.casefold()
+    if text.isascii():
+        return text
+    return ARABIC_ARTICLE_RE.sub("", ARABIC_DIACRITICS_RE.sub("", text).translate(ARABIC_FOLDING))
+
+@lru_cache(maxsize=65536)
+def normalize_value(value: str) -> str:
+    """Normalize a value shared by many experts (a tag, an area of expertise) only once."""
+    return normalize_text(value)
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalized search tokens."""
+    return TOKEN_RE.findall(normalize_text(text))
+
+def query_refines(query: str, previous: str) -> bool:
+    """Whether every match of ``query`` is also a match of ``previous``.
+
+    True when each token of ``previous`` is a prefix of a token of ``query``,
+    as when a word is typed further or another word is added.
+    """
+    tokens = tokenize(query)
+    return all(any(token.startswith(old) for token in tokens) for old in tokenize(previous))
+
+def expert_search_document(expert: Mapping[str, Any], document_text: str = "") -> Dict[str, str]:
+    """Return the normalized searchable text of an expert, per ranked field.
+
+    The name field covers full_name and display_name; the display name
+    usually contains the full name already, which is then not repeated.
+    List values come from a per-value cache, so tags and areas of expertise
+    repeated across the directory are normalized once per process.
+    """
+    full_name = str(expert.get("full_name") or "")
+    display_name = str(expert.get("display_name") or "")
+    name = display_name if full_name in display_name else f"{display_name} {full_name}"
+    return {
+        "name": normalize_text(name),
+        "expertise": " ".join([normalize_value(str(value)) for value in expert.get("expertise") or []]),
+        "tags": " ".join([normalize_value(str(value)) for value in expert.get("tags") or []]),
+        "bio": normalize_text(str(expert.get("bio_en") or "")),
+        "documents": normalize_text(document_text),
+    }
+
+def search_documents(experts: Iterable[Mapping[str, Any]]) -> List[Dict[str, str]]:
+    """Return the search documents of ``experts``, without the text of their attached documents.
+
+    Built once per directory snapshot and shared by the full-text and name
+    indexes, so a rebuild for new document text does not normalize them again.
+    """
+    return [expert_search_document(expert) for expert in experts]
+
+# =========================
+# INVERTED INDEX
+# =========================
+class SearchIndex:
+    """Token → expert positions index with prefix lookups and BM25F ranking.
+
+    Every posting carries the expert's field-weighted, length-normalized
+    term frequency for the token, so scoring a query only reads the
+    postings of the tokens it matches. ``document_texts`` holds the text
+    extracted from each expert's attached documents, indexed as the
+    lowest-weighted field. ``documents`` are the experts' precomputed
+    ``search_documents``, normalized here when not given.
+    """
+
+    def __init__(self, experts: Sequence[Mapping[str, Any]], document_texts: Optional[Sequence[str]] = None,
+                 documents: Optional[Sequence[Mapping[str, str]]] = None):
+        self.size = len(experts)
+        fields = tuple(FIELD_WEIGHTS)
+
+        def search_document(position: int) -> Mapping[str, str]:
+            document_text = document_texts[position] if document_texts else ""
+            if documents is None:
+                return expert_search_document(experts[position], document_text)
+            if document_text:
+                return dict(documents[position], documents=normalize_text(document_text))
+            return documents[position]
+
+        # Average field lengths, estimated from an evenly spaced sample
+        sample = [search_document(i) for i in range(0, self.size, max(1, self.size // LENGTH_SAMPLE_SIZE))]
+        averages = []
+        for field in fields:
+            total = sum(len(TOKEN_RE.findall(document[field])) for document in sample)
+            averages.append((total / len(sample) if sample else 0) or 1.0)
+
+        postings: Dict[str, Tuple[array, array, int]] = {}
+        # Forward index: the terms of every expert, numbered in first-seen order for now
+        self.document_offsets = array("I", [0])
+        self.document_terms = array("I")
+        for position in range(self.size):
+            document = search_document(position)
+            weights: Dict[str, float] = {}
+            for field, average in zip(fields, averages):
+                tokens = TOKEN_RE.findall(document[field])
+                # Each occurrence adds the field weight over the field's length norm
+                increment = FIELD_WEIGHTS[field] / (1 - BM25_B + BM25_B * len(tokens) / average)
+                for token in tokens:
+                    weights[token] = weights.get(token, 0.0) + increment
+            for token, weight in weights.items():
+                entry = postings.get(token)
+                if entry is None:
+                    entry = postings[token] = (array("I"), array("f"), len(postings))
+                entry[0].append(position)
+                entry[1].append(weight)
+                self.document_terms.append(entry[2])
+            self.document_offsets.append(len(self.document_terms))
+
+        # Store each posting's BM25 score, so ranking only sums precomputed impacts
+        self.postings: Dict[str, array] = {}
+        self.impacts: Dict[str, array] = {}
+        for token, (positions, weights, _) in postings.items():
+            idf = math.log(1 + (self.size - len(positions) + 0.5) / (len(positions) + 0.5))
+            self.postings[token] = positions
+            self.impacts[token] = array("f", [idf * w / (BM25_K1 + w) for w in weights])
+        self.terms = sorted(self.postings)
+        self.frequencies = array("I", [len(self.postings[term]) for term in self.terms])
+
+        # Renumber forward entries by sorted term and sort them per expert, so a
+        # refined query can bisect a few candidates instead of reading postings
+        numbers = {term: number for number, term in enumerate(self.terms)}
+        renumbered = [numbers[term] for term in postings]
+        terms = array("I", map(renumbered.__getitem__, self.document_terms))
+        offsets = self.document_offsets
+        for position in range(self.size):
+            start, end = offsets[position], offsets[position + 1]
+            terms[start:end] = array("I", sorted(terms[start:end]))
+        self.document_terms = terms
+
+    def term_range(self, prefix: str) -> Tuple[int, int]:
+        """Return the [start, end) numbers of the sorted terms starting with ``prefix``."""
+        start = end = bisect_left(self.terms, prefix)
+        while end < len(self.terms) and self.terms[end].startswith(prefix):
+            end += 1
+        return start, end
+
+    def expand(self, prefix: str) -> List[str]:
+        """Return the indexed tokens starting with ``prefix``."""
+        start, end = self.term_range(prefix)
+        return self.terms[start:end]
+
+    def has_term(self, position: int, start: int, end: int) -> bool:
+        """Whether the expert at ``position`` has a term numbered in [start, end)."""
+        hi = self.document_offsets[position + 1]
+        i = bisect_left(self.document_terms, start, self.document_offsets[position], hi)
+        return i < hi and self.document_terms[i] < end
+
+    def prefix_matches(self, prefix: str) -> Set[int]:
+        """Return positions of experts with any token starting with ``prefix``."""
+        matches: Set[int] = set()
+        for term in self.expand(prefix):
+            matches.update(self.postings[term])
+        return matches
+
+    def search(self, query: str) -> List[int]:
+        """Return the sorted positions of experts matching every query token."""
+        tokens = tokenize(query)
+        if not tokens:
+            return list(range(self.size))
+
+        result: Set[int] = set()
+        for i, token in enumerate(sorted(set(tokens), key=len, reverse=True)):
+            matches = self.prefix_matches(token)
+            result = matches if i == 0 else result & matches
+            if not result:
+                return []
+        return sorted(result)
+
+    def refine(self, query: str, previous: str, mask: int) -> int:
+        """Return the bitset of ``query`` matches within ``mask``, the matches of ``previous``.
+
+        ``query`` must refine ``previous`` (see ``query_refines``). Only the
+        tokens ``previous`` did not have are checked, each against the
+        candidates' forward entries or through its postings, whichever
+        reads less.
+        """
+        new_tokens = set(tokenize(query)) - set(tokenize(previous))
+        for token in sorted(new_tokens, key=len, reverse=True):
+            start, end = self.term_range(token)
+            if mask.bit_count() * FORWARD_CHECK_COST < sum(self.frequencies[start:end]):
+                candidates = mask_to_positions(mask)
+                mask = positions_to_mask((p for p in candidates if self.has_term(p, start, end)), self.size)
+            else:
+                mask &= positions_to_mask(self.prefix_matches(token), self.size)
+            if not mask:
+                break
+        return mask
+
+    def rank(self, query: str, candidates: Sequence[int], k: Optional[int] = None) -> List[int]:
+        """Return the ``k`` best-scoring ``candidates`` for ``query``, best first.
+
+        A query token scores an expert through its best prefix expansion.
+        The top ``k`` are taken with a heap instead of sorting every
+        candidate; ties keep the order of ``candidates``.
+        """
+        token_scores = []
+        for token in set(tokenize(query)):
+            best: Dict[int, float] = {}
+            for term in self.expand(token):
+                impacts = zip(self.postings[term], self.impacts[term])
+                if not best:
+                    best = dict(impacts)
+                    continue
+                for position, impact in impacts:
+                    if impact > best.get(position, 0.0):
+                        best[position] = impact
+            token_scores.append(best)
+        if not token_scores:
+            return list(candidates[:k])
+
+        columns = [list(map(best.get, candidates, repeat(0.0))) for best in token_scores]
+        scores = columns[0] if len(columns) == 1 else list(map(sum, zip(*columns)))
+        if k is None:
+            order = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+        else:
+            order = heapq.nlargest(k, range(len(scores)), key=scores.__getitem__)
+        return [candidates[i] for i in order]
+
+# =========================
+# FACET INDEX
+# =========================
+FACET_FIELDS = ("tags", "expertise")
+
+# Positions of the set bits in every possible byte value
+_BYTE_BITS = [tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+
+def positions_to_mask(positions: Iterable[int], size: int) -> int:
+    """Pack expert positions into an integer bitset."""
+    buffer = bytearray((size + 7) // 8)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, "little")
+
+def mask_to_positions(mask: int) -> List[int]:
+    """Unpack an integer bitset into sorted expert positions."""
+    positions = []
+    for offset, byte in enumerate(mask.to_bytes((mask.bit_length() + 7) // 8, "little")):
+        if byte:
+            base = offset << 3
+            positions.extend(base + bit for bit in _BYTE_BITS[byte])
+    return positions
+
+class FacetIndex:
+    """Facet value → bitset of expert positions for tags and expertise.
+
+    Combined filters are bitwise intersections, and the number of experts
+    behind each facet value for any result set is a popcount, so neither
+    needs another pass over the experts.
+    """
+
+    def __init__(self, experts: List[Dict[str, Any]]):
+        self.size = len(experts)
+        self.all_mask = (1 << self.size) - 1
+        self.masks: Dict[str, Dict[str, int]] = {}
+        self.values: Dict[str, List[str]] = {}
+        for field in FACET_FIELDS:
+            positions: Dict[str, List[int]] = {}
+            for position, expert in enumerate(experts):
+                for value in set(expert.get(field) or []):
+                    positions.setdefault(value, []).append(position)
+            self.masks[field] = {
+                value: positions_to_mask(value_positions, self.size)
+                for value, value_positions in positions.items()
+            }
+            self.values[field] = sorted(positions)
+
+    def mask(self, field: str, value: str) -> int:
+        """Return the bitset of experts having ``value`` in ``field``."""
+        return self.masks[field].get(value, 0)
+
+    def counts(self, field: str, mask: int) -> Dict[str, int]:
+        """Return how many experts in ``mask`` carry each value of ``field``."""
+        if mask == self.all_mask:
+            return {value: m.bit_count() for value, m in self.masks[field].items()}
+        return {value: (m & mask).bit_count() for value, m in self.masks[field].items()}
+
+# =========================
+# PUBLICATION INDEX
+# =========================
+def publication_year(value: Any) -> Optional[int]:
+    """Return a publication year as an int, or None if it is missing or not a year."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value.strip())
+    return None
+
+def matching_venues(venue: str, keys: Iterable[str]) -> List[str]:
+    """Return the normalized venue keys a venue filter selects.
+
+    An exact venue selects itself; otherwise every venue containing the
+    filter text does, so "Journal of Law College" also selects "Journal of
+    Law College - University of Baghdad".
+    """
+    key = normalize_value(venue)
+    keys = list(keys)
+    if not key or key in keys:
+        return [key] if key else []
+    return [k for k in keys if key in k]
+
+class PublicationIndex:
+    """Every expert's publications, ordered newest first, with year and venue counts.
+
+    Publications are numbered in directory order and kept as columns (expert
+    position, index in the expert's list, year, venue). A year range is two
+    bisects into the year-ordered numbers, of the whole directory or of a
+    venue, and the directory-wide counts are computed once here, so neither
+    a query nor the summary walks the experts' publication lists.
+    Publications without a year only match queries without a year range.
+    Venues are grouped by normalized name and shown as first spelled.
+    """
+
+    def __init__(self, experts: Sequence[Mapping[str, Any]]):
+        self.expert_positions = array("I")
+        self.items = array("I")
+        years: List[Optional[int]] = []
+        venue_numbers: List[int] = []
+        # Normalized venue → venue number
+        self.venue_keys: List[str] = []
+        self.venue_names: List[str] = []
+        numbers: Dict[str, int] = {}
+        for position, expert in enumerate(experts):
+            for item, pub in enumerate(expert.get("publications") or []):
+                year, venue = (publication_year(pub.get("year")), str(pub.get("venue") or "")) \
+                    if isinstance(pub, dict) else (None, "")
+                key = normalize_value(venue)
+                number = numbers.get(key, -1) if key else -1
+                if key and number < 0:
+                    number = numbers[key] = len(self.venue_keys)
+                    self.venue_keys.append(key)
+                    self.venue_names.append(venue.strip())
+                self.expert_positions.append(position)
+                self.items.append(item)
+                years.append(year)
+                venue_numbers.append(number)
+        self.count = len(years)
+        self.years = years
+
+        # Newest first, directory order within a year; bisected on negated years
+        dated = sorted((n for n in range(self.count) if years[n] is not None), key=lambda n: (-years[n], n))
+        self.order = array("I", dated)
+        self.keys = array("i", [-years[n] for n in dated])
+        self.undated = array("I", [n for n in range(self.count) if years[n] is None])
+        self.venue_order: List[array] = [array("I") for _ in self.venue_keys]
+        self.venue_undated: List[array] = [array("I") for _ in self.venue_keys]
+        for n in dated:
+            if venue_numbers[n] >= 0:
+                self.venue_order[venue_numbers[n]].append(n)
+        for n in self.undated:
+            if venue_numbers[n] >= 0:
+                self.venue_undated[venue_numbers[n]].append(n)
+        self.venue_sort_keys = [array("i", [-years[n] for n in order]) for order in self.venue_order]
+        self.venue_numbers = numbers
+
+        venue_counts = {
+            name: len(self.venue_order[v]) + len(self.venue_undated[v]) for v, name in enumerate(self.venue_names)
+        }
+        self._summary = {
+            "publications": self.count,
+            "experts": len(set(self.expert_positions)),
+            "venues": len(self.venue_keys),
+            "first_year": -self.keys[-1] if self.keys else None,
+            "last_year": -self.keys[0] if self.keys else None,
+            "by_year": {-key: len(list(group)) for key, group in groupby(reversed(self.keys))},
+            "by_venue": dict(sorted(venue_counts.items(), key=lambda item: (-item[1], item[0]))),
+        }
+
+    def _slice(self, keys: array, years: Tuple[Optional[int], Optional[int]]) -> Tuple[int, int]:
+        year_from, year_to = years
+        start = 0 if year_to is None else bisect_left(keys, -year_to)
+        end = len(keys) if year_from is None else bisect_right(keys, -year_from)
+        return start, end
+
+    def venues(self, venue: str) -> List[int]:
+        """Return the venue numbers a venue filter selects."""
+        return [self.venue_numbers[key] for key in matching_venues(venue, self.venue_keys)]
+
+    def query(self, years: Tuple[Optional[int], Optional[int]] = (None, None), venue: str = "") -> List[int]:
+        """Return the numbers of the publications in a year range and venue, newest first."""
+        return self.page(years, venue)
+
+    def page(self, years: Tuple[Optional[int], Optional[int]] = (None, None), venue: str = "",
+             offset: int = 0, limit: Optional[int] = None) -> List[int]:
+        """Return ``query(years, venue)[offset:offset + limit]`` without building the whole result.
+
+        Without a venue the page is sliced straight from the ordered arrays;
+        with one, the venues' ranges are merged lazily up to the page end.
+        """
+        unbounded = years == (None, None)
+        stop = None if limit is None else offset + limit
+        if not venue:
+            start, end = self._slice(self.keys, years)
+            numbers = list(self.order[start + offset:end if stop is None else min(end, start + stop)])
+            if unbounded:
+                dated = end - start
+                numbers += self.undated[max(0, offset - dated):None if stop is None else max(0, stop - dated)]
+            return numbers
+        parts = []
+        selected = self.venues(venue)
+        for v in selected:
+            start, end = self._slice(self.venue_sort_keys[v], years)
+            parts.append(islice(self.venue_order[v], start, end))
+        numbers = heapq.merge(*parts, key=lambda n: (-self.years[n], n))
+        if unbounded:
+            numbers = chain(numbers, heapq.merge(*(self.venue_undated[v] for v in selected)))
+        return list(islice(numbers, offset, stop))
+
+    def count_range(self, years: Tuple[Optional[int], Optional[int]] = (None, None), venue: str = "") -> int:
+        """Return how many publications are in a year range and venue, from bisects only."""
+        unbounded = years == (None, None)
+        if not venue:
+            start, end = self._slice(self.keys, years)
+            return end - start + (len(self.undated) if unbounded else 0)
+        total = 0
+        for v in self.venues(venue):
+            start, end = self._slice(self.venue_sort_keys[v], years)
+            total += end - start + (len(self.venue_undated[v]) if unbounded else 0)
+        return total
+
+    def venue_counts_in(self, years: Tuple[Optional[int], Optional[int]] = (None, None)) -> Dict[str, int]:
+        """Return the number of publications of every venue in a year range."""
+        if years == (None, None):
+            return dict(self._summary["by_venue"])
+        counts = {}
+        for v, name in enumerate(self.venue_names):
+            start, end = self._slice(self.venue_sort_keys[v], years)
+            if end > start:
+                counts[name] = end - start
+        return counts
+
+    def expert_mask(self, numbers: Iterable[int], size: int) -> int:
+        """Return the bitset of the experts who wrote the publications ``numbers``."""
+        return positions_to_mask((self.expert_positions[n] for n in numbers), size)
+
+    def summary(self) -> Dict[str, Any]:
+        """Directory-wide publication counts, computed when the index was built."""
+        return self._summary
+
+# =========================
+# FUZZY NAME INDEX
+# =========================
+# Name words are reduced to a consonant skeleton shared by Arabic script and
+# its Latin transliterations: short and long vowels, hamza and ain are
+# dropped, letters with several common spellings are folded together, and
+# doubled letters collapse. "Al-Ghannami", "Alghannami", "Ghanami" and
+# "الغنامي" all become "gnm"; typos are then absorbed by edit distance.
+# Short skeletons are too ambiguous for that ("Hassan" and "Hussein" are
+# both "hsn"), so they must match exactly and Latin spellings are then
+# compared with their vowels kept.
+NAME_WORD_RE = re.compile(r"[^\W\d_]+")
+
+NAME_APOSTROPHES = str.maketrans(dict.fromkeys("'`ʿʾ’‘", ""))
+
+# Applied to words that are already normalize_text()-folded
+LATIN_DIGRAPHS = (("kh", "X"), ("gh", "G"), ("sh", "S"), ("ch", "S"), ("th", "t"), ("dh", "d"), ("ph", "f"))
+
+NAME_TRANSLITERATION = str.maketrans({
+    # Latin: vowels become one vowel class, and letters with variant spellings fold
+    "e": "a", "i": "a", "o": "a", "u": "a", "q": "k", "c": "k",
+    # Arabic, Persian and Kurdish letters
+    "ا": "a", "ە": "a", "ء": "", "ع": "",
+    "ب": "b", "پ": "p", "ت": "t", "ث": "t", "ج": "j", "چ": "S", "ح": "h", "خ": "X",
+    "د": "d", "ذ": "d", "ر": "r", "ڕ": "r", "ز": "z", "ژ": "j", "س": "s", "ش": "S",
+    "ص": "s", "ض": "d", "ط": "t", "ظ": "d", "غ": "G", "ف": "f", "ڤ": "v", "ق": "k",
+    "ك": "k", "ک": "k", "گ": "g", "ل": "l", "ڵ": "l", "م": "m", "ن": "n", "ه": "h",
+    "ھ": "h", "و": "w", "ۆ": "w", "ي": "y", "ی": "y", "ێ": "y",
+})
+
+# Vowels everywhere, and w/y after the first letter, are left out of the skeleton
+SKELETON_DROPPED = str.maketrans(dict.fromkeys("awy", ""))
+
+# Latin consonants with variant spellings, folded in spellings that keep their vowels
+LATIN_CONSONANTS = str.maketrans({"q": "k", "c": "k"})
+
+NAME_ARTICLES = ("al", "el", "ال")
+
+# Keys up to this length match exactly and are confirmed by spelling
+SHORT_NAME_KEY = 3
+
+def _name_letters(word: str) -> str:
+    """Strip the article of one folded name word and fold its Latin digraphs."""
+    if word.startswith("ال") and len(word) > 3:
+        word = word[2:]
+    elif word[:2] in ("al", "el") and len(word) > 4 and word[2] not in "aeiou":
+        word = word[2:]
+    for digraph, symbol in LATIN_DIGRAPHS:
+        word = word.replace(digraph, symbol)
+    return word
+
+def _strip_final_h(word: str) -> str:
+    # Final h: ta marbuta and "-ah" endings (Fatima / Fatimah / فاطمة)
+    return word[:-1] if len(word) > 1 and word.endswith("h") else word
+
+@lru_cache(maxsize=1 << 16)
+def name_key(word: str) -> str:
+    """Return the transliteration-independent skeleton of one folded name word."""
+    if word in NAME_ARTICLES:
+        return ""
+    word = _strip_final_h(_name_letters(word).translate(NAME_TRANSLITERATION))
+    head = "" if word[:1] == "a" else word[:1]
+    skeleton = head + word[1:].translate(SKELETON_DROPPED)
+    return "".join(letter for letter, _ in groupby(skeleton))
+
+@lru_cache(maxsize=1 << 16)
+def name_spelling(word: str) -> str:
+    """Return the Latin spelling of one folded name word with its vowels, or "" for other scripts.
+
+    "Hussein", "Husein" and "Hussain" stay within one edit of each other
+    but not of "Hassan", which shares their skeleton.
+    """
+    if not word.isascii() or word in NAME_ARTICLES:
+        return ""
+    word = _strip_final_h(_name_letters(word).translate(LATIN_CONSONANTS))
+    return "".join(letter for letter, _ in groupby(word))
+
+def name_words(text: str) -> List[Tuple[str, str]]:
+    """Split a name or query into the (skeleton key, spelling) of its words."""
+    return folded_name_words(normalize_text(text))
+
+def folded_name_words(text: str) -> List[Tuple[str, str]]:
+    """``name_words`` of text already passed through normalize_text, such as a search document's name."""
+    text = text.translate(NAME_APOSTROPHES)
+    if not text.isascii():
+        # Drop Latin accents (é, ā, ḥ) as well
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(char for char in text if not unicodedata.combining(char))
+    words = ((name_key(word), name_spelling(word)) for word in NAME_WORD_RE.findall(text))
+    return [(key, spelling) for key, spelling in words if key]
+
+def name_keys(text: str) -> List[str]:
+    """Split a name or query into the skeleton keys of its words."""
+    return [key for key, _ in name_words(text)]
+
+def max_name_edits(key: str) -> int:
+    """Edits a key tolerates: none up to three letters, then one, then two."""
+    return 0 if len(key) <= SHORT_NAME_KEY else 1 if len(key) <= 5 else 2
+
+def spellings_match(query: str, spelling: str) -> bool:
+    """Whether a query word's spelling confirms a name word with the same short key.
+
+    Words in Arabic script have no spelling and are confirmed by the key alone.
+    """
+    return not query or not spelling or bounded_edit_distance(query, spelling, 1) <= 1
+
+def key_bigrams(key: str) -> List[str]:
+    padded = f"^{key}$"
+    return [padded[i:i + 2] for i in range(len(padded) - 1)]
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance of ``a`` and ``b``, or ``limit + 1`` once it exceeds ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+class FuzzyNameMatcher:
+    """Bigram index over a vocabulary of name keys.
+
+    Two keys match within the edits both of them tolerate. A key within
+    ``d`` edits of the query key shares at least ``len(query) + 1 - 2d`` of
+    its padded bigrams, so only keys passing that count are checked with the
+    edit distance.
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        self.keys = sorted(set(keys))
+        self.key_set = set(self.keys)
+        self.bigrams: Dict[str, List[int]] = {}
+        for i, key in enumerate(self.keys):
+            for bigram in set(key_bigrams(key)):
+                self.bigrams.setdefault(bigram, []).append(i)
+
+    def matches(self, key: str) -> List[str]:
+        """Return the vocabulary keys within the tolerated edits of ``key``."""
+        limit = max_name_edits(key)
+        if limit == 0:
+            return [key] if key in self.key_set else []
+
+        shared = Counter()
+        for bigram in set(key_bigrams(key)):
+            shared.update(self.bigrams.get(bigram, ()))
+        needed = len(key) + 1 - 2 * limit
+        matches = []
+        for i, count in shared.items():
+            candidate = self.keys[i]
+            if count >= needed:
+                candidate_limit = min(limit, max_name_edits(candidate))
+                if bounded_edit_distance(key, candidate, candidate_limit) <= candidate_limit:
+                    matches.append(candidate)
+        return matches
+
+    def query_keys(self, query: str) -> List[Tuple[str, List[str]]]:
+        """Return the spelling and matching vocabulary keys of every query word.
+
+        Single-letter keys ("Ali", "law") match too much to be useful and are
+        ignored. Empty when no word is left or one of them matches nothing.
+        """
+        matched = []
+        for key, spelling in dict.fromkeys(name_words(query)):
+            if len(key) < 2:
+                continue
+            keys = self.matches(key)
+            if not keys:
+                return []
+            matched.append((spelling if len(key) <= SHORT_NAME_KEY else "", keys))
+        return matched
+
+def expert_name_words(document: Mapping[str, str]) -> Set[Tuple[str, str]]:
+    """Return the (skeleton key, spelling) of the words of an expert's names, from its search document.
+
+    Spellings are only kept for short keys, the only ones they confirm.
+    """
+    words = folded_name_words(document["name"])
+    return {(key, spelling if len(key) <= SHORT_NAME_KEY else "") for key, spelling in words}
+
+class NameIndex:
+    """Fuzzy, transliteration-aware index of expert names.
+
+    An expert matches a query when each query word is within a few edits of
+    one of the expert's name keys, or has the same short key and a close
+    spelling. ``documents`` are the experts' precomputed ``search_documents``.
+    """
+
+    def __init__(self, experts: Sequence[Mapping[str, Any]],
+                 documents: Optional[Sequence[Mapping[str, str]]] = None):
+        self.postings: Dict[str, array] = {}
+        # Short key -> spelling -> positions
+        self.spellings: Dict[str, Dict[str, array]] = {}
+        for position, document in enumerate(map(expert_search_document, experts) if documents is None else documents):
+            for key, spelling in expert_name_words(document):
+                if len(key) <= SHORT_NAME_KEY:
+                    entry = self.spellings.setdefault(key, {}).get(spelling)
+                    if entry is None:
+                        entry = self.spellings[key][spelling] = array("I")
+                    entry.append(position)
+                entry = self.postings.get(key)
+                if entry is None:
+                    entry = self.postings[key] = array("I")
+                if not entry or entry[-1] != position:
+                    entry.append(position)
+        self.matcher = FuzzyNameMatcher(self.postings)
+
+    def search(self, query: str) -> List[int]:
+        """Return the sorted positions of experts whose names fuzzily match ``query``."""
+        result: Set[int] = set()
+        for i, (spelling, keys) in enumerate(self.matcher.query_keys(query)):
+            matches: Set[int] = set()
+            for key in keys:
+                if spelling:
+                    for candidate, positions in self.spellings[key].items():
+                        if spellings_match(spelling, candidate):
+                            matches.update(positions)
+                else:
+                    matches.update(self.postings[key])
+            result = matches if i == 0 else result & matches
+            if not result:
+                return []
+        return sorted(result)
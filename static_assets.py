@@ -0,0 +1,119 @@
+"""Publishing of app images and media through Streamlit static file serving.
+
+Files are copied (or recompressed) once per process into ``static/generated``
+under a content-hashed name and referenced by URL, so browsers fetch and cache
+them once instead of receiving them inline with every rerun.
+"""
+import base64
+import hashlib
+import io
+import os
+import shutil
+import threading
+from typing import Dict, Optional, Tuple
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; images are then published as-is
+    Image = None
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+# Streamlit serves <app dir>/static/* at app/static/* when enableStaticServing is on
+STATIC_DIR = os.path.join(APP_DIR, "static")
+GENERATED_DIR = os.path.join(STATIC_DIR, "generated")
+STATIC_URL_PREFIX = "app/static/generated"
+
+_PUBLISHED: Dict[Tuple, str] = {}
+_PUBLISH_LOCK = threading.Lock()
+
+def _hashed_name(path: str, content: bytes, extension: str) -> str:
+    """Build a cache-busting file name from the source name and content."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    return f"{stem}.{digest}{extension}"
+
+def _to_webp(path: str, max_width: Optional[int], quality: int) -> Optional[bytes]:
+    """Recompress an image to WebP, shrinking it to ``max_width`` if wider."""
+    if Image is None:
+        return None
+    try:
+        with Image.open(path) as image:
+            image = image.convert("RGB")
+            if max_width and image.width > max_width:
+                height = round(image.height * max_width / image.width)
+                image = image.resize((max_width, height), Image.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, "WEBP", quality=quality, method=6)
+            return buffer.getvalue()
+    except Exception:
+        return None
+
+def hashed_asset(path: str, webp: bool = False, max_width: Optional[int] = None,
+                 quality: int = 80) -> Tuple[str, Optional[bytes]]:
+    """Return the content-hashed file name of an asset, with its WebP bytes if it was recompressed.
+
+    The bytes are None when the file is to be copied as it is.
+    """
+    content = _to_webp(path, max_width, quality) if webp else None
+    if content is not None:
+        return _hashed_name(path, content, ".webp"), content
+    with open(path, "rb") as f:
+        return _hashed_name(path, f.read(), os.path.splitext(path)[1].lower()), None
+
+def write_asset(path: str, content: Optional[bytes], target: str) -> None:
+    """Atomically write ``content`` to ``target``, or copy ``path`` there when it is None."""
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    temp = f"{target}.{os.getpid()}.tmp"
+    if content is not None:
+        with open(temp, "wb") as f:
+            f.write(content)
+    else:
+        shutil.copyfile(path, temp)
+    os.replace(temp, target)
+
+def publish_static_asset(path: str, webp: bool = False, max_width: Optional[int] = None,
+                         quality: int = 80) -> Optional[str]:
+    """Publish ``path`` under static/generated and return its URL.
+
+    The result is memoized per source file version, so the copy or WebP
+    conversion happens once per process rather than once per rerun.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    key = (path, stat.st_mtime_ns, stat.st_size, webp, max_width, quality)
+    url = _PUBLISHED.get(key)
+    if url:
+        return url
+
+    with _PUBLISH_LOCK:
+        url = _PUBLISHED.get(key)
+        if url:
+            return url
+
+        name, content = hashed_asset(path, webp, max_width, quality)
+        target = os.path.join(GENERATED_DIR, name)
+        if not os.path.exists(target):
+            write_asset(path, content, target)
+
+        url = f"{STATIC_URL_PREFIX}/{name}"
+        _PUBLISHED[key] = url
+        return url
+
+_DATA_URIS: Dict[Tuple, str] = {}
+
+def data_uri(path: str, mime: str) -> Optional[str]:
+    """Return a memoized base64 data URI, for when static serving is disabled."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    uri = _DATA_URIS.get(key)
+    if uri is None:
+        with open(path, "rb") as f:
+            uri = f"data:{mime};base64,{base64.b64encode(f.read()).decode('utf-8')}"
+        _DATA_URIS[key] = uri
+    return uri
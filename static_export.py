@@ -0,0 +1,443 @@
+"""Export the experts directory as a static site for plain file servers and CDNs.
+
+Anonymous, read-only browsing does not need a live Streamlit session. The
+export writes:
+
+* ``index.html``, the directory page, searching and filtering in the browser
+  over a prebuilt index (``assets/search-index.<hash>.json``) of the same
+  normalized tokens and BM25F scores the app ranks with;
+* ``experts/<id>.html``, one pre-rendered profile per expert with every
+  section of the app's profile panel;
+* ``assets/``, the stylesheet, script, background image and CVs under
+  content-hashed names, so they can be cached forever.
+
+Rebuilds are incremental: ``.export-manifest.json`` records a hash of every
+expert's record and of the assets its page references, and only the pages
+whose hash changed are written again. Pages of removed experts and assets
+no longer referenced are deleted.
+
+Usage:
+    python static_export.py -o site
+    python static_export.py -o site --data experts.json --full
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from asset_manifest import AssetManifest, file_first_existing
+from document_text import document_dirs, manifest_document_texts
+from expert_directory import load_directory
+from search_index import FACET_FIELDS, SearchIndex, search_documents
+from static_assets import hashed_asset, write_asset
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.environ.get("EXPERTS_DATA", os.path.join(APP_DIR, "experts.json"))
+# Bump when the page templates change, to rebuild every page
+EXPORT_FORMAT = 2
+MANIFEST_NAME = ".export-manifest.json"
+BG_CANDIDATES = ["hammurabi_bg.jpg", os.path.join("assets", "images", "hammurabi_bg.jpg"),
+                 os.path.join("assets", "hammurabi_bg.jpg"), "background.jpg"]
+BG_MAX_WIDTH = 560
+SITE_TITLE = "Iraq - Legal Experts & Academics Directory"
+# BM25F scores are shipped as integers in thousandths
+SCORE_SCALE = 1000
+
+SITE_CSS = """
+body { margin: 0; font-family: system-ui, -apple-system, "Segoe UI", Tahoma, sans-serif;
+       background: #f0f8ff; color: #1a2a3a; }
+a { color: #00508c; }
+.hammurabi-side-image { position: fixed; left: 0; top: 0; bottom: 0; width: 280px; opacity: 0.15;
+                        background: %(background)s center / cover no-repeat; z-index: -1; }
+.main-content { max-width: 1100px; margin: 0 auto; padding: 24px 24px 24px 300px; }
+.main-header h1 { margin-bottom: 4px; }
+.main-header p { margin-top: 0; color: #40556a; }
+.content-panel { background: rgba(255, 255, 255, 0.92); border-radius: 12px; padding: 20px 24px;
+                 box-shadow: 0 4px 16px rgba(0, 40, 80, 0.08); margin-bottom: 20px; }
+.filters { display: flex; flex-wrap: wrap; gap: 12px; }
+.filters input { flex: 2 1 280px; }
+.filters select { flex: 1 1 180px; }
+.filters input, .filters select { padding: 8px 10px; font-size: 1rem; border: 1px solid #b8c7d6; border-radius: 8px; }
+.expert-list { list-style: none; padding: 0; }
+.expert-list li { padding: 8px 0; border-bottom: 1px solid #e3ebf3; }
+.expert-list .subtitle { display: block; color: #5a6e82; font-size: 0.9rem; }
+.expertise-chip { display: inline-block; background: #e6f0fa; color: #00508c; border-radius: 14px;
+                  padding: 4px 12px; margin: 3px; font-size: 0.9rem; }
+.facts { display: grid; grid-template-columns: repeat(3, 1fr); gap: 12px; }
+.facts dt { font-weight: 600; }
+.facts dd { margin: 0; }
+.caption { color: #5a6e82; font-size: 0.9rem; }
+.app-footer { text-align: center; color: #5a6e82; padding: 24px; }
+@media (max-width: 800px) { .main-content { padding-left: 24px; } .hammurabi-side-image { display: none; } }
+"""
+
+# Mirrors search_index.normalize_text and tokenize
+SEARCH_JS = r"""
+(function () {
+  "use strict";
+  var PAGE_SIZE = 50;
+  var DIACRITICS = /[ؐ-ًؚ-ٰٟۖ-ۭـ]/g;
+  var FOLDING = {"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ى": "ي", "ئ": "ي", "ؤ": "و", "ة": "ه"};
+  var FOLD_RE = /[أإآٱىئؤة]/g;
+  var ARTICLE_RE = /(^|[^\p{L}\p{N}_])(?:[وفبك]?ال|لل)(?=[\p{L}\p{N}_]{2})/gu;
+  var TOKEN_RE = /[\p{L}\p{N}_]+/gu;
+  var index, shown = PAGE_SIZE;
+  var query = document.getElementById("search");
+  var selects = document.querySelectorAll("select[data-facet]");
+  var list = document.getElementById("experts");
+  var caption = document.getElementById("caption");
+  var more = document.getElementById("more");
+
+  function tokenize(text) {
+    text = text.toLowerCase().replace(DIACRITICS, "").replace(FOLD_RE, function (c) { return FOLDING[c]; })
+      .replace(ARTICLE_RE, "$1");
+    return Array.from(new Set(text.match(TOKEN_RE) || []));
+  }
+
+  function lowerBound(terms, prefix) {
+    var lo = 0, hi = terms.length;
+    while (lo < hi) {
+      var mid = (lo + hi) >> 1;
+      if (terms[mid] < prefix) lo = mid + 1; else hi = mid;
+    }
+    return lo;
+  }
+
+  // Position -> score of the experts matching every token by prefix, or null for no query
+  function match(tokens) {
+    var scores = null;
+    tokens.forEach(function (token) {
+      var best = new Map();
+      for (var t = lowerBound(index.terms, token); t < index.terms.length && index.terms[t].startsWith(token); t++) {
+        var postings = index.postings[t], impacts = index.impacts[t];
+        for (var i = 0; i < postings.length; i++) {
+          if (!(best.get(postings[i]) >= impacts[i])) best.set(postings[i], impacts[i]);
+        }
+      }
+      if (scores === null) { scores = best; return; }
+      var both = new Map();
+      scores.forEach(function (score, position) {
+        if (best.has(position)) both.set(position, score + best.get(position));
+      });
+      scores = both;
+    });
+    return scores;
+  }
+
+  function results() {
+    var tokens = tokenize(query.value);
+    var scores = tokens.length ? match(tokens) : null;
+    var positions = scores ? Array.from(scores.keys()) : index.experts.map(function (_, i) { return i; });
+    selects.forEach(function (select) {
+      if (!select.value) return;
+      var allowed = new Set(index.facets[select.dataset.facet][select.value] || []);
+      positions = positions.filter(function (position) { return allowed.has(position); });
+    });
+    if (scores) positions.sort(function (a, b) { return scores.get(b) - scores.get(a) || a - b; });
+    return positions;
+  }
+
+  function render() {
+    var positions = results();
+    list.replaceChildren();
+    positions.slice(0, shown).forEach(function (position) {
+      var expert = index.experts[position];
+      var item = document.createElement("li");
+      var link = document.createElement("a");
+      link.href = expert[2];
+      link.textContent = expert[0];
+      var subtitle = document.createElement("span");
+      subtitle.className = "subtitle";
+      subtitle.textContent = expert[1];
+      item.append(link, subtitle);
+      list.append(item);
+    });
+    caption.textContent = "Showing " + Math.min(shown, positions.length) + " of " + positions.length +
+      " matching experts (" + index.experts.length + " in the directory)";
+    more.hidden = positions.length <= shown;
+  }
+
+  function update() {
+    shown = PAGE_SIZE;
+    var params = new URLSearchParams();
+    if (query.value) params.set("q", query.value);
+    selects.forEach(function (select) { if (select.value) params.set(select.dataset.facet, select.value); });
+    history.replaceState(null, "", params.toString() ? "?" + params : location.pathname);
+    render();
+  }
+
+  fetch(document.body.dataset.index).then(function (response) { return response.json(); }).then(function (data) {
+    index = data;
+    var params = new URLSearchParams(location.search);
+    query.value = params.get("q") || "";
+    selects.forEach(function (select) {
+      Object.keys(index.facets[select.dataset.facet]).forEach(function (value) {
+        select.append(new Option(value, value));
+      });
+      select.value = params.get(select.dataset.facet) || "";
+      select.addEventListener("change", update);
+    });
+    var timer;
+    query.addEventListener("input", function () { clearTimeout(timer); timer = setTimeout(update, 150); });
+    more.addEventListener("click", function () { shown += PAGE_SIZE; render(); });
+    render();
+  });
+})();
+"""
+
+FOOTER_HTML = (
+    '<footer class="app-footer"><p><strong>🇮🇶 Iraq Legal Experts Directory</strong></p>'
+    "<p>Design &amp; Development: Consultant / Senior Chief Engineer Tareq Majeed Al-Karimi • Version 2.0</p>"
+    "<p>© 2024 All rights reserved • A platform inspired by the Code of Hammurabi - "
+    "the first written law in history</p></footer>"
+)
+
+def content_hash(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+def hashed_text_name(stem: str, text: str, extension: str) -> str:
+    return f"{stem}.{hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]}{extension}"
+
+def page_slug(expert_id: str, taken: Dict[str, str]) -> str:
+    """Return a file-name-safe, unique slug for an expert id."""
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "-", expert_id).strip("-.") or "expert"
+    if slug in taken and taken[slug] != expert_id:
+        slug = f"{slug}-{hashlib.sha256(expert_id.encode('utf-8')).hexdigest()[:8]}"
+    taken[slug] = expert_id
+    return slug
+
+def _write_text(target: str, text: str) -> None:
+    write_asset(target, text.encode("utf-8"), target)
+
+def _page(title: str, css_url: str, body: str, body_attributes: str = "") -> str:
+    return (
+        '<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+        f"<title>{html.escape(title)}</title>\n"
+        f'<link rel="stylesheet" href="{css_url}">\n</head>\n'
+        f"<body{body_attributes}>\n"
+        '<div class="hammurabi-side-image"></div>\n'
+        f'<main class="main-content">\n{body}\n</main>\n{FOOTER_HTML}\n</body>\n</html>\n'
+    )
+
+# =========================
+# PROFILE PAGES
+# =========================
+def profile_sections_html(expert: Mapping[str, Any], document_urls: List[Tuple[str, str]]) -> str:
+    """Render every section of the app's profile panel, in its order."""
+    bio = expert.get("bio_en", expert.get("bio", "No biography available."))
+    sections = [f"<section><h2>Overview</h2><p>{html.escape(str(bio))}</p></section>"]
+
+    contributions = expert.get("contributions") or []
+    items = "".join(f"<li>{html.escape(str(item))}</li>" for item in contributions)
+    sections.append(
+        f"<section><h2>Contributions</h2>{f'<ul>{items}</ul>' if items else '<p>No contributions listed.</p>'}</section>"
+    )
+
+    items = []
+    for pub in expert.get("publications") or []:
+        if isinstance(pub, dict):
+            year, venue = pub.get("year", ""), pub.get("venue", "")
+            detail = f"{year}{' - ' if year and venue else ''}{venue}"
+            items.append(
+                f"<li><strong>{html.escape(str(pub.get('title', 'Untitled')))}</strong>"
+                + (f"<br><em>{html.escape(detail)}</em>" if detail else "") + "</li>"
+            )
+        else:
+            items.append(f"<li>{html.escape(str(pub))}</li>")
+    sections.append(
+        "<section><h2>Publications</h2>"
+        + (f"<ul>{''.join(items)}</ul>" if items else "<p>No publications listed.</p>") + "</section>"
+    )
+
+    if not document_urls:
+        documents = "<p>No documents attached to this profile.</p>"
+    else:
+        documents = "<ul>" + "".join(
+            f'<li><a href="{html.escape(url)}" download>📥 {html.escape(title)}</a></li>' for title, url in document_urls
+        ) + "</ul>"
+    sections.append(f"<section><h2>Documents</h2>{documents}</section>")
+    return "\n".join(sections)
+
+def profile_page(expert: Mapping[str, Any], css_url: str, document_urls: List[Tuple[str, str]]) -> str:
+    """Render the static profile page of an expert."""
+    name = str(expert.get("display_name", "Expert Profile"))
+    facts = "".join(
+        f"<div><dt>{label}</dt><dd>{html.escape(str(value))}</dd></div>" for label, value in (
+            ("Nationality", expert.get("nationality", "Not specified")),
+            ("Location", expert.get("location", "Not specified")),
+            ("Languages", ", ".join(expert.get("languages", ["Not specified"]))),
+        )
+    )
+    chips = "".join(f'<span class="expertise-chip">{html.escape(str(e))}</span>' for e in expert.get("expertise") or [])
+    body = (
+        '<p><a href="../index.html">← All experts</a></p>\n<article class="content-panel">\n'
+        f"<h1>{html.escape(name)}</h1>\n<dl class=\"facts\">{facts}</dl>\n"
+        + (f"<h2>Areas of Expertise</h2><div>{chips}</div>\n" if chips else "")
+        + profile_sections_html(expert, document_urls) + "\n</article>"
+    )
+    return _page(f"{name} · {SITE_TITLE}", css_url, body)
+
+# =========================
+# DIRECTORY PAGE AND SEARCH INDEX
+# =========================
+def search_index_json(experts: List[Mapping[str, Any]], pages: List[str], document_texts: List[str],
+                      documents: Optional[List[Mapping[str, str]]] = None) -> str:
+    """Serialize the client-side search index: list entries, prefix-searchable terms and facets."""
+    index = SearchIndex(experts, document_texts, documents)
+    facets: Dict[str, Dict[str, List[int]]] = {field: {} for field in FACET_FIELDS}
+    entries = []
+    for position, (expert, page) in enumerate(zip(experts, pages)):
+        name = expert.get("display_name", expert.get("full_name", "Unnamed Expert"))
+        entries.append([name, " · ".join((expert.get("expertise") or [])[:3]), page])
+        for field in FACET_FIELDS:
+            for value in dict.fromkeys(expert.get(field) or []):
+                facets[field].setdefault(value, []).append(position)
+    return json.dumps({
+        "experts": entries,
+        "terms": index.terms,
+        "postings": [index.postings[term].tolist() for term in index.terms],
+        "impacts": [[round(impact * SCORE_SCALE) for impact in index.impacts[term]] for term in index.terms],
+        "facets": {field: dict(sorted(values.items())) for field, values in facets.items()},
+    }, ensure_ascii=False, separators=(",", ":"))
+
+def directory_page(css_url: str, js_url: str, index_url: str) -> str:
+    selects = "".join(
+        f'<select data-facet="{field}" aria-label="Filter by {label}"><option value="">All {label}</option></select>'
+        for field, label in (("tags", "tags"), ("expertise", "areas of expertise"))
+    )
+    body = (
+        f'<header class="main-header"><h1>🇮🇶 {html.escape(SITE_TITLE)}</h1>'
+        "<p>A modern platform inspired by Mesopotamia's heritage "
+        "(Code of Hammurabi · Akkadian Era · Cuneiform Legacy)</p></header>\n"
+        '<section class="content-panel"><div class="filters">'
+        '<input id="search" type="search" placeholder="Search by name, bio, expertise, or tags" '
+        f'aria-label="Search">{selects}</div></section>\n'
+        '<section class="content-panel"><p id="caption" class="caption">Loading…</p>'
+        '<ul id="experts" class="expert-list"></ul><button id="more" hidden>Show more</button>'
+        "<noscript>Searching the directory needs JavaScript.</noscript></section>\n"
+        f'<script src="{js_url}" defer></script>'
+    )
+    return _page(SITE_TITLE, css_url, body, f' data-index="{index_url}"')
+
+# =========================
+# EXPORT
+# =========================
+def export_site(data_path: str, output: str, full: bool = False) -> Dict[str, int]:
+    """Export the directory to ``output``, rewriting only changed pages; return page and asset counts."""
+    directory = load_directory(data_path)
+    if directory.error:
+        raise ValueError(f"Error reading JSON file: {directory.error}")
+    base_dir = os.path.dirname(os.path.abspath(data_path))
+    assets_dir = os.path.join(output, "assets")
+
+    manifest_path = os.path.join(output, MANIFEST_NAME)
+    previous: Dict[str, Any] = {}
+    if not full and os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+        if previous.get("format") != EXPORT_FORMAT:
+            previous = {}
+
+    assets: Dict[str, str] = {}
+
+    def publish(path: str, **options) -> str:
+        name, content = hashed_asset(path, **options)
+        target = os.path.join(assets_dir, name)
+        if not os.path.exists(target):
+            write_asset(path, content, target)
+        assets[name] = path
+        return name
+
+    def publish_text(stem: str, text: str, extension: str) -> str:
+        name = hashed_text_name(stem, text, extension)
+        target = os.path.join(assets_dir, name)
+        if not os.path.exists(target):
+            _write_text(target, text)
+        assets[name] = stem
+        return name
+
+    background = file_first_existing([os.path.join(base_dir, path) for path in BG_CANDIDATES])
+    background_css = f'url("{publish(background, webp=True, max_width=BG_MAX_WIDTH)}")' if background else "none"
+    css_name = publish_text("site", SITE_CSS % {"background": background_css}, ".css")
+    js_name = publish_text("search", SEARCH_JS, ".js")
+
+    resolve = AssetManifest({}, document_dirs(base_dir), base_dir).resolve_document
+    directory_documents = directory.derived("search_documents", search_documents)
+    experts: List[Mapping[str, Any]] = []
+    expert_documents: List[Mapping[str, str]] = []
+    pages: List[str] = []
+    entries: Dict[str, Dict[str, str]] = {}
+    slugs: Dict[str, str] = {}
+    written = 0
+    for position, expert in enumerate(directory.experts):
+        expert_id = str(expert.get("id", ""))
+        if expert_id in entries:
+            continue
+        document_urls = []
+        for i, doc in enumerate(expert.get("documents") or []):
+            file = doc.get("file", "") if isinstance(doc, dict) else str(doc)
+            path = resolve(file) if file else None
+            if path:
+                title = doc.get("title", f"Document {i + 1}") if isinstance(doc, dict) else f"Document {i + 1}"
+                document_urls.append((title, f"../assets/{publish(path)}"))
+
+        file = f"experts/{page_slug(expert_id, slugs)}.html"
+        digest = content_hash([EXPORT_FORMAT, expert, css_name, document_urls, file])
+        entries[expert_id] = {"hash": digest, "file": file}
+        experts.append(expert)
+        expert_documents.append(directory_documents[position])
+        pages.append(file)
+        if previous.get("experts", {}).get(expert_id) == entries[expert_id] and os.path.exists(
+            os.path.join(output, file)
+        ):
+            continue
+        _write_text(os.path.join(output, file), profile_page(expert, f"../assets/{css_name}", document_urls))
+        written += 1
+
+    documents = manifest_document_texts(base_dir)
+    index_json = search_index_json(experts, pages, documents.texts(experts), expert_documents)
+    index_name = publish_text("search-index", index_json, ".json")
+    _write_text(
+        os.path.join(output, "index.html"),
+        directory_page(f"assets/{css_name}", f"assets/{js_name}", f"assets/{index_name}"),
+    )
+
+    # Remove pages of experts that are gone and assets nothing references any more
+    removed = 0
+    stale_pages = {entry["file"] for entry in previous.get("experts", {}).values()} - set(pages)
+    stale_assets = {f"assets/{name}" for name in previous.get("assets", [])} - {f"assets/{name}" for name in assets}
+    for relative in stale_pages | stale_assets:
+        try:
+            os.remove(os.path.join(output, relative))
+            removed += 1
+        except FileNotFoundError:
+            pass
+
+    _write_text(manifest_path, json.dumps({
+        "format": EXPORT_FORMAT,
+        "version": directory.version,
+        "exported_at": time.time(),
+        "assets": sorted(assets),
+        "experts": entries,
+    }, ensure_ascii=False, indent=1))
+    return {"experts": len(experts), "written": written, "unchanged": len(experts) - written, "removed": removed}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", default=os.path.join(APP_DIR, "site"), help="site directory to write")
+    parser.add_argument("--data", default=DATA_PATH, help="experts file to export")
+    parser.add_argument("--full", action="store_true", help="rewrite every page, ignoring the previous export")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counts = export_site(args.data, args.output, args.full)
+    print(f"Exported {counts['experts']} experts to {args.output} in {time.perf_counter() - started:.1f}s: "
+          f"{counts['written']} pages written, {counts['unchanged']} unchanged, {counts['removed']} files removed")
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,16 @@
-import base64
-import json
 import os
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 import streamlit as st
 
+from asset_manifest import AssetManifest, load_manifest
+from document_text import DocumentTexts, document_dirs
+from documents import document_loader
+from expert_store import ALL_YEARS, ExpertStore, QueryMatches, open_json_store, open_sqlite_store, watch_json_store
+from profiling import profiled, profiling_enabled, session_profiles, start_stage
+from static_assets import data_uri, publish_static_asset
+
 # =========================
 # CONFIGURATION
 # =========================
@@ -16,7 +22,24 @@ st.set_page_config(
 )
 
 APP_DIR = os.path.dirname(os.path.abspath(__file__))
-DATA_PATH = os.path.join(APP_DIR, "experts.json")
+# Experts file: experts.json, or a pre-normalized file written by ingest_experts.py
+DATA_PATH = os.environ.get("EXPERTS_DATA", os.path.join(APP_DIR, "experts.json"))
+# Storage backend: "json" (experts.json) or "sqlite" (built with expert_store.py)
+STORE_BACKEND = os.environ.get("EXPERTS_STORE", "json")
+DB_PATH = os.environ.get("EXPERTS_DB", os.path.join(APP_DIR, "experts.db"))
+# Hold the JSON directory in the compact column store (set to 0 for plain dicts)
+COMPACT_DIRECTORY = os.environ.get("EXPERTS_COMPACT", "1") != "0"
+# Seconds between background checks of DATA_PATH for edits (0 reloads on access instead)
+WATCH_INTERVAL = float(os.environ.get("EXPERTS_WATCH_INTERVAL", "1"))
+# Number of experts shown per page of the list
+EXPERTS_PAGE_SIZE = 25
+# Number of publications listed in the directory-wide publications panel
+PUBLICATIONS_PAGE_SIZE = 50
+# The search box commits after this pause in typing; keystrokes in between are coalesced
+SEARCH_DEBOUNCE = "300ms"
+# Number of recent search timings kept per session
+SEARCH_TIMING_HISTORY = 50
+PROFILE_SECTIONS = ["Overview", "Contributions", "Publications", "Documents"]
 # Assets configuration
 MUSIC_CANDIDATES = [
     os.path.join(APP_DIR, "assets", "audio", "ambient.mp3"),
@@ -25,12 +48,7 @@ MUSIC_CANDIDATES = [
     os.path.join(APP_DIR, "ambient.mp3"),  # Added direct file check
 ]
 
-DOCS_CANDIDATE_DIRS = [
-    os.path.join(APP_DIR, "assets", "docs"),
-    os.path.join(APP_DIR, "assets", "pdf"),
-    os.path.join(APP_DIR, "docs"),
-    APP_DIR,
-]
+DOCS_CANDIDATE_DIRS = document_dirs(APP_DIR)
 
 BG_CANDIDATES = [
     os.path.join(APP_DIR, "hammurabi_bg.jpg"),
@@ -39,87 +57,33 @@ BG_CANDIDATES = [
     os.path.join(APP_DIR, "background.jpg"),
 ]
 
+ASSET_ROLES = {
+    "background": BG_CANDIDATES,
+    "music": MUSIC_CANDIDATES,
+}
+
+# Background is served from static/ as a resized WebP (needs server.enableStaticServing)
+BG_WEBP = True
+BG_MAX_WIDTH = 560  # 2x the 280px side panel
+
 # =========================
 # HELPER FUNCTIONS
 # =========================
-def file_first_existing(candidates: List[str]) -> Optional[str]:
-    """Return the first existing file from candidates list."""
-    for path in candidates:
-        if path and os.path.exists(path):
-            return path
-    return None
-
-def safe_read_json(path: str) -> Dict[str, Any]:
-    """Safely read JSON file, return empty dict if not exists."""
-    if not os.path.exists(path):
-        return {"experts": []}
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception as e:
-        st.error(f"Error reading JSON file: {e}")
-        return {"experts": []}
-
-def b64_from_file(path: str) -> str:
-    """Convert file to base64 string."""
-    try:
-        with open(path, "rb") as f:
-            return base64.b64encode(f.read()).decode("utf-8")
-    except Exception as e:
-        st.error(f"Error reading file: {e}")
-        return ""
+def get_asset_manifest() -> AssetManifest:
+    """Return the shared manifest of asset roles and document locations."""
+    return load_manifest(ASSET_ROLES, DOCS_CANDIDATE_DIRS, APP_DIR)
 
 def resolve_doc_path(doc_path: str) -> Optional[str]:
     """Resolve document path to absolute path."""
-    if not doc_path:
-        return None
-    
-    # Check if absolute path exists
-    if os.path.isabs(doc_path) and os.path.exists(doc_path):
-        return doc_path
-    
-    # Check relative to app directory
-    rel_path = os.path.join(APP_DIR, doc_path)
-    if os.path.exists(rel_path):
-        return rel_path
-    
-    # Check in candidate directories
-    filename = os.path.basename(doc_path)
-    for directory in DOCS_CANDIDATE_DIRS:
-        candidate = os.path.join(directory, filename)
-        if os.path.exists(candidate):
-            return candidate
-    
-    return None
+    return get_asset_manifest().resolve_document(doc_path)
 
-def normalize_expert(expert: Dict[str, Any]) -> Dict[str, Any]:
-    """Normalize expert data to ensure all fields exist."""
-    result = expert.copy()
-    
-    # Ensure required fields
-    result.setdefault("id", result.get("full_name", "").replace(" ", "_").lower())
-    result.setdefault("full_name", "")
-    result.setdefault("display_name", result.get("full_name"))
-    result.setdefault("title", "")
-    result.setdefault("title_en", result.get("title", ""))
-    result.setdefault("nationality", "Iraqi")
-    result.setdefault("location", "Iraq")
-    result.setdefault("languages", ["Arabic"])
-    result.setdefault("tags", [])
-    result.setdefault("expertise", result.get("areas_of_expertise", []))
-    result.setdefault("bio", result.get("bio_en", ""))
-    result.setdefault("bio_en", result.get("bio", ""))
-    result.setdefault("publications", [])
-    result.setdefault("documents", [])
-    result.setdefault("contributions", [])
-    
-    # Create display name with title if not already included
-    display_name = result.get("display_name", "")
-    title_en = result.get("title_en", "")
-    if title_en and title_en not in display_name:
-        result["display_name"] = f"{title_en} {display_name}".strip()
-    
-    return result
+def background_url(bg_path: str) -> Optional[str]:
+    """Return a browser-cacheable URL for the background image."""
+    if st.get_option("server.enableStaticServing"):
+        url = publish_static_asset(bg_path, webp=BG_WEBP, max_width=BG_MAX_WIDTH)
+        if url:
+            return url
+    return data_uri(bg_path, "image/jpeg")
 
 def inject_custom_css(bg_found: bool) -> None:
     """Inject custom CSS with Hammurabi background and cuneiform watermark."""
@@ -141,28 +105,25 @@ def inject_custom_css(bg_found: bool) -> None:
     """
     
     # Add Hammurabi image if found
-    bg_path = file_first_existing(BG_CANDIDATES)
-    if bg_path and bg_found:
-        try:
-            bg_b64 = b64_from_file(bg_path)
-            css += f"""
-            .hammurabi-side-image {{
-                position: fixed;
-                left: 0;
-                top: 0;
-                bottom: 0;
-                width: 280px;
-                background-image: url("data:image/jpeg;base64,{bg_b64}");
-                background-size: cover;
-                background-position: center;
-                background-repeat: no-repeat;
-                opacity: 0.15;
-                z-index: -2;
-                border-right: 2px solid rgba(0, 60, 120, 0.1);
-            }}
-            """
-        except:
-            css += ".hammurabi-side-image { display: none; }"
+    bg_path = get_asset_manifest().asset("background")
+    bg_url = background_url(bg_path) if bg_path and bg_found else None
+    if bg_url:
+        css += f"""
+        .hammurabi-side-image {{
+            position: fixed;
+            left: 0;
+            top: 0;
+            bottom: 0;
+            width: 280px;
+            background-image: url("{bg_url}");
+            background-size: cover;
+            background-position: center;
+            background-repeat: no-repeat;
+            opacity: 0.15;
+            z-index: -2;
+            border-right: 2px solid rgba(0, 60, 120, 0.1);
+        }}
+        """
     else:
         css += ".hammurabi-side-image { display: none; }"
     
@@ -309,11 +270,26 @@ def inject_custom_css(bg_found: bool) -> None:
     
     st.markdown(css, unsafe_allow_html=True)
 
+def music_url(music_path: str) -> str:
+    """Return a URL the browser can stream and cache the music from.
+    
+    The file is published to static/ and served with HTTP range support.
+    st.audio passes "/app/static/..." URLs through, and the browser resolves
+    them against the app's own base path, so the URL holds up behind a
+    reverse proxy. When static serving is off, the path is handed to
+    st.audio, which serves it from Streamlit's own media endpoint instead.
+    """
+    if st.get_option("server.enableStaticServing"):
+        url = publish_static_asset(music_path)
+        if url:
+            return f"/{url}"
+    return music_path
+
 def setup_music_player():
     """Setup and handle music player functionality."""
     st.session_state.setdefault("music_enabled", False)
     
-    music_path = file_first_existing(MUSIC_CANDIDATES)
+    music_path = get_asset_manifest().asset("music")
     
     # Music toggle button
     col1, col2 = st.columns([1, 4])
@@ -333,41 +309,76 @@ def setup_music_player():
         else:
             st.warning("Music file not found. Add 'ambient.mp3' to assets/audio/")
     
-    # Audio player
+    # Audio player (streamed by URL, only the URL is sent on rerun)
     if music_path and st.session_state.music_enabled:
         try:
-            audio_bytes = open(music_path, "rb").read()
-            st.audio(audio_bytes, format="audio/mp3", autoplay=True)
+            st.audio(music_url(music_path), format="audio/mpeg", autoplay=True)
         except Exception as e:
             st.error(f"Error loading audio: {e}")
 
-def filter_experts(experts: List[Dict[str, Any]], search_query: str, selected_tag: str, selected_expertise: str) -> List[Dict[str, Any]]:
-    """Filter experts based on search criteria."""
-    filtered = experts
-    
-    # Search query filter
-    if search_query:
-        search_lower = search_query.lower()
-        filtered = [
-            e for e in filtered
-            if (search_lower in e.get("full_name", "").lower() or
-                search_lower in e.get("display_name", "").lower() or
-                search_lower in e.get("bio_en", "").lower() or
-                any(search_lower in tag.lower() for tag in e.get("tags", [])) or
-                any(search_lower in exp.lower() for exp in e.get("expertise", [])))
-        ]
-    
-    # Tag filter
-    if selected_tag and selected_tag != "All":
-        filtered = [e for e in filtered if selected_tag in e.get("tags", [])]
-    
-    # Expertise filter
-    if selected_expertise and selected_expertise != "All":
-        filtered = [e for e in filtered if selected_expertise in e.get("expertise", [])]
-    
-    return filtered
+def get_expert_store() -> ExpertStore:
+    """Return the shared store for the configured backend."""
+    if STORE_BACKEND == "sqlite":
+        return open_sqlite_store(DB_PATH)
+    # Search covers the text extracted from attached documents (CVs), read from the document cache
+    documents = DocumentTexts(resolve_doc_path)
+    if WATCH_INTERVAL > 0:
+        # Edits to the file, and new documents, are picked up in the background, not by a session
+        watch_json_store(DATA_PATH, compact=COMPACT_DIRECTORY, interval=WATCH_INTERVAL, documents=documents)
+    return open_json_store(DATA_PATH, compact=COMPACT_DIRECTORY, documents=documents)
+
+def filter_experts(store: ExpertStore, search_query: str, selected_tag: str, selected_expertise: str,
+                   page: int = 0, page_size: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+    """Return one page of experts matching the search criteria, best match first, and the total match count."""
+    offset = page * page_size if page_size else 0
+    return store.search(search_query, {"tags": selected_tag, "expertise": selected_expertise}, offset, page_size)
+
+def match_search_query(store: ExpertStore, search_query: str) -> QueryMatches:
+    """Match the query, narrowing the session's previous matches when the query refines them."""
+    previous = st.session_state.get("query_matches")
+    matches = store.match(search_query, previous)
+    st.session_state.query_matches = matches
+    return matches
+
+def record_search_timing(search_query: str, elapsed_ms: float, refined: bool) -> None:
+    """Keep the timing of a search in the session's recent history."""
+    timings = st.session_state.setdefault("search_timings", [])
+    timings.append({"query": search_query, "ms": round(elapsed_ms, 3), "refined": refined})
+    del timings[:-SEARCH_TIMING_HISTORY]
+
+def change_list_page(delta: int) -> None:
+    """Move the experts list by ``delta`` pages."""
+    st.session_state.list_page = max(0, st.session_state.get("list_page", 0) + delta)
+
+@st.cache_data(max_entries=2048, show_spinner=False)
+def profile_section_markdown(expert_id: str, version: str, section: str, _expert: Dict[str, Any]) -> str:
+    """Render a static profile section to markdown, cached by expert id and directory version."""
+    if section == "Overview":
+        return _expert.get('bio_en', _expert.get('bio', 'No biography available.'))
+    
+    if section == "Contributions":
+        contributions = _expert.get('contributions', [])
+        if not contributions:
+            return "No contributions listed."
+        return "\n\n".join(f"• {item}" for item in contributions)
+    
+    publications = _expert.get('publications', [])
+    if not publications:
+        return "No publications listed."
+    lines = []
+    for pub in publications:
+        if isinstance(pub, dict):
+            title = pub.get('title', 'Untitled')
+            year = pub.get('year', '')
+            venue = pub.get('venue', '')
+            lines.append(f"• **{title}**")
+            if year or venue:
+                lines.append(f"_{year}{' - ' if year and venue else ''}{venue}_")
+        else:
+            lines.append(f"• {pub}")
+    return "\n\n".join(lines)
 
-def display_expert_details(expert: Dict[str, Any]):
+def display_expert_details(expert: Dict[str, Any], version: str = ""):
     """Display detailed information about an expert."""
     st.markdown(f"## {expert.get('display_name', 'Expert Profile')}")
     
@@ -395,87 +406,324 @@ def display_expert_details(expert: Dict[str, Any]):
         chips_html += '</div>'
         st.markdown(chips_html, unsafe_allow_html=True)
     
-    # Tabs for detailed information
-    tab1, tab2, tab3, tab4 = st.tabs(["Overview", "Contributions", "Publications", "Documents"])
+    # Section selector: only the active section is computed and sent
+    section = st.segmented_control(
+        "Profile section",
+        PROFILE_SECTIONS,
+        default=PROFILE_SECTIONS[0],
+        key="profile_section",
+        label_visibility="collapsed"
+    ) or PROFILE_SECTIONS[0]
+    
+    start_stage(f"section:{section}")
+    if section != "Documents":
+        st.markdown(profile_section_markdown(expert.get("id", ""), version, section, expert))
+        return
+    
+    documents = expert.get('documents', [])
+    if not documents:
+        st.info("No documents attached to this profile.")
+    else:
+        for i, doc in enumerate(documents):
+            if isinstance(doc, dict):
+                doc_title = doc.get('title', f'Document {i+1}')
+                doc_file = doc.get('file', '')
+                doc_type = doc.get('type', 'pdf')
+            else:
+                doc_title = f'Document {i+1}'
+                doc_file = str(doc)
+                doc_type = 'pdf'
+            
+            with st.expander(doc_title, expanded=(i == 0)):
+                resolved_path = resolve_doc_path(doc_file)
+                if resolved_path:
+                    # Download button (bytes are loaded only when clicked)
+                    try:
+                        st.download_button(
+                            label=f"📥 Download {os.path.basename(resolved_path)}",
+                            data=document_loader(resolved_path),
+                            file_name=os.path.basename(resolved_path),
+                            mime="application/pdf",
+                            use_container_width=True
+                        )
+                    except Exception as e:
+                        st.error(f"Error accessing file: {e}")
+                else:
+                    st.warning(f"Document not found: {doc_file}")
+
+# =========================
+# INTERACTIVE PANELS
+# =========================
+# Each panel is a fragment: interacting with a widget reruns only that panel
+# (and the panels nested in it), not the CSS, header and music player.
+@st.fragment
+@profiled("directory_browser")
+def directory_browser():
+    """Search filters, with the experts panel nested below them."""
+    start_stage("search")
+    store = get_expert_store()
     
-    with tab1:
-        bio = expert.get('bio_en', expert.get('bio', 'No biography available.'))
-        st.write(bio)
+    # Filters section
+    with st.expander("🔍 Search Filters", expanded=True):
+        col1, col2, col3 = st.columns([2, 1.5, 1.5])
+        
+        with col1:
+            search_query = st.text_input("Search by name, bio, expertise, or tags:", "", live=SEARCH_DEBOUNCE)
+        
+        # Facet values and live counts come from the store's facet index
+        previous = st.session_state.get("query_matches")
+        started = time.perf_counter()
+        matches = match_search_query(store, search_query)
+        tag_counts = store.facet_counts(
+            "tags", search_query, {"expertise": st.session_state.get("expertise_filter", "All")}
+        )
+        expertise_counts = store.facet_counts(
+            "expertise", search_query, {"tags": st.session_state.get("tag_filter", "All")}
+        )
+        search_ms = (time.perf_counter() - started) * 1000
+        
+        if search_query.strip():
+            if previous is None or previous.query != search_query:
+                record_search_timing(search_query, search_ms, matches.refined)
+            with col1:
+                st.caption(f"Matched in {search_ms:.1f} ms" + (" (refined)" if matches.refined else ""))
+        
+        start_stage("facets")
+        with col2:
+            selected_tag = st.selectbox(
+                "Filter by tag:",
+                ["All"] + store.facet_values("tags"),
+                format_func=lambda tag: tag if tag == "All" else f"{tag} ({tag_counts.get(tag, 0)})",
+                key="tag_filter"
+            )
+        
+        with col3:
+            selected_expertise = st.selectbox(
+                "Filter by expertise:",
+                ["All"] + store.facet_values("expertise"),
+                format_func=lambda exp: exp if exp == "All" else f"{exp} ({expertise_counts.get(exp, 0)})",
+                key="expertise_filter"
+            )
     
-    with tab2:
-        contributions = expert.get('contributions', [])
-        if contributions:
-            for item in contributions:
-                st.write(f"• {item}")
-        else:
-            st.write("No contributions listed.")
-    
-    with tab3:
-        publications = expert.get('publications', [])
-        if publications:
-            for pub in publications:
-                if isinstance(pub, dict):
-                    title = pub.get('title', 'Untitled')
-                    year = pub.get('year', '')
-                    venue = pub.get('venue', '')
-                    st.write(f"• **{title}**")
-                    if year or venue:
-                        st.write(f"  _{year}{' - ' if year and venue else ''}{venue}_")
-                else:
-                    st.write(f"• {pub}")
+    start_stage("experts")
+    experts_panel(search_query, selected_tag, selected_expertise)
+
+@st.fragment
+@profiled("experts_panel")
+def experts_panel(search_query: str, selected_tag: str, selected_expertise: str):
+    """Paged experts list, with the profile panel of the selection next to it."""
+    start_stage("filter")
+    store = get_expert_store()
+    
+    # Reset to the first page whenever the filters change
+    list_filters = (search_query, selected_tag, selected_expertise)
+    if st.session_state.get("list_filters") != list_filters:
+        st.session_state.list_filters = list_filters
+        st.session_state.list_page = 0
+    
+    # After the directory was reloaded, follow the selected expert to its new page
+    if st.session_state.get("list_version") != store.version:
+        selected_expert_id = st.session_state.get("selected_expert_id")
+        if st.session_state.get("list_version") is not None:
+            st.toast("The experts directory was updated.")
+        if selected_expert_id:
+            index = store.locate(
+                search_query, {"tags": selected_tag, "expertise": selected_expertise}, selected_expert_id
+            )
+            if index is not None:
+                st.session_state.list_page = index // EXPERTS_PAGE_SIZE
+        st.session_state.list_version = store.version
+    
+    # Filter experts (only the current page is fetched)
+    page_experts, total_matches = filter_experts(
+        store, search_query, selected_tag, selected_expertise,
+        page=st.session_state.list_page, page_size=EXPERTS_PAGE_SIZE
+    )
+    page_count = max(1, -(-total_matches // EXPERTS_PAGE_SIZE))
+    if st.session_state.list_page >= page_count:
+        st.session_state.list_page = page_count - 1
+        page_experts, total_matches = filter_experts(
+            store, search_query, selected_tag, selected_expertise,
+            page=st.session_state.list_page, page_size=EXPERTS_PAGE_SIZE
+        )
+    
+    # Main content columns
+    start_stage("list")
+    col_left, col_right = st.columns([1.2, 2.5], gap="large")
+    
+    with col_left:
+        st.markdown('<div class="content-panel">', unsafe_allow_html=True)
+        st.markdown('<div class="section-title">👨‍⚖️ Experts List</div>', unsafe_allow_html=True)
+        st.caption(f"Showing {total_matches} of {store.count} experts")
+        
+        if not page_experts:
+            st.info("No experts match your search criteria.")
+            selected_expert_id = None
         else:
-            st.write("No publications listed.")
+            # Expert names on this page, keyed by expert id
+            expert_names = {
+                expert["id"]: expert.get("display_name", expert.get("full_name", "Unnamed Expert"))
+                for expert in page_experts
+            }
+            expert_ids = list(expert_names)
+            
+            # Keep the selected expert if it is on this page, otherwise select the first one
+            selected_expert_id = st.session_state.get("selected_expert_id")
+            index = expert_ids.index(selected_expert_id) if selected_expert_id in expert_names else 0
+            
+            # Create radio buttons for selection
+            selected_expert_id = st.radio(
+                "Select an expert:",
+                expert_ids,
+                index=index,
+                format_func=expert_names.get,
+                label_visibility="collapsed"
+            )
+            
+            # Update session state
+            st.session_state.selected_expert_id = selected_expert_id
+            
+            # Pagination controls
+            if page_count > 1:
+                col_prev, col_page, col_next = st.columns([1, 2, 1])
+                with col_prev:
+                    st.button("◀", on_click=change_list_page, args=(-1,),
+                              disabled=st.session_state.list_page == 0, use_container_width=True)
+                with col_page:
+                    st.caption(f"Page {st.session_state.list_page + 1} of {page_count}")
+                with col_next:
+                    st.button("▶", on_click=change_list_page, args=(1,),
+                              disabled=st.session_state.list_page >= page_count - 1, use_container_width=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
     
-    with tab4:
-        documents = expert.get('documents', [])
-        if not documents:
-            st.info("No documents attached to this profile.")
+    with col_right:
+        start_stage("profile")
+        profile_panel(selected_expert_id)
+
+@st.fragment
+@profiled("profile_panel")
+def profile_panel(selected_expert_id: Optional[str]):
+    """Profile of the selected expert."""
+    start_stage("header")
+    store = get_expert_store()
+    
+    st.markdown('<div class="content-panel">', unsafe_allow_html=True)
+    
+    if not selected_expert_id:
+        st.markdown('<div class="section-title">👤 Expert Profile</div>', unsafe_allow_html=True)
+        st.info("👈 Select an expert from the list to view their profile details")
+    else:
+        # Find the selected expert
+        selected_expert = store.get(selected_expert_id)
+        
+        if selected_expert:
+            display_expert_details(selected_expert, store.version)
         else:
-            for i, doc in enumerate(documents):
-                if isinstance(doc, dict):
-                    doc_title = doc.get('title', f'Document {i+1}')
-                    doc_file = doc.get('file', '')
-                    doc_type = doc.get('type', 'pdf')
-                else:
-                    doc_title = f'Document {i+1}'
-                    doc_file = str(doc)
-                    doc_type = 'pdf'
-                
-                with st.expander(doc_title, expanded=(i == 0)):
-                    resolved_path = resolve_doc_path(doc_file)
-                    if resolved_path:
-                        # Download button
-                        try:
-                            with open(resolved_path, "rb") as f:
-                                st.download_button(
-                                    label=f"📥 Download {os.path.basename(resolved_path)}",
-                                    data=f.read(),
-                                    file_name=os.path.basename(resolved_path),
-                                    mime="application/pdf",
-                                    use_container_width=True
-                                )
-                        except Exception as e:
-                            st.error(f"Error accessing file: {e}")
-                    else:
-                        st.warning(f"Document not found: {doc_file}")
+            st.error("Selected expert not found in database.")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+@st.fragment
+@profiled("publications_panel")
+def publications_panel():
+    """Publications across the directory, filtered by year range and venue."""
+    start_stage("summary")
+    store = get_expert_store()
+    summary = store.publication_summary()
+    
+    with st.expander("📚 Publications Across the Directory", expanded=False):
+        if not summary["publications"]:
+            st.info("No publications listed.")
+            return
+        
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Publications", summary["publications"])
+        col2.metric("Experts with publications", summary["experts"])
+        col3.metric("Venues", summary["venues"])
+        
+        # The full year range also lists publications without a year
+        first, last = summary["first_year"], summary["last_year"]
+        years = ALL_YEARS
+        col_years, col_venue = st.columns(2)
+        with col_years:
+            if first is not None and first < last:
+                selected_years = st.slider("Years:", first, last, (first, last), key="publication_years")
+                if selected_years != (first, last):
+                    years = selected_years
+        
+        venue_counts = store.publication_venue_counts(years)
+        with col_venue:
+            selected_venue = st.selectbox(
+                "Venue:",
+                ["All"] + list(summary["by_venue"]),
+                format_func=lambda venue: venue if venue == "All" else f"{venue} ({venue_counts.get(venue, 0)})",
+                key="publication_venue"
+            )
+        venue = "" if selected_venue == "All" else selected_venue
+        
+        start_stage("list")
+        rows, total = store.publications(years, venue, 0, PUBLICATIONS_PAGE_SIZE)
+        shown = f", newest {len(rows)} shown" if total > len(rows) else ""
+        st.caption(f"{total} publications by {store.publication_experts(years, venue)} experts{shown}")
+        if rows:
+            st.dataframe(
+                [{"Year": row["year"] or "", "Title": row["title"], "Venue": row["venue"], "Expert": row["expert"]}
+                 for row in rows],
+                hide_index=True,
+                width="stretch"
+            )
+        
+        start_stage("chart")
+        st.caption("Publications per year")
+        st.bar_chart(
+            {"Year": [str(year) for year in summary["by_year"]], "Publications": list(summary["by_year"].values())},
+            x="Year",
+            y="Publications"
+        )
+
+def profile_debug_panel() -> None:
+    """Collapsible timings of the session's recent reruns (shown when profiling)."""
+    profiles = session_profiles()
+    with st.expander("⏱️ Rerun profile", expanded=False):
+        if not profiles:
+            st.caption("Stage timings appear here from the next rerun on.")
+            return
+        latest = profiles[-1]
+        st.caption(f"Last rerun ({latest['scope']}): {latest['ms']:.1f} ms, {latest['bytes'] / 1024:.1f} KiB sent")
+        st.table([
+            {"stage": stage["stage"], "ms": f"{stage['ms']:.1f}", "KiB sent": f"{stage['bytes'] / 1024:.1f}"}
+            for stage in latest["stages"]
+        ])
+        st.caption("Recent reruns")
+        st.table([
+            {"scope": profile["scope"], "ms": f"{profile['ms']:.1f}", "KiB sent": f"{profile['bytes'] / 1024:.1f}"}
+            for profile in reversed(profiles)
+        ])
 
 # =========================
 # MAIN APP
 # =========================
+@profiled("main")
 def main():
-    # Load data
-    data = safe_read_json(DATA_PATH)
-    experts_raw = data.get("experts", [])
-    experts = [normalize_expert(e) for e in experts_raw]
+    # Load data (shared across sessions, reloaded only when the source changes)
+    start_stage("load")
+    store = get_expert_store()
+    if store.error:
+        st.error(store.error if STORE_BACKEND == "sqlite" else f"Error reading JSON file: {store.error}")
     
     # Check for background image
-    bg_path = file_first_existing(BG_CANDIDATES)
+    start_stage("manifest")
+    manifest = get_asset_manifest()
+    bg_path = manifest.asset("background")
     bg_found = bg_path is not None
     
     # Inject custom CSS
+    start_stage("css")
     inject_custom_css(bg_found)
     
     # Start main content area
+    start_stage("header")
     st.markdown('<div class="main-content">', unsafe_allow_html=True)
     
     # Header section
@@ -484,18 +732,24 @@ def main():
     st.markdown("### A modern platform inspired by Mesopotamia's heritage (Code of Hammurabi · Akkadian Era · Cuneiform Legacy)")
     
     # Status indicators
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
     with col1:
         status_class = "status-good" if bg_found else "status-warning"
         status_text = "✓ Background image found" if bg_found else "⚠ Background image not found"
         st.markdown(f'<div class="status-indicator {status_class}">{status_text}</div>', unsafe_allow_html=True)
     
     with col2:
-        music_path = file_first_existing(MUSIC_CANDIDATES)
+        music_path = manifest.asset("music")
         music_status = "✓ Music file found" if music_path else "⚠ Music file not found"
         status_class = "status-good" if music_path else "status-warning"
         st.markdown(f'<div class="status-indicator {status_class}">{music_status}</div>', unsafe_allow_html=True)
     
+    with col3:
+        status_class = "status-good" if store.count else "status-warning"
+        load_ms = store.load_seconds * 1000
+        data_status = f"✓ {store.count} experts loaded in {load_ms:.1f} ms"
+        st.markdown(f'<div class="status-indicator {status_class}">{data_status}</div>', unsafe_allow_html=True)
+    
     # Expertise chips
     st.markdown('<div style="margin-top: 20px;">', unsafe_allow_html=True)
     chips = ["⚖️ Legal Studies", "📚 Academic Research", "🏛️ Hammurabi Legacy", 
@@ -509,103 +763,23 @@ def main():
     st.markdown('</div>', unsafe_allow_html=True)  # Close main-header
     
     # Music player section
+    start_stage("music")
     with st.container():
         st.markdown('<div class="music-player">', unsafe_allow_html=True)
         st.markdown("### 🎵 Ambient Music")
         setup_music_player()
         st.markdown('</div>', unsafe_allow_html=True)
     
-    # Filters section
-    with st.expander("🔍 Search Filters", expanded=True):
-        col1, col2, col3 = st.columns([2, 1.5, 1.5])
-        
-        with col1:
-            search_query = st.text_input("Search by name, bio, expertise, or tags:", "")
-        
-        # Get unique tags and expertise for filters
-        all_tags = sorted(set(tag for expert in experts for tag in expert.get("tags", [])))
-        all_expertise = sorted(set(exp for expert in experts for exp in expert.get("expertise", [])))
-        
-        with col2:
-            selected_tag = st.selectbox("Filter by tag:", ["All"] + all_tags)
-        
-        with col3:
-            selected_expertise = st.selectbox("Filter by expertise:", ["All"] + all_expertise)
-    
-    # Filter experts
-    filtered_experts = filter_experts(experts, search_query, selected_tag, selected_expertise)
+    # Filters, experts list and profile
+    start_stage("directory")
+    directory_browser()
     
-    # Main content columns
-    col_left, col_right = st.columns([1.2, 2.5], gap="large")
-    
-    with col_left:
-        st.markdown('<div class="content-panel">', unsafe_allow_html=True)
-        st.markdown('<div class="section-title">👨‍⚖️ Experts List</div>', unsafe_allow_html=True)
-        st.caption(f"Showing {len(filtered_experts)} of {len(experts)} experts")
-        
-        if not filtered_experts:
-            st.info("No experts match your search criteria.")
-            selected_expert_id = None
-        else:
-            # Create list of expert names for selection
-            expert_options = [
-                (expert.get("id", expert.get("full_name", "")), 
-                 expert.get("display_name", expert.get("full_name", "Unnamed Expert")))
-                for expert in filtered_experts
-            ]
-            
-            # Store in session state
-            if "selected_expert_index" not in st.session_state:
-                st.session_state.selected_expert_index = 0
-            
-            # Adjust index if out of bounds
-            if st.session_state.selected_expert_index >= len(expert_options):
-                st.session_state.selected_expert_index = 0
-            
-            # Create radio buttons for selection
-            expert_names = [name for _, name in expert_options]
-            selected_name = st.radio(
-                "Select an expert:",
-                expert_names,
-                index=st.session_state.selected_expert_index,
-                label_visibility="collapsed"
-            )
-            
-            # Get selected expert ID
-            selected_expert_id = None
-            for exp_id, exp_name in expert_options:
-                if exp_name == selected_name:
-                    selected_expert_id = exp_id
-                    break
-            
-            # Update session state
-            st.session_state.selected_expert_index = expert_names.index(selected_name)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col_right:
-        st.markdown('<div class="content-panel">', unsafe_allow_html=True)
-        
-        if not selected_expert_id:
-            st.markdown('<div class="section-title">👤 Expert Profile</div>', unsafe_allow_html=True)
-            st.info("👈 Select an expert from the list to view their profile details")
-        else:
-            # Find the selected expert
-            selected_expert = next(
-                (expert for expert in experts 
-                 if expert.get("id") == selected_expert_id or 
-                    expert.get("full_name") == selected_expert_id),
-                None
-            )
-            
-            if selected_expert:
-                display_expert_details(selected_expert)
-            else:
-                st.error("Selected expert not found in database.")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+    # Directory-wide publications
+    start_stage("publications")
+    publications_panel()
     
     # Footer
+    start_stage("footer")
     st.markdown('<div class="app-footer">', unsafe_allow_html=True)
     st.markdown("### 🇮🇶 Iraq Legal Experts Directory")
     st.markdown("**Design & Development:** Consultant / Senior Chief Engineer Tareq Majeed Al-Karimi • Version 2.0")
@@ -614,6 +788,10 @@ def main():
     
     # Close main content div
     st.markdown('</div>', unsafe_allow_html=True)
+    
+    if profiling_enabled():
+        start_stage("debug_panel")
+        profile_debug_panel()
 
 if __name__ == "__main__":
     main()
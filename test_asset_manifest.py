@@ -0,0 +1,46 @@
+"""Checks that the asset manifest resolves files like direct lookups do."""
+import os
+
+import pytest
+
+from asset_manifest import AssetManifest, file_first_existing, invalidate_manifest, load_manifest
+
+@pytest.fixture
+def app_dir(tmp_path):
+    for name in ("docs/cv.pdf", "docs/shared.pdf", "assets/docs/shared.pdf", "bg.webp", "bg.jpg", "top.pdf"):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(name.encode())
+    return tmp_path
+
+def doc_dirs(base_dir):
+    return [os.path.join(base_dir, "assets", "docs"), os.path.join(base_dir, "docs"), str(base_dir)]
+
+def test_assets_take_the_first_existing_candidate(app_dir):
+    roles = {
+        "background": [str(app_dir / "bg.avif"), str(app_dir / "bg.webp"), str(app_dir / "bg.jpg")],
+        "music": [str(app_dir / "music.mp3")],
+    }
+    manifest = AssetManifest(roles, doc_dirs(app_dir), str(app_dir))
+    assert manifest.asset("background") == file_first_existing(roles["background"]) == str(app_dir / "bg.webp")
+    assert manifest.asset("music") is None
+    assert manifest.asset("unknown") is None
+
+def test_documents_resolve_by_path_then_by_name_in_directory_order(app_dir):
+    manifest = AssetManifest({}, doc_dirs(app_dir), str(app_dir))
+    assert manifest.resolve_document(str(app_dir / "top.pdf")) == str(app_dir / "top.pdf")
+    assert manifest.resolve_document("docs/cv.pdf") == str(app_dir / "docs" / "cv.pdf")
+    assert manifest.resolve_document("cv.pdf") == os.path.join(app_dir, "docs", "cv.pdf")
+    assert manifest.resolve_document("uploads/shared.pdf") == os.path.join(app_dir, "assets", "docs", "shared.pdf")
+    assert manifest.resolve_document("missing.pdf") is None
+    assert manifest.resolve_document("") is None
+
+def test_shared_manifest_is_rebuilt_after_invalidation(app_dir):
+    invalidate_manifest()
+    manifest = load_manifest({}, doc_dirs(app_dir), str(app_dir))
+    assert load_manifest({}, doc_dirs(app_dir), str(app_dir)) is manifest
+
+    (app_dir / "docs" / "new.pdf").write_bytes(b"new")
+    assert manifest.resolve_document("new.pdf") is None
+    invalidate_manifest()
+    assert load_manifest({}, doc_dirs(app_dir), str(app_dir)).resolve_document("new.pdf") is not None
@@ -0,0 +1,61 @@
+"""Checks that the compact column store gives back every record exactly."""
+import json
+import os
+
+import pytest
+
+from benchmarks.synthetic import synthetic_experts
+from compact_directory import CompactExperts
+from expert_directory import normalize_expert
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+EDGE_CASES = [
+    {},
+    {"id": "only-id"},
+    {"id": 7, "full_name": None, "tags": ["ok", 3], "expertise": "not a list", "languages": []},
+    {"id": "t", "full_name": "Ali", "title_en": "Dr.", "display_name": "Dr. Ali"},
+    {"id": "u", "full_name": "Dr. Ali", "title_en": "Dr.", "display_name": "Dr. Ali"},
+    {"id": "v", "full_name": "Ali", "title_en": "Dr.", "display_name": "Professor Ali"},
+    {"id": "w", "full_name": "Ali", "display_name": "Ali", "title_en": None},
+    {"id": "x", "bio_en": "Same", "bio": "Same"},
+    {"id": "y", "bio_en": "English", "bio": "عربي"},
+    {"id": "z", "bio": "Only Arabic بالعربية", "location": "", "nationality": "Iraqi"},
+    {"id": "n", "publications": [{"title": "T", "year": 2020, "venue": None}], "contact": {"email": "a@b"},
+     "documents": ["cv.pdf"], "extra_field": [1, {"nested": True}]},
+]
+
+def assert_round_trip(experts):
+    compact = CompactExperts(experts)
+    assert len(compact) == len(experts)
+    for expert, view in zip(experts, compact):
+        assert dict(view) == expert
+        assert sorted(view) == sorted(expert)
+        assert len(view) == len(expert)
+        # Values come back with the same types, not just equal ones
+        assert json.dumps(dict(view), sort_keys=True) == json.dumps(expert, sort_keys=True)
+
+def test_bundled_directory_round_trips():
+    with open(os.path.join(APP_DIR, "experts.json"), "r", encoding="utf-8") as f:
+        experts = [normalize_expert(expert) for expert in json.load(f)["experts"]]
+    assert_round_trip(experts)
+
+def test_synthetic_directory_round_trips():
+    assert_round_trip([normalize_expert(expert) for expert in synthetic_experts(500, seed=11)])
+
+@pytest.mark.parametrize("expert", EDGE_CASES)
+def test_unusual_records_round_trip(expert):
+    assert_round_trip([expert])
+
+def test_sequence_and_mapping_access():
+    experts = [normalize_expert(expert) for expert in synthetic_experts(10, seed=2)]
+    compact = CompactExperts(experts)
+    assert dict(compact[-1]) == experts[-1]
+    assert [dict(view) for view in compact[2:8:3]] == experts[2:8:3]
+    with pytest.raises(IndexError):
+        compact[len(experts)]
+    view = compact[0]
+    assert view.get("missing", "default") == "default"
+    assert view.copy() == experts[0]
+    with pytest.raises(KeyError):
+        view["missing"]
@@ -0,0 +1,78 @@
+"""Checks of the background reload of the experts file by DirectoryWatcher."""
+import json
+import os
+
+import pytest
+
+from expert_directory import clear_directory_cache, load_directory, stop_watching
+from expert_store import DOCUMENT_TEXT_INDEXES, open_json_store, watch_json_store
+
+EXPERTS = [
+    {"id": "ahmed", "full_name": "Ahmed Kareem", "tags": ["Academic"]},
+    {"id": "bushra", "full_name": "Bushra Hussein", "tags": ["Judge"]},
+    {"id": "hassan", "full_name": "Hassan Ali", "tags": ["Academic"], "bio_en": "Civil law."},
+]
+
+def write_experts(path, experts, mtime_ns):
+    path.write_text(json.dumps({"experts": experts}), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+@pytest.fixture
+def watched(tmp_path):
+    path = tmp_path / "experts.json"
+    write_experts(path, EXPERTS, 1_000_000_000)
+    # The thread itself never checks within the test; check() is called directly
+    watcher = watch_json_store(str(path), interval=3600)
+    yield path, watcher
+    stop_watching()
+    clear_directory_cache()
+
+def test_rewritten_file_is_swapped_in(watched):
+    path, watcher = watched
+    old = load_directory(str(path))
+    assert not watcher.check()
+
+    write_experts(path, EXPERTS + [{"id": "zainab", "full_name": "Zainab Ali"}], 2_000_000_000)
+    # Sessions keep the old snapshot until the watcher swaps the new one in
+    assert load_directory(str(path)) is old
+    assert watcher.check()
+    new = load_directory(str(path))
+    assert new.version != old.version and new.count == 4
+    assert watcher.reloads == 1
+    assert [e["id"] for e in open_json_store(str(path)).search("ali", {})[0]] == ["hassan", "zainab"]
+
+def test_unparseable_file_keeps_the_old_snapshot(watched):
+    path, watcher = watched
+    old = load_directory(str(path))
+    path.write_text('{"experts": [{"id": "ahm', encoding="utf-8")
+    os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+    assert not watcher.check()
+    assert not watcher.check()
+    assert load_directory(str(path)) is old and open_json_store(str(path)).count == 3
+
+    write_experts(path, EXPERTS[:1], 3_000_000_000)
+    assert watcher.check()
+    assert load_directory(str(path)).count == 1
+
+def test_selection_follows_the_expert_to_its_new_position(watched):
+    path, watcher = watched
+    assert open_json_store(str(path)).locate("", {"tags": "Academic"}, "hassan") == 1
+
+    newcomers = [{"id": f"new{i}", "full_name": f"New {i}", "tags": ["Academic"]} for i in range(3)]
+    write_experts(path, newcomers + EXPERTS, 2_000_000_000)
+    assert watcher.check()
+    store = open_json_store(str(path))
+    assert store.locate("", {"tags": "Academic"}, "hassan") == 4
+    assert store.locate("civil", {}, "hassan") == 0
+    assert store.locate("", {"tags": "Judge"}, "hassan") is None
+
+def test_refresh_rebuilds_only_the_given_indexes(watched):
+    path, watcher = watched
+    old_store = open_json_store(str(path))
+    facets, search = old_store.facets, old_store.search_index
+    assert watcher.refresh(DOCUMENT_TEXT_INDEXES)
+    store = open_json_store(str(path))
+    # Same directory version, so sessions are not told it was updated
+    assert store is not old_store and store.version == old_store.version
+    assert store.revision == old_store.revision + 1
+    assert store.facets is facets and store.search_index is not search
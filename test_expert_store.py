@@ -0,0 +1,99 @@
+"""Checks that the JSON and SQLite stores answer every query alike."""
+import sqlite3
+
+import pytest
+
+import search_index
+from benchmarks.synthetic import write_experts_file
+from expert_directory import load_directory
+from expert_store import JsonExpertStore, SqliteExpertStore, import_json_to_sqlite, open_sqlite_store
+from search_index import SearchIndex
+
+QUERIES = ["", "law", "civ", "international law", "hassan", "kareem", "الغنامي", "zzz"]
+FILTERS = [{}, {"tags": "Academic"}, {"expertise": "Civil Law", "tags": "All"}]
+
+@pytest.fixture(scope="module")
+def stores(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("stores")
+    json_path, db_path = str(directory / "experts.json"), str(directory / "experts.db")
+    write_experts_file(json_path, 600, seed=5)
+    import_json_to_sqlite(json_path, db_path)
+    return JsonExpertStore(load_directory(json_path, compact=True)), SqliteExpertStore(db_path)
+
+def ids(experts):
+    return [expert["id"] for expert in experts]
+
+@pytest.mark.parametrize("query", QUERIES)
+@pytest.mark.parametrize("filters", FILTERS)
+def test_search_and_facets_agree(stores, query, filters):
+    json_store, sqlite_store = stores
+    expected, total = json_store.search(query, filters)
+    experts, sqlite_total = sqlite_store.search(query, filters)
+    assert sqlite_total == total
+    if query:
+        # SQLite ranks with FTS5's bm25(), which scores differently from the in-memory BM25F
+        assert sorted(ids(experts)) == sorted(ids(expected))
+    else:
+        assert ids(experts) == ids(expected)
+    assert ids(sqlite_store.search(query, filters, 5, 10)[0]) == ids(experts[5:15])
+    for field in ("tags", "expertise"):
+        assert sqlite_store.facet_counts(field, query, filters) == json_store.facet_counts(field, query, filters)
+    for position, expert in list(enumerate(experts))[:3] + list(enumerate(experts))[-2:]:
+        assert sqlite_store.locate(query, filters, expert["id"]) == position
+        assert json_store.locate(query, filters, expected[position]["id"]) == position
+
+def test_records_and_facet_values_agree(stores):
+    json_store, sqlite_store = stores
+    assert sqlite_store.count == json_store.count
+    for field in ("tags", "expertise"):
+        assert sqlite_store.facet_values(field) == json_store.facet_values(field)
+    for expert in json_store.search("", {}, 0, 20)[0]:
+        assert sqlite_store.get(expert["id"]) == dict(expert)
+    assert sqlite_store.get("missing") is None
+    assert sqlite_store.locate("law", {}, "missing") is None
+
+@pytest.mark.parametrize("years", [(None, None), (2010, 2020), (None, 2005), (2018, None), (1800, 1801)])
+@pytest.mark.parametrize("venue", ["", "journal", "law"])
+def test_publications_agree(stores, years, venue):
+    json_store, sqlite_store = stores
+    assert sqlite_store.publications(years, venue) == json_store.publications(years, venue)
+    assert sqlite_store.publications(years, venue, 7, 13) == json_store.publications(years, venue, 7, 13)
+    assert sqlite_store.publication_experts(years, venue) == json_store.publication_experts(years, venue)
+    assert sqlite_store.publication_venue_counts(years) == json_store.publication_venue_counts(years)
+
+def test_publication_summaries_agree(stores):
+    json_store, sqlite_store = stores
+    assert sqlite_store.publication_summary() == json_store.publication_summary()
+
+# Forward-index checks of the candidates, or reads of the postings
+@pytest.mark.parametrize("forward_check_cost, forward", [(0, True), (1 << 30, False)])
+@pytest.mark.parametrize("previous, query", [("ahm", "ahmed"), ("ahmed", "ahmed ali"), ("law", "law civ")])
+def test_refined_matches_equal_a_fresh_search(stores, monkeypatch, forward_check_cost, forward, previous, query):
+    monkeypatch.setattr(search_index, "FORWARD_CHECK_COST", forward_check_cost)
+    checks = []
+    has_term = SearchIndex.has_term
+    monkeypatch.setattr(SearchIndex, "has_term", lambda index, *args: checks.append(args) or has_term(index, *args))
+
+    json_store, _ = stores
+    store, fresh = JsonExpertStore(json_store.directory), JsonExpertStore(json_store.directory)
+    matches = store.match(query, store.match(previous))
+    assert matches.refined
+    assert bool(checks) is forward
+    assert matches.mask == fresh.match(query).mask
+    assert store.search(query, {}) == fresh.search(query, {})
+
+def test_unavailable_databases_give_an_empty_store_with_an_error(tmp_path, stores):
+    missing = open_sqlite_store(str(tmp_path / "missing.db"))
+    assert missing.count == 0 and "not found" in missing.error
+
+    corrupt_path = tmp_path / "corrupt.db"
+    corrupt_path.write_bytes(b"not a database")
+    assert "Error reading SQLite database" in open_sqlite_store(str(corrupt_path)).error
+
+    outdated_path = str(tmp_path / "outdated.db")
+    with sqlite3.connect(outdated_path) as conn:
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        conn.execute("INSERT INTO meta VALUES ('version', 'old')")
+    outdated = open_sqlite_store(outdated_path)
+    assert outdated.count == 0 and "re-import" in outdated.error
+    assert outdated.search("", {}) == ([], 0)
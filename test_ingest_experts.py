@@ -0,0 +1,137 @@
+"""Checks of the streaming readers and the validation of the bulk import."""
+import json
+
+import pytest
+
+import ingest_experts
+from ingest_experts import ingest, iter_source_records, validate_expert
+
+EXPERTS = [
+    {"id": "a", "full_name": "Ahmed Kareem", "tags": ["Academic"], "publications": [{"title": "x", "year": 2019}]},
+    {"id": "b", "full_name": "بشرى حسين", "bio": "قانون \"دولي\" {}[],:", "rank": 12345678901234567890},
+    {"id": "c", "full_name": "C", "scores": [1.5e-3, -0.25, 7], "contact": {"email": "c@example.org"}},
+]
+
+@pytest.fixture(params=[1, 3, 7, 64, 1 << 16])
+def chunk_size(request, monkeypatch):
+    # Small chunks split strings, numbers and escapes across reads
+    monkeypatch.setattr(ingest_experts, "CHUNK_SIZE", request.param)
+    return request.param
+
+def records(path):
+    return [record for _, record in iter_source_records(str(path))]
+
+# =========================
+# STREAMING JSON
+# =========================
+@pytest.mark.parametrize("document", [
+    {"experts": EXPERTS},
+    {"version": 2, "meta": {"experts": ["not", "these"]}, "experts": EXPERTS, "after": [1, {"b": None}]},
+    EXPERTS,
+])
+def test_json_stream_yields_every_record(tmp_path, chunk_size, document):
+    path = tmp_path / "experts.json"
+    path.write_text(json.dumps(document, ensure_ascii=False, indent=1), encoding="utf-8")
+    assert records(path) == EXPERTS
+
+def test_json_stream_handles_empty_and_compact_input(tmp_path, chunk_size):
+    path = tmp_path / "experts.json"
+    for text, expected in (('{"experts":[]}', []), ("[]", []), (' [ 1 , 22 ,333 ] ', [1, 22, 333])):
+        path.write_text(text, encoding="utf-8")
+        assert records(path) == expected
+
+def test_json_stream_numbers_split_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest_experts, "CHUNK_SIZE", 4)
+    path = tmp_path / "numbers.json"
+    path.write_text("[12345678, 9.875, -1e10]", encoding="utf-8")
+    assert records(path) == [12345678, 9.875, -1e10]
+
+def test_json_records_are_located_by_number(tmp_path):
+    path = tmp_path / "experts.json"
+    path.write_text(json.dumps({"experts": EXPERTS}), encoding="utf-8")
+    assert [location for location, _ in iter_source_records(str(path))] == ["record 1", "record 2", "record 3"]
+
+def test_malformed_json_record_stops_the_stream_with_its_location(tmp_path, chunk_size):
+    path = tmp_path / "experts.json"
+    items = [json.dumps(expert) for expert in EXPERTS]
+    path.write_text("[" + ", ".join(items[:1] + ['{"id": "x",, "full_name": "X"}'] + items * 1000) + "]",
+                    encoding="utf-8")
+    located = iter_source_records(str(path))
+    assert next(located) == ("record 1", EXPERTS[0])
+    with pytest.raises(ValueError, match=r"experts\.json, record 2: invalid JSON"):
+        next(located)
+
+    # The records after the malformed one are not read into the buffer
+    with open(path, "r", encoding="utf-8") as f:
+        items = ingest_experts._JsonStream(f).array_items()
+        assert next(items) == EXPERTS[0]
+        with pytest.raises(json.JSONDecodeError):
+            next(items)
+        assert f.tell() <= 2 * chunk_size + 200
+
+# =========================
+# JSON LINES AND CSV
+# =========================
+def test_jsonl_reports_malformed_lines_with_their_line_number(tmp_path):
+    path = tmp_path / "experts.jsonl"
+    path.write_text('{"id": "a", "full_name": "A"}\n\n{bad\n{"id": "b", "full_name": "B"}\n', encoding="utf-8")
+    located = list(iter_source_records(str(path)))
+    assert [location for location, _ in located] == ["line 1", "line 3", "line 4"]
+    assert validate_expert(located[0][1]) == []
+    assert validate_expert(located[1][1])[0].startswith("invalid JSON")
+
+def test_csv_splits_lists_and_reports_bad_json_cells(tmp_path):
+    path = tmp_path / "experts.csv"
+    path.write_text(
+        'id,full_name,tags,publications\n'
+        'a,A,Academic; Judge ;,"[{""title"": ""x"", ""year"": ""2019""}]"\n'
+        'b,B,,[oops\n',
+        encoding="utf-8",
+    )
+    (first_location, first), (second_location, second) = iter_source_records(str(path))
+    assert first_location == "line 2" and second_location == "line 3"
+    assert first == {"id": "a", "full_name": "A", "tags": ["Academic", "Judge"],
+                     "publications": [{"title": "x", "year": "2019"}]}
+    assert validate_expert(first) == []
+    assert validate_expert(second)[0].startswith("publications is not valid JSON")
+
+# =========================
+# VALIDATION AND PIPELINE
+# =========================
+@pytest.mark.parametrize("record, valid", [
+    ({"id": "a"}, True),
+    ({"title": "Dr."}, False),
+    ([], False),
+    ({"id": "a", "tags": "Academic"}, False),
+    ({"id": "a", "publications": [{"year": 2019}, {"year": "2019"}, {"year": ""}, "Title only"]}, True),
+    ({"id": "a", "publications": [{"year": "2019b"}]}, False),
+    ({"id": "a", "publications": [{"year": 2019.5}]}, False),
+    ({"id": "a", "documents": [{"title": "CV"}]}, False),
+])
+def test_validate_expert(record, valid):
+    assert (validate_expert(record) == []) is valid
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_ingest_skips_invalid_records_and_duplicates(tmp_path, workers, capsys):
+    first = tmp_path / "first.jsonl"
+    first.write_text('{"id": "a", "full_name": "A"}\nnot json\n{"id": "b", "full_name": "B"}\n', encoding="utf-8")
+    second = tmp_path / "second.json"
+    second.write_text(json.dumps([{"id": "a", "full_name": "Other A"}, {"id": "c", "full_name": "C"}]))
+    output = tmp_path / "out.json"
+
+    stats = ingest([str(first), str(second)], str(output), workers)
+    assert stats == {"written": 3, "invalid": 1, "duplicates": 1}
+    assert f"{first}, line 2: invalid JSON" in capsys.readouterr().err
+    written = json.loads(output.read_text(encoding="utf-8"))
+    assert written["normalized"] is True
+    assert [(e["id"], e["full_name"]) for e in written["experts"]] == [("a", "A"), ("b", "B"), ("c", "C")]
+
+def test_strict_ingest_stops_and_keeps_the_output(tmp_path):
+    source = tmp_path / "experts.jsonl"
+    source.write_text('{"id": "a"}\n{"tags": 1}\n', encoding="utf-8")
+    output = tmp_path / "out.json"
+    output.write_text("previous", encoding="utf-8")
+    with pytest.raises(ValueError, match="line 2"):
+        ingest([str(source)], str(output), 1, strict=True)
+    assert output.read_text(encoding="utf-8") == "previous"
+    assert sorted(tmp_path.iterdir()) == sorted([source, output])
@@ -0,0 +1,144 @@
+"""Checks of the in-memory search structures against brute-force results."""
+import random
+
+import pytest
+
+from benchmarks.synthetic import synthetic_experts
+from compact_directory import CompactExperts
+from expert_directory import normalize_expert
+from search_index import (
+    FACET_FIELDS, FacetIndex, NameIndex, SearchIndex, expert_search_document, mask_to_positions, normalize_text,
+    positions_to_mask, query_refines, search_documents, tokenize,
+)
+
+@pytest.fixture(scope="module")
+def experts():
+    return [normalize_expert(expert) for expert in synthetic_experts(400, seed=3)]
+
+@pytest.fixture(scope="module")
+def search_index(experts):
+    return SearchIndex(experts)
+
+# =========================
+# FACETS
+# =========================
+def test_facet_masks_match_expert_values(experts):
+    facets = FacetIndex(experts)
+    for field in FACET_FIELDS:
+        for value in facets.values[field]:
+            expected = [i for i, expert in enumerate(experts) if value in (expert.get(field) or [])]
+            assert mask_to_positions(facets.mask(field, value)) == expected
+
+def test_facet_counts_match_brute_force(experts):
+    facets = FacetIndex(experts)
+    rng = random.Random(0)
+    for _ in range(20):
+        positions = sorted(rng.sample(range(len(experts)), rng.randrange(len(experts) + 1)))
+        mask = positions_to_mask(positions, len(experts))
+        for field in FACET_FIELDS:
+            expected = {
+                value: sum(value in (experts[i].get(field) or []) for i in positions)
+                for value in facets.values[field]
+            }
+            assert facets.counts(field, mask) == expected
+
+# =========================
+# QUERY REFINEMENT
+# =========================
+@pytest.mark.parametrize("previous, query", [
+    ("l", "la"),
+    ("la", "law"),
+    ("law", "law civil"),
+    ("civ", "civil law"),
+    ("hum", "human rights"),
+    ("in", "international"),
+])
+def test_refined_mask_equals_fresh_mask(search_index, experts, previous, query):
+    assert query_refines(query, previous)
+    previous_mask = positions_to_mask(search_index.search(previous), len(experts))
+    fresh = positions_to_mask(search_index.search(query), len(experts))
+    assert search_index.refine(query, previous, previous_mask) == fresh
+
+def test_query_refines_only_narrowing_queries():
+    assert query_refines("civil law", "civ")
+    assert not query_refines("civ", "civil")
+    assert not query_refines("law", "civil law")
+
+# =========================
+# SEARCH DOCUMENTS
+# =========================
+def test_search_document_matches_fresh_normalization():
+    expert = {
+        "full_name": "Khudhair Al-Ghannami", "display_name": "Prof. Dr. Khudhair Al-Ghannami",
+        "expertise": ["Civil Law", "القانون المدني"], "tags": ["Academic", "Academic"],
+        "bio_en": "Professor of LAW at the University of Baghdad.",
+    }
+    assert expert_search_document(expert, "CV Text") == {
+        "name": normalize_text("Prof. Dr. Khudhair Al-Ghannami"),
+        "expertise": "civil law " + normalize_text("القانون المدني"),
+        "tags": "academic academic",
+        "bio": "professor of law at the university of baghdad.",
+        "documents": "cv text",
+    }
+    # A display name without the full name keeps both
+    assert expert_search_document({"full_name": "Ali", "display_name": "Dr. Hassan"})["name"] == "dr. hassan ali"
+
+def test_index_matches_brute_force_prefix_search(experts, search_index):
+    documents = [
+        {token for text in expert_search_document(expert).values() for token in tokenize(text)}
+        for expert in experts
+    ]
+    for query in ("law", "civ", "intern law", "hum rig", "academic", "zzz", "قانون"):
+        expected = [
+            i for i, tokens in enumerate(documents)
+            if all(any(token.startswith(word) for token in tokens) for word in tokenize(query))
+        ]
+        assert search_index.search(query) == expected
+
+def test_indexes_built_from_precomputed_documents_match(experts, search_index):
+    documents = search_documents(experts)
+    texts = ["curriculum vitae" if i % 7 == 0 else "" for i in range(len(experts))]
+    shared = SearchIndex(experts, texts, documents)
+    fresh = SearchIndex(experts, texts)
+    assert shared.terms == fresh.terms and shared.impacts == fresh.impacts
+    assert SearchIndex(experts, documents=documents).impacts == search_index.impacts
+    names, fresh_names = NameIndex(experts, documents), NameIndex(experts)
+    assert names.postings == fresh_names.postings and names.spellings == fresh_names.spellings
+
+@pytest.mark.parametrize("query", ["قانون", "القانون", "والقانون", "مدني", "حقوق", "الحق"])
+def test_arabic_words_match_with_or_without_the_article(query):
+    index = SearchIndex([{"full_name": "A", "bio_en": "أستاذ القانون المدني في كلية الحقوق"}, {"full_name": "B"}])
+    assert index.search(query) == [0]
+
+# =========================
+# RANKING
+# =========================
+def test_name_hit_outranks_bio_hit():
+    index = SearchIndex([
+        {"full_name": "Ali Kareem", "bio_en": "Student of Professor Hassan."},
+        {"full_name": "Hassan Jabir", "bio_en": "Professor of civil law."},
+        {"full_name": "Zainab Ali", "expertise": ["Hassan Studies"]},
+    ])
+    assert index.rank("hassan", index.search("hassan")) == [1, 2, 0]
+
+def test_ties_keep_directory_order():
+    experts = [{"full_name": f"Expert {i}", "bio_en": "International law"} for i in range(12)]
+    index = SearchIndex(experts)
+    candidates = index.search("law")
+    assert index.rank("law", candidates) == candidates
+    assert index.rank("law", candidates, 5) == candidates[:5]
+
+@pytest.mark.parametrize("query", ["law", "civil law", "hum rig", "dr"])
+def test_ranked_pages_match_a_full_sort(search_index, query):
+    candidates = search_index.search(query)
+    ranked = search_index.rank(query, candidates)
+    assert sorted(ranked) == candidates
+    for offset, limit in ((0, 10), (10, 10), (25, 7), (len(candidates) - 3, 10)):
+        assert search_index.rank(query, candidates, offset + limit)[offset:] == ranked[offset:offset + limit]
+
+def test_compact_and_plain_directories_index_alike(experts, search_index):
+    compact = SearchIndex(CompactExperts(experts))
+    assert compact.terms == search_index.terms
+    for query in ("law", "civil rights", "dr"):
+        assert compact.search(query) == search_index.search(query)
+        assert compact.rank(query, compact.search(query)) == search_index.rank(query, search_index.search(query))
@@ -0,0 +1,53 @@
+"""Rerun checks of the app with Streamlit's AppTest, over the bundled experts.json."""
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "streamlit_app.py")
+
+@pytest.fixture
+def app():
+    at = AppTest.from_file(APP_PATH, default_timeout=60)
+    at.run()
+    assert not at.exception
+    return at
+
+def captions(at):
+    return [caption.value for caption in at.caption]
+
+def test_search_narrows_list_and_facet_counts(app):
+    assert "Showing 6 of 6 experts" in captions(app)
+
+    app.text_input[0].input("civil").run()
+    assert not app.exception
+    assert "Showing 1 of 6 experts" in captions(app)
+    assert len(app.radio[0].options) == 1
+    assert "Academic (1)" in app.selectbox(key="tag_filter").options
+
+    app.text_input[0].input("").run()
+    assert "Showing 6 of 6 experts" in captions(app)
+    assert len(app.radio[0].options) == 6
+
+def test_selection_follows_the_results(app):
+    app.radio[0].set_value("nagham_ishaq_zia").run()
+    assert app.session_state["selected_expert_id"] == "nagham_ishaq_zia"
+
+    app.text_input[0].input("nagham").run()
+    assert not app.exception
+    assert app.session_state["selected_expert_id"] == "nagham_ishaq_zia"
+
+    # The selected expert no longer matches: the first result is shown instead
+    app.text_input[0].input("civil").run()
+    assert app.session_state["selected_expert_id"] == app.radio[0].value != "nagham_ishaq_zia"
+
+def test_filters_combine_with_search(app):
+    app.selectbox(key="expertise_filter").select("Legal Studies").run()
+    assert not app.exception
+    assert "Showing 3 of 6 experts" in captions(app)
+
+    app.text_input[0].input("international").run()
+    assert not app.exception
+    assert app.selectbox(key="expertise_filter").value == "Legal Studies"
+    assert "Showing 1 of 6 experts" in captions(app)
+    assert len(app.radio[0].options) == 1